@@ -1,7 +1,7 @@
 """add encrypted token columns
 
 Revision ID: 0003_token_encryption
-Revises: 0002_integration_accounts
+Revises: 20250813_0002
 Create Date: 2025-08-13
 """
 from alembic import op
@@ -9,7 +9,7 @@ import sqlalchemy as sa
 
 # revision identifiers, used by Alembic.
 revision = '0003_token_encryption'
-down_revision = '0002_integration_accounts'
+down_revision = '20250813_0002'
 branch_labels = None
 depends_on = None
 
@@ -0,0 +1,20 @@
+"""add composite events (user_id, start_at, id) index for range listing
+
+Revision ID: 0004_events_user_start_index
+Revises: 0003_token_encryption
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0004_events_user_start_index'
+down_revision = '0003_token_encryption'
+branch_labels = None
+depends_on = None
+
+def upgrade() -> None:
+    op.create_index('ix_events_user_start_id', 'events', ['user_id', 'start_at', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_events_user_start_id', table_name='events')
@@ -0,0 +1,46 @@
+"""add integer epoch shadow columns events.start_ts / end_ts
+
+Revision ID: 0005_events_epoch_columns
+Revises: 0004_events_user_start_index
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0005_events_epoch_columns'
+down_revision = '0004_events_user_start_index'
+branch_labels = None
+depends_on = None
+
+# whole seconds, truncated (app/domain/spans.py epoch_second)
+_BACKFILL = {
+    'sqlite': (
+        "UPDATE events SET "
+        "start_ts = CAST(strftime('%s', start_at) AS INTEGER), "
+        "end_ts = CAST(strftime('%s', end_at) AS INTEGER)"
+    ),
+    'postgresql': (
+        "UPDATE events SET "
+        "start_ts = FLOOR(EXTRACT(EPOCH FROM start_at))::bigint, "
+        "end_ts = FLOOR(EXTRACT(EPOCH FROM end_at))::bigint"
+    ),
+}
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('events') as batch_op:
+        batch_op.add_column(sa.Column('start_ts', sa.BigInteger(), nullable=True))
+        batch_op.add_column(sa.Column('end_ts', sa.BigInteger(), nullable=True))
+    op.execute(_BACKFILL[op.get_bind().dialect.name])
+    with op.batch_alter_table('events') as batch_op:
+        batch_op.alter_column('start_ts', existing_type=sa.BigInteger(), nullable=False)
+        batch_op.alter_column('end_ts', existing_type=sa.BigInteger(), nullable=False)
+        batch_op.create_index('ix_events_user_start_ts', ['user_id', 'start_ts', 'end_ts'])
+
+
+def downgrade() -> None:
+    with op.batch_alter_table('events') as batch_op:
+        batch_op.drop_index('ix_events_user_start_ts')
+        batch_op.drop_column('end_ts')
+        batch_op.drop_column('start_ts')
@@ -0,0 +1,47 @@
+"""PostgreSQL: generated events.during tstzrange + GiST index (+ optional FOCUS exclusion)
+
+No-op on other dialects. Set EVENTS_FOCUS_EXCLUSION=1 when upgrading to also
+add the ex_events_focus_overlap exclusion constraint.
+
+Revision ID: 0006_events_during_range
+Revises: 0005_events_epoch_columns
+Create Date: 2026-10-19
+"""
+import os
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0006_events_during_range'
+down_revision = '0005_events_epoch_columns'
+branch_labels = None
+depends_on = None
+
+
+def _postgres() -> bool:
+    return op.get_bind().dialect.name == 'postgresql'
+
+
+def upgrade() -> None:
+    if not _postgres():
+        return
+    op.execute("CREATE EXTENSION IF NOT EXISTS btree_gist")
+    op.execute(
+        "ALTER TABLE events ADD COLUMN during tstzrange "
+        "GENERATED ALWAYS AS (tstzrange(to_timestamp(start_ts), to_timestamp(end_ts), '[)')) STORED"
+    )
+    op.execute("CREATE INDEX ix_events_user_during ON events USING gist (user_id, during)")
+    if os.getenv("EVENTS_FOCUS_EXCLUSION", "0") == "1":
+        # fails if existing rows already overlap a FOCUS block; resolve those first
+        op.execute(
+            "ALTER TABLE events ADD CONSTRAINT ex_events_focus_overlap "
+            "EXCLUDE USING gist (user_id WITH =, during WITH &&, (type = 'FOCUS') WITH <>)"
+        )
+
+
+def downgrade() -> None:
+    if not _postgres():
+        return
+    op.execute("ALTER TABLE events DROP CONSTRAINT IF EXISTS ex_events_focus_overlap")
+    op.execute("DROP INDEX IF EXISTS ix_events_user_during")
+    op.execute("ALTER TABLE events DROP COLUMN IF EXISTS during")
@@ -0,0 +1,49 @@
+"""add slot_candidate_sets / slot_candidates (precomputed /slots/suggest results)
+
+Revision ID: 0007_slot_candidates
+Revises: 0006_events_during_range
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0007_slot_candidates'
+down_revision = '0006_events_during_range'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'slot_candidate_sets',
+        sa.Column('task_id', sa.String(), sa.ForeignKey('tasks.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('user_id', sa.String(), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('version', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('stale', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('horizon_days', sa.SmallInteger(), nullable=False),
+        sa.Column('window_start_ts', sa.BigInteger(), nullable=False),
+        sa.Column('window_end_ts', sa.BigInteger(), nullable=False),
+        sa.Column('expires_ts', sa.BigInteger(), nullable=False),
+        sa.Column('computed_at', sa.DateTime(), nullable=False),
+    )
+    op.create_index('ix_slot_candidate_sets_user_window', 'slot_candidate_sets',
+                    ['user_id', 'window_start_ts', 'window_end_ts'])
+    op.create_table(
+        'slot_candidates',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('task_id', sa.String(),
+                  sa.ForeignKey('slot_candidate_sets.task_id', ondelete='CASCADE'), nullable=False),
+        sa.Column('rank', sa.SmallInteger(), nullable=False),
+        sa.Column('start_ts', sa.BigInteger(), nullable=False),
+        sa.Column('end_ts', sa.BigInteger(), nullable=False),
+        sa.Column('score', sa.Float(), nullable=False),
+    )
+    op.create_index('ix_slot_candidates_task_rank', 'slot_candidates', ['task_id', 'rank'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_slot_candidates_task_rank', table_name='slot_candidates')
+    op.drop_table('slot_candidates')
+    op.drop_index('ix_slot_candidate_sets_user_window', table_name='slot_candidate_sets')
+    op.drop_table('slot_candidate_sets')
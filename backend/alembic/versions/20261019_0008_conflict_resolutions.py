@@ -0,0 +1,35 @@
+"""add conflict_resolutions (scheduler worker rescheduling proposals)
+
+Revision ID: 0008_conflict_resolutions
+Revises: 0007_slot_candidates
+Create Date: 2026-10-19
+"""
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision = '0008_conflict_resolutions'
+down_revision = '0007_slot_candidates'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'conflict_resolutions',
+        sa.Column('id', sa.Integer(), primary_key=True, autoincrement=True),
+        sa.Column('event_id', sa.String(), sa.ForeignKey('events.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('user_id', sa.String(), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('detected_at', sa.DateTime(), nullable=False),
+        sa.Column('conflict_count', sa.Integer(), nullable=False),
+        sa.Column('proposals', sa.JSON(), nullable=True),
+        sa.Column('status', sa.String(length=16), nullable=False, server_default='PROPOSED'),
+    )
+    op.create_index('ix_conflict_resolutions_event_id', 'conflict_resolutions', ['event_id'])
+    op.create_index('ix_conflict_resolutions_user_status', 'conflict_resolutions', ['user_id', 'status'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_conflict_resolutions_user_status', table_name='conflict_resolutions')
+    op.drop_index('ix_conflict_resolutions_event_id', table_name='conflict_resolutions')
+    op.drop_table('conflict_resolutions')
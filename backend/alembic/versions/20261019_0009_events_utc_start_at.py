@@ -0,0 +1,43 @@
+"""store events.start_at / end_at as UTC, matching start_ts / end_ts
+
+Offset datetimes (e.g. Google Calendar dateTime values) used to be stored with
+their local wall-clock time in start_at / end_at while start_ts / end_ts held
+the real instant. Rows written that way get start_at / end_at rebuilt from the
+epoch columns. Rows written before 0005 were backfilled from their wall-clock
+time, so both columns already agree for them and are left unchanged.
+
+Revision ID: 0009_events_utc_start_at
+Revises: 0008_conflict_resolutions
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0009_events_utc_start_at'
+down_revision = '0008_conflict_resolutions'
+branch_labels = None
+depends_on = None
+
+# same text format SQLAlchemy writes for SQLite DateTime, so ordering / equality keep working
+_SQLITE_TS = "strftime('%Y-%m-%d %H:%M:%S', {col}_ts, 'unixepoch') || '.000000'"
+_REPAIR = {
+    'sqlite': [
+        f"UPDATE events SET {col}_at = {_SQLITE_TS.format(col=col)} "
+        f"WHERE {col}_ts <> CAST(strftime('%s', {col}_at) AS INTEGER)"
+        for col in ('start', 'end')
+    ],
+    'postgresql': [
+        f"UPDATE events SET {col}_at = to_timestamp({col}_ts) AT TIME ZONE 'UTC' "
+        f"WHERE {col}_ts <> FLOOR(EXTRACT(EPOCH FROM {col}_at))::bigint"
+        for col in ('start', 'end')
+    ],
+}
+
+
+def upgrade() -> None:
+    for statement in _REPAIR[op.get_bind().dialect.name]:
+        op.execute(statement)
+
+
+def downgrade() -> None:
+    pass  # the original wall-clock values are not recoverable (nor were they meaningful)
@@ -0,0 +1,42 @@
+"""PostgreSQL: limit ex_events_focus_overlap to app-owned events
+
+Provider-imported rows (external_event_id set) no longer take part in the
+FOCUS exclusion constraint, so one imported overlap cannot abort a calendar
+sync. Only touches databases where migration 0006 created the constraint.
+
+Revision ID: 0010_focus_exclusion_app_events
+Revises: 0009_events_utc_start_at
+Create Date: 2026-10-19
+"""
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = '0010_focus_exclusion_app_events'
+down_revision = '0009_events_utc_start_at'
+branch_labels = None
+depends_on = None
+
+_CONSTRAINT = 'ex_events_focus_overlap'
+_EXCLUDE = "EXCLUDE USING gist (user_id WITH =, during WITH &&, (type = 'FOCUS') WITH <>)"
+
+
+def _recreate(predicate: str) -> None:
+    bind = op.get_bind()
+    if bind.dialect.name != 'postgresql':
+        return
+    exists = bind.exec_driver_sql(
+        "SELECT 1 FROM pg_constraint WHERE conname = %(name)s", {"name": _CONSTRAINT}
+    ).first()
+    if not exists:
+        return
+    op.execute(f"ALTER TABLE events DROP CONSTRAINT {_CONSTRAINT}")
+    op.execute(f"ALTER TABLE events ADD CONSTRAINT {_CONSTRAINT} {_EXCLUDE}{predicate}")
+
+
+def upgrade() -> None:
+    _recreate(" WHERE (external_event_id IS NULL)")
+
+
+def downgrade() -> None:
+    # fails if imported rows overlap a FOCUS block by then; resolve those first
+    _recreate("")
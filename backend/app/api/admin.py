@@ -0,0 +1,66 @@
+"""Admin-only diagnostics (profiling). Guarded by the ADMIN_TOKEN env var via X-Admin-Token."""
+import asyncio
+from fastapi import APIRouter, Body, Depends, Header, Query
+from fastapi.responses import PlainTextResponse
+
+from ..errors import ConflictError, ForbiddenError, NotFoundError, ValidationAppError
+from .. import profiling
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+def require_admin(x_admin_token: str | None = Header(None)):
+    if not profiling.admin_token():
+        raise ForbiddenError("ADMIN_DISABLED", "admin endpoints are disabled (ADMIN_TOKEN not set)")
+    if not profiling.admin_token_matches(x_admin_token):
+        raise ForbiddenError("ADMIN_TOKEN_INVALID", "invalid admin token")
+
+
+@router.post("/profile", dependencies=[Depends(require_admin)])
+async def sample_profile(
+    seconds: float = Query(5.0, gt=0, le=profiling.MAX_PROFILE_SECONDS),
+    interval_ms: float = Query(5.0, alias="intervalMs", ge=1, le=1000),
+    format: str = Query("collapsed"),
+):
+    """Sample all threads for `seconds` and return collapsed stacks (or JSON flamegraph data)."""
+    if format not in {"collapsed", "json"}:
+        raise ValidationAppError("INVALID_FORMAT", "format must be collapsed or json")
+    sampler = profiling.StackSampler(interval=interval_ms / 1000)
+    if not sampler.start():
+        raise ConflictError("PROFILE_RUNNING", "another profile is already running")
+    try:
+        await asyncio.sleep(seconds)
+    finally:
+        sampler.stop()
+    if format == "json":
+        return sampler.as_dict()
+    return PlainTextResponse(sampler.collapsed())
+
+
+@router.get("/profile/routes", dependencies=[Depends(require_admin)])
+async def get_profiled_routes():
+    return {"routes": sorted(profiling.profiled_routes)}
+
+
+@router.put("/profile/routes", dependencies=[Depends(require_admin)])
+async def set_profiled_routes(payload: dict = Body(...)):
+    """Route templates (e.g. /slots/suggest) for which X-Profile: 1 enables per-request profiling."""
+    routes = payload.get("routes")
+    if not isinstance(routes, list) or not all(isinstance(r, str) for r in routes):
+        raise ValidationAppError("INVALID_ROUTES", "routes must be a list of route templates")
+    profiling.profiled_routes.clear()
+    profiling.profiled_routes.update(routes)
+    return {"routes": sorted(profiling.profiled_routes)}
+
+
+@router.get("/profile/requests", dependencies=[Depends(require_admin)])
+async def list_request_profiles():
+    return {"profiles": profiling.profile_store.summaries()}
+
+
+@router.get("/profile/requests/{profile_id}", dependencies=[Depends(require_admin)])
+async def get_request_profile(profile_id: str):
+    profile = profiling.profile_store.get(profile_id)
+    if not profile:
+        raise NotFoundError("PROFILE_NOT_FOUND", "profile not found")
+    return profile
@@ -1,11 +1,13 @@
 from fastapi import APIRouter, Depends, HTTPException, status, Header, Body
 from fastapi.security import OAuth2PasswordRequestForm, OAuth2PasswordBearer
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from ..db.session import get_db
+from ..db.session import get_db, read_db_for, async_read_db_for
 from ..services.auth_service import AuthService, create_access_token
 from ..db import models
 from jose import JWTError, jwt
 from ..services.auth_service import SECRET_KEY, ALGORITHM
+from ..services.demo_user import DEMO_USER_ID
 
 router = APIRouter(prefix="/auth", tags=["auth"])
 
@@ -55,15 +57,42 @@ def get_current_user(db: Session = Depends(get_db), token: str = Depends(oauth2_
 def get_current_user_optional(db: Session = Depends(get_db), authorization: str | None = Header(None)) -> models.User | None:
     """Best-effort user retrieval; returns None if no valid bearer token.
     Used during transitional period while legacy demo-user fallback exists."""
+    sub = _bearer_subject(authorization)
+    if not sub:
+        return None
+    return db.query(models.User).filter(models.User.id == sub).first()
+
+
+def _bearer_subject(authorization: str | None) -> str | None:
     if not authorization or not authorization.lower().startswith("bearer "):
         return None
     token = authorization.split(None, 1)[1]
     try:
         payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
-        sub: str = payload.get("sub")
-        if not sub:
-            return None
-        user = db.query(models.User).filter(models.User.id == sub).first()
-        return user
     except JWTError:
         return None
+    return payload.get("sub") or None
+
+
+def get_read_db(authorization: str | None = Header(None)):
+    """Read-only session (replica when configured), keyed by the caller for read-your-writes."""
+    yield from read_db_for(_bearer_subject(authorization) or DEMO_USER_ID)
+
+
+async def get_async_read_db(authorization: str | None = Header(None)):
+    async for db in async_read_db_for(_bearer_subject(authorization) or DEMO_USER_ID):
+        yield db
+
+
+def get_read_user_optional(db: Session = Depends(get_read_db), authorization: str | None = Header(None)) -> models.User | None:
+    sub = _bearer_subject(authorization)
+    if not sub:
+        return None
+    return db.query(models.User).filter(models.User.id == sub).first()
+
+
+async def get_read_user_optional_async(db: AsyncSession = Depends(get_async_read_db), authorization: str | None = Header(None)) -> models.User | None:
+    sub = _bearer_subject(authorization)
+    if not sub:
+        return None
+    return await db.get(models.User, sub)
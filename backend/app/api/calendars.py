@@ -1,12 +1,14 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from pydantic import BaseModel, Field, ConfigDict
 from typing import List, Optional
 from sqlalchemy.orm import Session
 
 from ..db.session import get_db
 from ..db import models
-from .auth import get_current_user_optional
-from ..services.demo_user import get_or_create_demo_user
+from .fast_json import fast_json_enabled, FastJSONResponse
+from .conditional import etag_for, not_modified, cache_headers
+from .auth import get_current_user_optional, get_read_db, get_read_user_optional
+from ..services.demo_user import get_or_create_demo_user, DEMO_USER_ID
 
 router = APIRouter(prefix="/calendars", tags=["calendars"])
 
@@ -34,16 +36,39 @@ class CalendarUpdate(BaseModel):
 
 @router.get("", response_model=List[CalendarOut])
 def list_calendars(
-    db: Session = Depends(get_db),
-    current_user: models.User | None = Depends(get_current_user_optional),
+    request: Request,
+    response: Response,
+    db: Session = Depends(get_read_db),
+    current_user: models.User | None = Depends(get_read_user_optional),
 ):
-    user = current_user or get_or_create_demo_user(db)
+    user_id = current_user.id if current_user else DEMO_USER_ID
+    etag = etag_for(request, db, user_id, ("calendars",))
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
     cals = (
         db.query(models.Calendar)
-        .filter(models.Calendar.user_id == user.id)
+        .filter(models.Calendar.user_id == user_id)
         .order_by(models.Calendar.is_default.desc(), models.Calendar.name)
         .all()
     )
+    if fast_json_enabled():
+        return FastJSONResponse([
+            {
+                "id": c.id,
+                "name": c.name,
+                "external_provider": c.external_provider,
+                "external_id": c.external_id,
+                "time_zone": c.time_zone,
+                "access_role": c.access_role,
+                "color": c.color,
+                "is_primary": bool(c.is_primary),
+                "is_default": bool(c.is_default),
+                "selected": bool(c.selected),
+            }
+            for c in cals
+        ], headers=cache_headers(etag))
+    response.headers.update(cache_headers(etag))
     return [
         CalendarOut(
             id=c.id,
@@ -0,0 +1,43 @@
+"""Conditional GET helpers (ETag / If-None-Match -> 304) for polled endpoints."""
+from typing import Optional, Sequence
+from fastapi import Request, Response
+
+from ..db.session import is_replica_session
+from ..services.collection_versions import collection_etag
+
+# Clients may keep the body but must revalidate; responses are per-user.
+CACHE_CONTROL = "private, no-cache"
+
+
+def etag_for(request: Request, db, user_id: str, collections: Sequence[str], *extra: str) -> Optional[str]:
+    """ETag for a response read through db, or None when it must not be cached.
+
+    Versions are bumped when the primary commits, so a body read from the
+    replica may predate them; such responses get no ETag (and no 304).
+    """
+    if is_replica_session(db):
+        return None
+    try:
+        return collection_etag(user_id, collections, request.url.path, str(request.query_params), *extra)
+    except Exception:  # version backend unavailable -> serve uncached
+        return None
+
+
+def cache_headers(etag: Optional[str]) -> dict:
+    headers = {"Cache-Control": CACHE_CONTROL}
+    if etag:
+        headers["ETag"] = etag
+    return headers
+
+
+def not_modified(request: Request, etag: Optional[str]) -> Optional[Response]:
+    """Return a 304 response when If-None-Match matches etag, else None."""
+    if not etag:
+        return None
+    header = request.headers.get("if-none-match")
+    if not header:
+        return None
+    candidates = {c.strip().removeprefix("W/") for c in header.split(",")}
+    if "*" in candidates or etag in candidates:
+        return Response(status_code=304, headers=cache_headers(etag))
+    return None
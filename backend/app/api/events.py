@@ -1,14 +1,26 @@
-from fastapi import APIRouter, HTTPException, Depends
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
+from fastapi.responses import JSONResponse
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from pydantic import BaseModel, Field, ConfigDict
-from datetime import datetime
+from pydantic import BaseModel, Field, ConfigDict, TypeAdapter
+from datetime import datetime, timedelta, timezone
 from typing import Optional, List
+import base64
+import json
 from ..db.session import get_db
 from ..db import models
+from ..repositories.event_repository import AsyncSqlAlchemyEventRepository, SqlAlchemyEventRepository
 from ..services.event_service import EventService, EventNotFound
-from ..services.conflict_service import ConflictService, ConflictDetected
-from .auth import get_current_user_optional
-from ..services.demo_user import get_or_create_demo_user
+from ..services.conflict_service import (
+    RESOLUTION_HORIZON_DAYS, ConflictDetected, ConflictService, is_focus_exclusion_violation,
+)
+from .fast_json import fast_json_enabled, FastJSONResponse
+from .conditional import etag_for, not_modified, cache_headers
+from .auth import (
+    get_current_user_optional, get_async_read_db, get_read_db, get_read_user_optional, get_read_user_optional_async,
+)
+from ..services.demo_user import get_or_create_demo_user, DEMO_USER_ID
 from ..errors import ValidationAppError, ConflictError, NotFoundError
 from ..domain.enums import EventType
 
@@ -33,6 +45,30 @@ class EventOut(BaseModel):
 
     model_config = ConfigDict(populate_by_name=True)
 
+# API field name (camelCase) -> Event column, for `fields=` projections
+EVENT_FIELDS = {
+    "id": "id",
+    "title": "title",
+    "startAt": "start_at",
+    "endAt": "end_at",
+    "type": "type",
+    "description": "description",
+    "createdAt": "created_at",
+}
+_DATETIME_FIELDS = {"startAt", "endAt", "createdAt"}
+# EventOut's datetime serializer, so projections format times exactly like the default path
+_datetime_json = TypeAdapter(datetime)
+
+
+def _project(rows, selected: List[str]) -> List[dict]:
+    """Rows (tuples in `selected` order) as JSON-ready dicts; trailing cursor columns are dropped by zip."""
+    times = [f for f in selected if f in _DATETIME_FIELDS]
+    content = [dict(zip(selected, row)) for row in rows]
+    for item in content:
+        for name in times:
+            item[name] = _datetime_json.dump_python(item[name], mode="json")
+    return content
+
 class EventUpdate(BaseModel):
     title: Optional[str] = None
     start_at: Optional[datetime] = Field(None, alias="startAt")
@@ -40,8 +76,16 @@ class EventUpdate(BaseModel):
     type: Optional[EventType] = None
     description: Optional[str] = None
 
+class ResolutionsRequest(BaseModel):
+    event_ids: List[str] = Field(..., alias="eventIds", min_length=1, max_length=500)
+    limit: int = Field(5, ge=1, le=20)
+
+    model_config = ConfigDict(populate_by_name=True)
+
 @router.post("", response_model=EventOut, status_code=201)
 def create_event(body: EventCreate, db: Session = Depends(get_db), current_user: models.User | None = Depends(get_current_user_optional)):
+    # One sync session for the whole request: the conflict check and the insert
+    # share a transaction, and EventService pushes to Google with blocking HTTP.
     user = current_user or get_or_create_demo_user(db)
     user_id = user.id
     
@@ -79,16 +123,22 @@ def create_event(body: EventCreate, db: Session = Depends(get_db), current_user:
         raise ConflictError("FOCUS_PROTECTED", str(e))
     
     event_service = EventService()
-    event = event_service.create_event(
-        db=db,
-        user_id=user_id,
-        calendar_id=calendar.id,
-        title=body.title,
-        start_at=body.start_at,
-        end_at=body.end_at,
-        type=body.type,
-        description=body.description
-    )
+    try:
+        event = event_service.create_event(
+            db=db,
+            user_id=user_id,
+            calendar_id=calendar.id,
+            title=body.title,
+            start_at=body.start_at,
+            end_at=body.end_at,
+            type=body.type,
+            description=body.description
+        )
+    except IntegrityError as e:
+        # PostgreSQL with EVENTS_FOCUS_EXCLUSION=1: a concurrent write won the race
+        if is_focus_exclusion_violation(e):
+            raise ConflictError("FOCUS_PROTECTED", "FOCUS time is protected. Cannot create event during focus blocks")
+        raise
     
     return EventOut(
         id=event.id,
@@ -100,12 +150,37 @@ def create_event(body: EventCreate, db: Session = Depends(get_db), current_user:
         createdAt=event.created_at
     )
 
+@router.post("/resolutions")
+def suggest_resolutions(
+    body: ResolutionsRequest,
+    db: Session = Depends(get_read_db),
+    current_user: models.User | None = Depends(get_read_user_optional),
+):
+    """Alternatives for several conflicting events at once over one shared timeline.
+
+    Events are taken most protected first (FOCUS, MEETING, GENERAL, BUFFER);
+    one that no longer overlaps anything keeps its place ("keep"), the
+    others get slots ("move") and their top slot is reserved for the rest.
+    """
+    user_id = current_user.id if current_user else DEMO_USER_ID
+    event_ids = list(dict.fromkeys(body.event_ids))
+    repo = SqlAlchemyEventRepository()
+    events = repo.find_spans_by_ids(db, user_id, event_ids)
+    missing = set(event_ids) - {e.id for e in events}
+    if missing:
+        raise NotFoundError("EVENT_NOT_FOUND", f"events not found: {sorted(missing)}")
+    now = datetime.now(timezone.utc)
+    spans = repo.find_future_spans(db, user_id, now, now + timedelta(days=RESOLUTION_HORIZON_DAYS))
+    by_id = {e.id: e for e in events}
+    resolutions = ConflictService(repo).suggest_resolutions(
+        db, [by_id[i] for i in event_ids], limit=body.limit, existing_events=spans, user_id=user_id,
+    )
+    return {"resolutions": resolutions}
+
 @router.get("/{event_id}", response_model=EventOut)
-def get_event(event_id: str, db: Session = Depends(get_db)):
-    event_service = EventService()
-    try:
-        event = event_service.get_event(db, event_id)
-    except EventNotFound:
+async def get_event(event_id: str, db: AsyncSession = Depends(get_async_read_db)):
+    event = await db.get(models.Event, event_id)
+    if not event:
         raise NotFoundError("EVENT_NOT_FOUND", "Event not found")
     
     return EventOut(
@@ -118,26 +193,86 @@ def get_event(event_id: str, db: Session = Depends(get_db)):
         createdAt=event.created_at
     )
 
+def _as_utc(dt: Optional[datetime]) -> Optional[datetime]:
+    if dt is None:
+        return None
+    return dt.astimezone(timezone.utc) if dt.tzinfo else dt.replace(tzinfo=timezone.utc)
+
+def _encode_cursor(start_at: datetime, event_id: str) -> str:
+    raw = json.dumps([start_at.isoformat(), event_id]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+def _decode_cursor(cursor: str):
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        start_iso, event_id = json.loads(raw)
+        return datetime.fromisoformat(start_iso), str(event_id)
+    except Exception:
+        raise ValidationAppError("INVALID_CURSOR", "malformed cursor")
+
+def _parse_fields(fields: Optional[str]) -> List[str]:
+    if not fields:
+        return list(EVENT_FIELDS)
+    names = [f.strip() for f in fields.split(",") if f.strip()]
+    unknown = [f for f in names if f not in EVENT_FIELDS]
+    if unknown or not names:
+        raise ValidationAppError("INVALID_FIELDS", f"unknown fields: {unknown}")
+    return names
+
 @router.get("", response_model=List[EventOut])
-def list_events(db: Session = Depends(get_db), current_user: models.User | None = Depends(get_current_user_optional)):
-    user = current_user or get_or_create_demo_user(db)
-    user_id = user.id
-    events = (
-        db.query(models.Event)
-        .join(models.Calendar, models.Calendar.id == models.Event.calendar_id)
-        .filter(models.Event.user_id == user_id, models.Calendar.selected == 1)
-        .all()
+async def list_events(
+    request: Request,
+    response: Response,
+    start_from: Optional[datetime] = Query(None, alias="from"),
+    start_to: Optional[datetime] = Query(None, alias="to"),
+    cursor: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1, le=1000),
+    fields: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_async_read_db),
+    current_user: models.User | None = Depends(get_read_user_optional_async),
+):
+    """List events starting in [from, to), ordered by (startAt, id).
+
+    With `limit`, a `X-Next-Cursor` header is set when more rows remain; pass it
+    back as `cursor`. `fields` selects a subset of columns (no ORM hydration).
+    """
+    # Read path: never create the demo user here (the session may be a replica)
+    user_id = current_user.id if current_user else DEMO_USER_ID
+    selected = _parse_fields(fields)
+    etag = etag_for(request, db, user_id, ("events", "calendars"))
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    rows = await AsyncSqlAlchemyEventRepository().list_page(
+        db,
+        user_id,
+        [EVENT_FIELDS[f] for f in selected],
+        start_from=_as_utc(start_from),
+        start_to=_as_utc(start_to),
+        after=_decode_cursor(cursor) if cursor else None,
+        limit=limit + 1 if limit else None,
     )
+    headers = cache_headers(etag)
+    if limit and len(rows) > limit:
+        rows = rows[:limit]
+        headers["X-Next-Cursor"] = _encode_cursor(rows[-1].start_at, rows[-1].id)
+
+    if fields or fast_json_enabled():
+        content = _project(rows, selected)
+        if fast_json_enabled():
+            return FastJSONResponse(content, headers=headers)
+        return JSONResponse(content, headers=headers)
+    response.headers.update(headers)
     return [
         EventOut(
-            id=event.id,
-            title=event.title,
-            startAt=event.start_at,
-            endAt=event.end_at,
-            type=event.type,
-            description=event.description,
-            createdAt=event.created_at
-        ) for event in events
+            id=row.id,
+            title=row.title,
+            startAt=row.start_at,
+            endAt=row.end_at,
+            type=row.type,
+            description=row.description,
+            createdAt=row.created_at
+        ) for row in rows
     ]
 
 @router.put("/{event_id}", response_model=EventOut)
@@ -155,6 +290,10 @@ def update_event(event_id: str, body: EventUpdate, db: Session = Depends(get_db)
         )
     except EventNotFound:
         raise NotFoundError("EVENT_NOT_FOUND", "Event not found")
+    except IntegrityError as e:
+        if is_focus_exclusion_violation(e):
+            raise ConflictError("FOCUS_PROTECTED", "FOCUS time is protected. Cannot move event into focus blocks")
+        raise
     
     return EventOut(
         id=event.id,
@@ -0,0 +1,28 @@
+"""Opt-in fast JSON path for list endpoints (events / calendars / slots).
+
+Enabled with APP_FAST_JSON=1 when orjson is installed. Routers then hand plain
+dicts built from rows straight to orjson instead of constructing response
+models and running them through jsonable_encoder. The JSON shape matches the
+Pydantic path (aware UTC datetimes rendered with a trailing "Z").
+"""
+import os
+from fastapi import Response
+
+try:  # Optional dependency (pip install .[fast])
+    import orjson
+    _orjson_available = True
+except Exception:  # pragma: no cover
+    _orjson_available = False
+
+FAST_JSON_ENABLED = _orjson_available and os.getenv("APP_FAST_JSON") in {"1", "true", "TRUE", "yes", "on"}
+
+
+def fast_json_enabled() -> bool:
+    return FAST_JSON_ENABLED
+
+
+class FastJSONResponse(Response):
+    media_type = "application/json"
+
+    def render(self, content) -> bytes:
+        return orjson.dumps(content, option=orjson.OPT_UTC_Z)
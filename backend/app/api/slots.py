@@ -1,41 +1,102 @@
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Request, Response
+from pydantic import BaseModel, ConfigDict, Field
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from datetime import datetime, timedelta, timezone
-from ..db.session import get_db
+from typing import List, Literal, Optional
 from ..db import models
-from ..services.task_service import get_task, TaskNotFound
-from ..services.recommendation_service import compute_slots
-from .auth import get_current_user_optional
+from ..errors import NotFoundError, ValidationAppError
+from ..repositories.event_repository import AsyncSqlAlchemyEventRepository
+from ..services.task_service import get_task_async, TaskNotFound
+from ..services.recommendation_service import search_slots, SLOT_GRANULARITY_MIN
+from ..services.slot_candidate_service import (
+    MAX_HORIZON_DAYS as MAX_HORIZON_DAYS_SUGGEST, SLOT_PRECOMPUTE, STORE_LIMIT,
+    horizon_days, read_stored_slots, refresh_in_background, suggest_availability,
+)
+from ..services.common_slot_service import MAX_HORIZON_DAYS, MAX_PARTICIPANTS, common_slots, visible_to, workday_windows
+from .conditional import etag_for, not_modified, cache_headers
+from .fast_json import fast_json_enabled, FastJSONResponse
+from .auth import get_async_read_db, get_read_user_optional_async
 
 router = APIRouter(prefix="/slots")
 
 @router.get("/suggest")
-def suggest_slots(taskId: str = Query(...), limit: int = Query(5, ge=1, le=20), db: Session = Depends(get_db), current_user: models.User | None = Depends(get_current_user_optional)):
+async def suggest_slots(request: Request, response: Response, background_tasks: BackgroundTasks, taskId: str = Query(...), limit: int = Query(5, ge=1, le=STORE_LIMIT), horizonDays: Optional[int] = Query(None, ge=1, le=MAX_HORIZON_DAYS_SUGGEST), db: AsyncSession = Depends(get_async_read_db), current_user: models.User | None = Depends(get_read_user_optional_async)):
+    user_id = current_user.id if current_user else "demo-user"
+    now = datetime.now(timezone.utc)
+    # Suggestions also depend on "now" (past candidates drop out), so the ETag
+    # rolls over every slot granularity step as well as on task/event writes.
+    time_bucket = str(int(now.timestamp()) // (SLOT_GRANULARITY_MIN * 60))
+    etag = etag_for(request, db, user_id, ("tasks", "events", "calendars"), time_bucket)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+
     try:
-        task = get_task(db, taskId)
+        task = await get_task_async(db, taskId)
     except TaskNotFound:
         raise HTTPException(status_code=404, detail={"code": "TASK_NOT_FOUND", "message": "task not found"})
     
-    # Get user's existing events for conflict detection
-    user_id = current_user.id if current_user else "demo-user"
+    horizon = horizonDays or horizon_days(task, now)
+    # precomputed candidates (slot_candidate_service) when still valid
+    outcome, version, slots = await read_stored_slots(db, task.id, horizon, limit, now)
+    if slots is None:
+        existing_events = await AsyncSqlAlchemyEventRepository().find_future_spans(db, user_id, now, now + timedelta(days=horizon))
+        # exact top-k with day-level pruning keeps long horizons cheap
+        slots = search_slots(task, suggest_availability(now, horizon), limit=limit, existing_events=existing_events)
+        version = None
+        if SLOT_PRECOMPUTE and horizonDays is None:
+            background_tasks.add_task(refresh_in_background, task.user_id, task.id)
+    payload = {"taskId": taskId, "version": version, "slots": slots}
+    if fast_json_enabled():
+        return FastJSONResponse(payload, headers=cache_headers(etag))
+    response.headers.update(cache_headers(etag))
+    return payload
+
+
+class CommonSlotsRequest(BaseModel):
+    user_ids: List[str] = Field(..., alias="userIds")
+    duration_minutes: int = Field(..., alias="durationMinutes", ge=SLOT_GRANULARITY_MIN, le=8 * 60)
+    start: Optional[datetime] = None
+    end: Optional[datetime] = None
+    focus: Literal["soft", "hard"] = "soft"
+    limit: int = Field(5, ge=1, le=20)
+
+    model_config = ConfigDict(populate_by_name=True)
+
+
+def _utc(dt: datetime) -> datetime:
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt.astimezone(timezone.utc)
+
+
+@router.post("/common")
+async def suggest_common_slots(body: CommonSlotsRequest, db: AsyncSession = Depends(get_async_read_db), current_user: models.User | None = Depends(get_read_user_optional_async)):
+    """Slots free for the caller and every user in userIds (weekdays 9-17 UTC, default next 14 days).
+
+    Needs a signed-in caller; every participant must exist and be visible to
+    them (same email domain), otherwise the request fails without revealing which.
+    """
+    if current_user is None:
+        raise HTTPException(status_code=401, detail={"code": "AUTH_REQUIRED", "message": "sign in to compare calendars"})
+    participants = list(dict.fromkeys([current_user.id, *body.user_ids]))
+    if len(participants) > MAX_PARTICIPANTS:
+        raise ValidationAppError("TOO_MANY_PARTICIPANTS", f"at most {MAX_PARTICIPANTS} participants")
+    emails = dict((await db.execute(
+        select(models.User.id, models.User.email).where(models.User.id.in_(participants))
+    )).all())
+    hidden = [p for p in participants if p not in emails or not visible_to(current_user.email, emails[p])]
+    if hidden:
+        raise NotFoundError("USER_NOT_FOUND", f"unknown participants: {', '.join(hidden)}")
     now = datetime.now(timezone.utc)
-    end_window = now + timedelta(days=7)  # Look ahead 7 days
-    
-    existing_events = db.query(models.Event).filter(
-        models.Event.user_id == user_id,
-        models.Event.start_at >= now,
-        models.Event.start_at <= end_window
-    ).all()
-    
-    # Create availability windows - for now, use working hours each day
-    availability = []
-    for day in range(7):  # Next 7 days
-        day_start = now.replace(hour=9, minute=0, second=0, microsecond=0) + timedelta(days=day)
-        day_end = day_start.replace(hour=17)  # 9 AM to 5 PM
-        
-        # Skip weekends (rough approximation)
-        if day_start.weekday() < 5:  # Monday = 0, Friday = 4
-            availability.append({"start": day_start, "end": day_end})
-    
-    slots = compute_slots(task, availability, limit=limit, existing_events=existing_events)
-    return {"taskId": taskId, "slots": slots}
+    start = max(_utc(body.start), now) if body.start else now
+    end = _utc(body.end) if body.end else start + timedelta(days=14)
+    if end <= start or end - start > timedelta(days=MAX_HORIZON_DAYS):
+        raise ValidationAppError("INVALID_HORIZON", f"end must be after start and within {MAX_HORIZON_DAYS} days")
+
+    busy = await AsyncSqlAlchemyEventRepository().find_busy_for_users(db, participants, start, end)
+    slots = common_slots(busy, participants, workday_windows(start, end), body.duration_minutes,
+                         focus=body.focus, limit=body.limit)
+    payload = {"participants": participants, "focus": body.focus, "slots": slots}
+    if fast_json_enabled():
+        return FastJSONResponse(payload)
+    return payload
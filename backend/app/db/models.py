@@ -1,8 +1,10 @@
-from sqlalchemy import Column, String, DateTime, Integer, ForeignKey, SmallInteger, JSON
+from sqlalchemy import DDL, BigInteger, Column, String, DateTime, Float, Integer, ForeignKey, SmallInteger, JSON, Index, event
 from sqlalchemy.dialects.sqlite import BLOB
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import relationship, validates
 from datetime import datetime, timezone
+import os
 from .session import Base
+from ..domain.spans import epoch_second
 import uuid
 
 
@@ -59,11 +61,68 @@ class Event(Base):
     description = Column(String, nullable=True)
     start_at = Column(DateTime, nullable=False, index=True)
     end_at = Column(DateTime, nullable=False)
+    # whole epoch-second shadows of start_at / end_at, kept in step by
+    # _sync_epoch; interval queries and the recommendation engine compare these
+    start_ts = Column(BigInteger, nullable=False)
+    end_ts = Column(BigInteger, nullable=False)
     type = Column(String, nullable=False, default="GENERAL", index=True)
     external_event_id = Column(String, nullable=True, index=True)
     created_at = Column(DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
     updated_at = Column(DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
 
+    __table_args__ = (
+        # keyset pagination / range listing: WHERE user_id = ? ORDER BY start_at, id
+        Index("ix_events_user_start_id", "user_id", "start_at", "id"),
+        # overlap / horizon scans: WHERE user_id = ? AND start_ts < ? AND end_ts > ?
+        Index("ix_events_user_start_ts", "user_id", "start_ts", "end_ts"),
+    )
+
+    @validates("start_at", "end_at")
+    def _sync_epoch(self, key, value):
+        if value is not None:
+            # the columns keep no offset: store the UTC instant, not the caller's
+            # wall-clock time (API input and provider sync both send offsets)
+            if value.tzinfo is not None:
+                value = value.astimezone(timezone.utc)
+            setattr(self, "start_ts" if key == "start_at" else "end_ts", epoch_second(value))
+        return value
+
+
+# --- PostgreSQL range storage (migration 0006 adds the same to existing databases) ---
+# `during` is a generated tstzrange over the epoch shadows with a GiST index, so
+# the repositories' overlap predicate there is one `during && range` lookup.
+# It is not mapped: SQLite keeps comparing start_ts / end_ts.
+FOCUS_EXCLUSION_CONSTRAINT = "ex_events_focus_overlap"
+EVENTS_RANGE_DDL = (
+    "CREATE EXTENSION IF NOT EXISTS btree_gist",
+    "ALTER TABLE events ADD COLUMN during tstzrange "
+    "GENERATED ALWAYS AS (tstzrange(to_timestamp(start_ts), to_timestamp(end_ts), '[)')) STORED",
+    "CREATE INDEX ix_events_user_during ON events USING gist (user_id, during)",
+)
+# Opt-in: the database itself rejects a FOCUS block overlapping a non-FOCUS
+# event of the same user (either one written first), closing the race between
+# ConflictService's check and the insert. It sees every calendar and cannot be
+# bypassed with overrideFocusProtection. Only app-owned rows take part: events
+# mirrored from a provider (external_event_id set) are facts the sync has to
+# store, so a provider overlap must not abort a whole sync batch.
+FOCUS_EXCLUSION_PREDICATE = "external_event_id IS NULL"
+EVENTS_FOCUS_EXCLUSION_DDL = (
+    f"ALTER TABLE events ADD CONSTRAINT {FOCUS_EXCLUSION_CONSTRAINT} "
+    "EXCLUDE USING gist (user_id WITH =, during WITH &&, (type = 'FOCUS') WITH <>) "
+    f"WHERE ({FOCUS_EXCLUSION_PREDICATE})"
+)
+
+
+def focus_exclusion_enabled() -> bool:
+    return os.getenv("EVENTS_FOCUS_EXCLUSION", "0") == "1"
+
+
+for _statement in EVENTS_RANGE_DDL:
+    event.listen(Event.__table__, "after_create", DDL(_statement).execute_if(dialect="postgresql"))
+event.listen(Event.__table__, "after_create", DDL(EVENTS_FOCUS_EXCLUSION_DDL).execute_if(
+    dialect="postgresql", callable_=lambda *args, **kwargs: focus_exclusion_enabled(),
+))
+
 
 class IntegrationAccount(Base):
     __tablename__ = "integration_accounts"
@@ -82,3 +141,62 @@ class IntegrationAccount(Base):
     created_at = Column(DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
     updated_at = Column(DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
 
+
+class SlotCandidateSet(Base):
+    """Precomputed /slots/suggest result for one task (see slot_candidate_service).
+
+    Window and expiry bounds are epoch seconds. stale is incremented in the
+    same transaction as any event / task / calendar write that may change the
+    result and reduced by the marks a recompute has seen, so a write that
+    lands during a recompute leaves the set stale; version increases with
+    every recompute.
+    """
+    __tablename__ = "slot_candidate_sets"
+    task_id = Column(String, ForeignKey("tasks.id", ondelete="CASCADE"), primary_key=True)
+    user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    version = Column(Integer, nullable=False, default=0)
+    stale = Column(Integer, nullable=False, default=0)  # pending invalidations; 0 = fresh
+    horizon_days = Column(SmallInteger, nullable=False)
+    window_start_ts = Column(BigInteger, nullable=False)
+    window_end_ts = Column(BigInteger, nullable=False)
+    expires_ts = Column(BigInteger, nullable=False)
+    computed_at = Column(DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+
+    __table_args__ = (
+        # invalidation: WHERE user_id = ? AND window_start_ts < ? AND window_end_ts > ?
+        Index("ix_slot_candidate_sets_user_window", "user_id", "window_start_ts", "window_end_ts"),
+    )
+
+
+class SlotCandidate(Base):
+    __tablename__ = "slot_candidates"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    task_id = Column(String, ForeignKey("slot_candidate_sets.task_id", ondelete="CASCADE"), nullable=False)
+    rank = Column(SmallInteger, nullable=False)
+    start_ts = Column(BigInteger, nullable=False)
+    end_ts = Column(BigInteger, nullable=False)
+    score = Column(Float, nullable=False)
+
+    __table_args__ = (
+        Index("ix_slot_candidates_task_rank", "task_id", "rank"),
+    )
+
+
+class ConflictResolution(Base):
+    """Rescheduling proposal for an event that overlaps others (scheduler_worker).
+
+    At most one PROPOSED row per event; it is replaced when the event or its
+    neighbours change and removed once the event no longer conflicts.
+    """
+    __tablename__ = "conflict_resolutions"
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    event_id = Column(String, ForeignKey("events.id", ondelete="CASCADE"), nullable=False, index=True)
+    user_id = Column(String, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    detected_at = Column(DateTime, nullable=False, default=lambda: datetime.now(timezone.utc))
+    conflict_count = Column(Integer, nullable=False)
+    proposals = Column(JSON, nullable=True)  # [{"startAt", "endAt", "score"}, ...]
+    status = Column(String(16), nullable=False, default="PROPOSED")  # PROPOSED / ACCEPTED / REJECTED
+
+    __table_args__ = (
+        Index("ix_conflict_resolutions_user_status", "user_id", "status"),
+    )
@@ -1,7 +1,12 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, DeclarativeBase
+from sqlalchemy import create_engine, event, text
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from sqlalchemy.orm import sessionmaker, DeclarativeBase, Session
+from sqlalchemy.pool import NullPool
+from prometheus_client import Counter, Gauge
+from itertools import chain
 import os
 import threading
+import time
 
 """Database session / engine configuration.
 
@@ -21,6 +26,34 @@ engine = create_engine(
 
 SessionLocal = sessionmaker(bind=engine, autoflush=False, autocommit=False)
 
+
+def _to_async_url(url: str) -> str:
+    """Map a sync driver URL onto its asyncio counterpart (aiosqlite / asyncpg)."""
+    scheme, sep, rest = url.partition("://")
+    dialect = scheme.split("+", 1)[0]
+    if dialect == "sqlite":
+        return f"sqlite+aiosqlite{sep}{rest}"
+    if dialect in {"postgresql", "postgres"}:
+        return f"postgresql+asyncpg{sep}{rest}"
+    return url
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or _to_async_url(DATABASE_URL)
+
+def _create_async_engine(url: str):
+    # SQLite connections are cheap and bound to the event loop that opened them, so
+    # the async engine does not pool them (TestClient spins a loop per request).
+    return create_async_engine(
+        url,
+        echo=False,
+        **({"poolclass": NullPool} if url.startswith("sqlite") else {}),
+    )
+
+
+async_engine = _create_async_engine(ASYNC_DATABASE_URL)
+
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
 class Base(DeclarativeBase):
     pass
 
@@ -33,6 +66,30 @@ except Exception:  # pragma: no cover
 _init_lock = threading.Lock()
 _tables_created = False
 
+
+def ensure_event_epoch_columns():
+    """Add events.start_ts / end_ts to a SQLite dev database created before them.
+
+    create_all skips existing tables, so this mirrors migration 0005 (same
+    strftime backfill) for databases that are not managed by alembic.
+    """
+    if engine.dialect.name != "sqlite":
+        return  # real deployments run `alembic upgrade head`
+    with engine.begin() as conn:
+        cols = {r[1] for r in conn.exec_driver_sql("PRAGMA table_info(events)").fetchall()}
+        if not cols or "start_ts" in cols:
+            return
+        conn.exec_driver_sql("ALTER TABLE events ADD COLUMN start_ts BIGINT")
+        conn.exec_driver_sql("ALTER TABLE events ADD COLUMN end_ts BIGINT")
+        conn.exec_driver_sql(
+            "UPDATE events SET "
+            "start_ts = CAST(strftime('%s', start_at) AS INTEGER), "
+            "end_ts = CAST(strftime('%s', end_at) AS INTEGER)"
+        )
+        conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_events_user_start_id ON events (user_id, start_at, id)")
+        conn.exec_driver_sql("CREATE INDEX IF NOT EXISTS ix_events_user_start_ts ON events (user_id, start_ts, end_ts)")
+
+
 def _ensure_tables():
     global _tables_created
     if _tables_created:
@@ -40,6 +97,7 @@ def _ensure_tables():
     with _init_lock:
         if not _tables_created:
             Base.metadata.create_all(bind=engine)
+            ensure_event_epoch_columns()
             # lightweight column addition (development only)
             try:
                 with engine.connect() as conn:
@@ -76,3 +134,149 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """Async counterpart of get_db for endpoints that should not hold a threadpool slot."""
+    _ensure_tables()
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# --- Read replica routing ---
+# Read-only dependencies go to REPLICA_DATABASE_URL when configured. A user who
+# wrote through any Session within READ_YOUR_WRITES_SECONDS is pinned to the
+# primary so they never read their own stale data. Stickiness is per process.
+REPLICA_DATABASE_URL = os.getenv("REPLICA_DATABASE_URL")
+ASYNC_REPLICA_DATABASE_URL = os.getenv("ASYNC_REPLICA_DATABASE_URL") or (
+    _to_async_url(REPLICA_DATABASE_URL) if REPLICA_DATABASE_URL else None
+)
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "5"))
+
+replica_engine = create_engine(REPLICA_DATABASE_URL, echo=False, future=True) if REPLICA_DATABASE_URL else None
+ReplicaSessionLocal = (
+    sessionmaker(bind=replica_engine, autoflush=False, autocommit=False) if replica_engine else None
+)
+async_replica_engine = _create_async_engine(ASYNC_REPLICA_DATABASE_URL) if ASYNC_REPLICA_DATABASE_URL else None
+AsyncReplicaSessionLocal = (
+    async_sessionmaker(bind=async_replica_engine, autoflush=False, expire_on_commit=False)
+    if async_replica_engine else None
+)
+
+DB_READ_ROUTE_COUNT = Counter(
+    "schedule_concierge_db_read_route_total", "Read-only sessions opened by target", ["target"]
+)
+DB_REPLICA_LAG = Gauge(
+    "schedule_concierge_db_replica_lag_seconds", "Replication lag reported by the read replica"
+)
+
+_recent_writes: dict[str, float] = {}
+_recent_writes_lock = threading.Lock()
+
+
+def mark_user_write(user_id: str):
+    now = time.monotonic()
+    with _recent_writes_lock:
+        _recent_writes[user_id] = now
+        if len(_recent_writes) > 10_000:  # drop expired entries so the map stays bounded
+            for uid, ts in list(_recent_writes.items()):
+                if now - ts > READ_YOUR_WRITES_SECONDS:
+                    del _recent_writes[uid]
+
+
+def is_sticky(user_id: str | None) -> bool:
+    if not user_id:
+        return False
+    ts = _recent_writes.get(user_id)
+    return ts is not None and time.monotonic() - ts <= READ_YOUR_WRITES_SECONDS
+
+
+# Callbacks receiving {(user_id, table_name), ...} after each successful commit
+_write_listeners: list = []
+
+
+def register_write_listener(fn):
+    """Register fn(writes) to run after a commit that touched user-owned rows."""
+    _write_listeners.append(fn)
+    return fn
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_written_users(session, flush_context):
+    writes = session.info.setdefault("written_user_rows", set())
+    for obj in chain(session.new, session.dirty, session.deleted):
+        table = getattr(obj, "__tablename__", None)
+        uid = obj.id if table == "users" else getattr(obj, "user_id", None)
+        if uid:
+            writes.add((uid, table))
+
+
+@event.listens_for(Session, "after_commit")
+def _record_written_users(session):
+    writes = session.info.pop("written_user_rows", None)
+    if not writes:
+        return
+    for uid in {uid for uid, _ in writes}:
+        mark_user_write(uid)
+    for fn in _write_listeners:
+        fn(writes)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_written_users(session):
+    session.info.pop("written_user_rows", None)
+
+
+def read_sessionmaker(user_id: str | None):
+    if ReplicaSessionLocal is None or is_sticky(user_id):
+        DB_READ_ROUTE_COUNT.labels(target="primary").inc()
+        return SessionLocal
+    DB_READ_ROUTE_COUNT.labels(target="replica").inc()
+    return ReplicaSessionLocal
+
+
+def async_read_sessionmaker(user_id: str | None):
+    if AsyncReplicaSessionLocal is None or is_sticky(user_id):
+        DB_READ_ROUTE_COUNT.labels(target="primary").inc()
+        return AsyncSessionLocal
+    DB_READ_ROUTE_COUNT.labels(target="replica").inc()
+    return AsyncReplicaSessionLocal
+
+
+def is_replica_session(db) -> bool:
+    """True for sessions from read_db_for / async_read_db_for that went to the replica."""
+    return db.info.get("replica", False)
+
+
+def read_db_for(user_id: str | None):
+    """get_db for read-only endpoints: replica unless the user just wrote."""
+    _ensure_tables()
+    maker = read_sessionmaker(user_id)
+    db = maker()
+    db.info["replica"] = maker is not SessionLocal
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+async def async_read_db_for(user_id: str | None):
+    _ensure_tables()
+    maker = async_read_sessionmaker(user_id)
+    async with maker() as db:
+        db.info["replica"] = maker is not AsyncSessionLocal
+        yield db
+
+
+def refresh_replica_lag():
+    """Update DB_REPLICA_LAG from the replica (PostgreSQL streaming replication only)."""
+    if replica_engine is None or replica_engine.dialect.name != "postgresql":
+        return
+    try:
+        with replica_engine.connect() as conn:
+            lag = conn.execute(text(
+                "SELECT COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)"
+            )).scalar()
+        DB_REPLICA_LAG.set(float(lag or 0))
+    except Exception:
+        pass
@@ -9,4 +9,5 @@ class EventType(str, Enum):
 
 class TaskStatus(str, Enum):
     DRAFT = "Draft"
+    DONE = "Done"
     # Future statuses can be added here (e.g., PLANNED, COMPLETED)
@@ -0,0 +1,52 @@
+"""Compact read-only event projections and epoch-second time helpers.
+
+Slot recommendation and conflict checks only read an event's bounds and type.
+EventSpan carries exactly those (plus the id) as a tuple of ints and strings,
+loaded from the events.start_ts / end_ts shadow columns, so neither ORM
+hydration nor datetime parsing happens on the hot path. Aware UTC datetimes
+are produced on demand (start_at / end_at) where a caller needs them.
+
+Epoch bounds are whole seconds, truncated, so intervals that touch stay
+touching; only sub-second overlaps are lost.
+"""
+from datetime import datetime, timedelta, timezone
+from math import floor
+from typing import Iterable, List, NamedTuple, Optional
+
+_NAIVE_EPOCH = datetime(1970, 1, 1)
+_UTC_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def epoch_seconds(dt: datetime) -> float:
+    """dt as epoch seconds (naive = UTC); like dt.timestamp() without the tzinfo round trip."""
+    return ((dt - _NAIVE_EPOCH) if dt.tzinfo is None else (dt - _UTC_EPOCH)).total_seconds()
+
+
+def epoch_second(dt: datetime) -> int:
+    """Whole epoch seconds at or before dt (naive = UTC), as stored in start_ts / end_ts."""
+    return floor(epoch_seconds(dt))
+
+
+def from_epoch(seconds: int) -> datetime:
+    return _UTC_EPOCH + timedelta(seconds=seconds)
+
+
+class EventSpan(NamedTuple):
+    start_ts: int
+    end_ts: int
+    type: str
+    id: Optional[str] = None
+
+    @property
+    def start_at(self) -> datetime:
+        return from_epoch(self.start_ts)
+
+    @property
+    def end_at(self) -> datetime:
+        return from_epoch(self.end_ts)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable) -> List["EventSpan"]:
+        """Spans from (start_ts, end_ts, type, id) rows."""
+        new = tuple.__new__
+        return [new(cls, tuple(row)) for row in rows]
@@ -22,3 +22,11 @@ class ValidationAppError(BaseAppException):
 class InternalServerError(BaseAppException):
     def __init__(self, message: str = "internal error"):
         super().__init__("INTERNAL_ERROR", message, status.HTTP_500_INTERNAL_SERVER_ERROR)
+
+class ServiceUnavailableError(BaseAppException):
+    def __init__(self, code: str, message: str):
+        super().__init__(code, message, status.HTTP_503_SERVICE_UNAVAILABLE)
+
+class ForbiddenError(BaseAppException):
+    def __init__(self, code: str, message: str):
+        super().__init__(code, message, status.HTTP_403_FORBIDDEN)
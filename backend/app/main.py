@@ -11,7 +11,7 @@ NOTE: This file previously had duplicated imports and router registrations; clea
 
 from contextlib import asynccontextmanager
 import os
-from datetime import datetime, date, time, timedelta, timezone
+from datetime import date
 from fastapi import FastAPI, Request, Response, APIRouter, Body, Depends
 try:  # Optional OpenTelemetry
     from opentelemetry import trace
@@ -24,23 +24,31 @@ except Exception:  # pragma: no cover
     _otel_available = False
 from fastapi.responses import JSONResponse
 from fastapi.middleware.cors import CORSMiddleware
-from prometheus_client import Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client import REGISTRY, Counter, Histogram, generate_latest, CONTENT_TYPE_LATEST
+from prometheus_client.openmetrics.exposition import (
+    CONTENT_TYPE_LATEST as OPENMETRICS_CONTENT_TYPE,
+    generate_latest as generate_openmetrics,
+)
 from sqlalchemy.orm import Session
 
 from . import db  # noqa: F401 ensure models imported (register models before create_all)
 from .api.tasks import router as tasks_router
 from .api.slots import router as slots_router
 from .api.events import router as events_router
-from .api.auth import router as auth_router, get_current_user_optional
+from .api.auth import router as auth_router, get_current_user_optional, get_read_user_optional_async
 from .api.oauth import router as oauth_router
 from .api.integrations import router as integrations_router
 from .api.calendars import router as calendars_router
+from .api.admin import router as admin_router
 from .db import models
-from .db.session import engine, Base, get_db
+from .db.session import engine, Base, ensure_event_epoch_columns, get_db, refresh_replica_lag
 from .errors import BaseAppException, ValidationAppError
-from .services import task_service
-from .services.recommendation_service import compute_slots
-from .services.nlp_service import parse_schedule_text
+from .observability import MetricsMiddleware, REQUEST_COUNT, REQUEST_LATENCY  # noqa: F401 (re-exported)
+from .profiling import ProfilingMiddleware
+from .services import nlp_commit_service
+from .services import nlp_workers
+from .services import scheduler_worker
+from .services.nlp_service import engines as nlp_engines
 from .services.demo_user import get_or_create_demo_user
 
 
@@ -48,6 +56,8 @@ from .services.demo_user import get_or_create_demo_user
 async def lifespan(app: FastAPI):  # pragma: no cover - simple startup path
     """Initialize database schema (idempotent for tests) and apply lightweight dev migrations."""
     Base.metadata.create_all(bind=engine)
+    ensure_event_epoch_columns()
+    nlp_engines.warm()  # compile NLP rule tables once, before the first request
     try:  # best-effort SQLite column add (dev/testing convenience)
         with engine.connect() as conn:
             res = conn.exec_driver_sql("PRAGMA table_info(users)").fetchall()
@@ -73,7 +83,10 @@ async def lifespan(app: FastAPI):  # pragma: no cover - simple startup path
                         pass
     except Exception:  # pragma: no cover
         pass
+    scheduler_worker.start_scheduler_worker()
     yield
+    scheduler_worker.stop_scheduler_worker()
+    nlp_workers.shutdown()
 
 
 # --- Optional .env loading (opt-in via APP_LOAD_DOTENV) ---
@@ -101,26 +114,30 @@ else:  # pragma: no cover
     tracer = None
 
 # --- Metrics setup ---
-REQUEST_COUNT = Counter(
-    "schedule_concierge_requests_total", "Total HTTP requests", ["method", "path", "status"]
-)
-REQUEST_LATENCY = Histogram(
-    "schedule_concierge_request_latency_seconds", "Latency of HTTP requests", ["method", "path"]
-)
-
-# Application-level domain metrics
+# HTTP request metrics live in app.observability (MetricsMiddleware); domain metrics below.
 NLP_PARSE_COUNT = Counter(
     "schedule_concierge_nlp_parse_total", "Total NLP parse requests"
 )
 NLP_PARSE_DURATION = Histogram(
     "schedule_concierge_nlp_parse_duration_seconds", "Latency of NLP schedule parse"
 )
+NLP_PARSE_CACHE = Counter(
+    "schedule_concierge_nlp_parse_cache_total", "NLP parse cache lookups", ["result"]
+)
+NLP_PARSE_BATCH_SIZE = Histogram(
+    "schedule_concierge_nlp_parse_batch_size", "Inputs per NLP batch parse request",
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500),
+)
 NLP_COMMIT_COUNT = Counter(
     "schedule_concierge_nlp_commit_total", "Total NLP commit requests"
 )
 NLP_COMMIT_DURATION = Histogram(
     "schedule_concierge_nlp_commit_duration_seconds", "Latency of NLP commit endpoint"
 )
+NLP_COMMIT_BATCH_SIZE = Histogram(
+    "schedule_concierge_nlp_commit_batch_size", "Drafts per NLP batch commit request",
+    buckets=(1, 5, 10, 25, 50, 100, 250, 500),
+)
 
 # --- CORS (for local frontend dev) ---
 cors_origins_env = os.getenv("CORS_ALLOW_ORIGINS")
@@ -135,17 +152,71 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag"],
 )
+# Added last so metrics is the outermost middleware and times the whole stack.
+app.add_middleware(ProfilingMiddleware)
+app.add_middleware(MetricsMiddleware, tracer=tracer)
 
 # --- NLP router ---
 nlp_router = APIRouter(prefix="/nlp", tags=["nlp"])
 
 
+NLP_BATCH_MAX_INPUTS = 500
+
+
+def _parse_locale(payload: dict, user):
+    # explicit payload locale wins; otherwise the caller's profile locale
+    return payload.get("locale") or (user.locale if user else None)
+
+
+async def _parse_texts(texts, base_date=None, locale=None):
+    parsed = await nlp_workers.parse_many(texts, base_date, locale)
+    for _, hit in parsed:
+        NLP_PARSE_CACHE.labels(result="hit" if hit else "miss").inc()
+    return [result for result, _ in parsed]
+
+
+def _commit_for_user(db, current_user, commit_fn, drafts):
+    # runs in the threadpool: demo-user lookup, inserts and slot planning all block
+    user = current_user or get_or_create_demo_user(db)
+    return commit_fn(db, user.id, drafts, planner=nlp_workers.slot_planner())
+
+
 @nlp_router.post("/parse-schedule")
-async def parse_schedule(payload: dict = Body(...)):
+async def parse_schedule(
+    payload: dict = Body(...),
+    current_user: models.User | None = Depends(get_read_user_optional_async),
+):
     NLP_PARSE_COUNT.inc()
     with NLP_PARSE_DURATION.time():
-        return parse_schedule_text(payload.get("input", ""))
+        result = (await _parse_texts([payload.get("input", "")], locale=_parse_locale(payload, current_user)))[0]
+    if "error" in result:
+        raise ValidationAppError(result["error"]["code"], result["error"]["message"])
+    return result
+
+
+@nlp_router.post("/parse-schedule:batch")
+async def parse_schedule_batch(
+    payload: dict = Body(...),
+    current_user: models.User | None = Depends(get_read_user_optional_async),
+):
+    inputs = payload.get("inputs")
+    if not isinstance(inputs, list) or not all(isinstance(i, str) for i in inputs):
+        raise ValidationAppError("INVALID_INPUTS", "inputs must be a list of strings")
+    if len(inputs) > NLP_BATCH_MAX_INPUTS:
+        raise ValidationAppError("BATCH_TOO_LARGE", f"at most {NLP_BATCH_MAX_INPUTS} inputs per batch")
+    base_date = None
+    if payload.get("baseDate"):
+        try:
+            base_date = date.fromisoformat(payload["baseDate"])
+        except (TypeError, ValueError):
+            raise ValidationAppError("INVALID_BASE_DATE", "baseDate must be YYYY-MM-DD")
+    base_date = base_date or date.today()  # one date for the whole batch, even across midnight
+    NLP_PARSE_COUNT.inc()
+    NLP_PARSE_BATCH_SIZE.observe(len(inputs))
+    with NLP_PARSE_DURATION.time():
+        return {"results": await _parse_texts(inputs, base_date, _parse_locale(payload, current_user))}
 
 
 @nlp_router.post("/commit", status_code=201)
@@ -159,52 +230,25 @@ async def commit_schedule(
         draft = payload.get("draft") or {}
         if not draft:
             raise ValidationAppError("NO_DRAFT", "draft is required")
-        title = draft.get("title") or "タスク"
-        estimated = draft.get("estimatedMinutes") or 30
-        energy_tag = draft.get("energyTag")
-        due_date_str = draft.get("date")
-        due_at = None
-        if due_date_str:
-            try:
-                d = date.fromisoformat(due_date_str)
-                due_at = datetime.combine(d, time(23, 59)).replace(tzinfo=timezone.utc)
-            except Exception:
-                due_at = None
-        user = current_user or get_or_create_demo_user(db)
-
-        task = task_service.create_task(
-            db,
-            user_id=user.id,
-            title=title,
-            due_at=due_at,
-            priority=3,
-            estimated_minutes=estimated,
-            energy_tag=energy_tag,
-        )
-
-        now = datetime.now(timezone.utc)
-        availability = []
-        for day in range(5):
-            day_start = now.replace(hour=9, minute=0, second=0, microsecond=0) + timedelta(days=day)
-            if day_start.weekday() < 5:
-                availability.append({"start": day_start, "end": day_start.replace(hour=17)})
-        existing_events = (
-            db.query(models.Event)
-            .join(models.Calendar, models.Calendar.id == models.Event.calendar_id)
-            .filter(models.Event.user_id == user.id, models.Calendar.selected == 1)
-            .all()
-        )
-        slots = compute_slots(task, availability, limit=5, existing_events=existing_events)
-        task_out = {
-            "id": task.id,
-            "title": task.title,
-            "dueAt": task.due_at,
-            "priority": task.priority,
-            "estimatedMinutes": task.estimated_minutes,
-            "status": task.status,
-            "energyTag": task.energy_tag,
-        }
-        return {"task": task_out, "slots": slots}
+        return await nlp_workers.run(_commit_for_user, db, current_user, nlp_commit_service.commit_draft, draft)
+
+
+@nlp_router.post("/commit:batch", status_code=201)
+async def commit_schedule_batch(
+    payload: dict = Body(...),
+    db: Session = Depends(get_db),
+    current_user: models.User | None = Depends(get_current_user_optional),
+):
+    drafts = payload.get("drafts")
+    if not isinstance(drafts, list) or not drafts or not all(isinstance(d, dict) and d for d in drafts):
+        raise ValidationAppError("NO_DRAFT", "drafts must be a non-empty list of drafts")
+    if len(drafts) > NLP_BATCH_MAX_INPUTS:
+        raise ValidationAppError("BATCH_TOO_LARGE", f"at most {NLP_BATCH_MAX_INPUTS} drafts per batch")
+    NLP_COMMIT_COUNT.inc()
+    NLP_COMMIT_BATCH_SIZE.observe(len(drafts))
+    with NLP_COMMIT_DURATION.time():
+        results = await nlp_workers.run(_commit_for_user, db, current_user, nlp_commit_service.commit_drafts, drafts)
+        return {"results": results}
 
 
 # --- Register routers once ---
@@ -216,28 +260,15 @@ app.include_router(nlp_router)
 app.include_router(oauth_router)
 app.include_router(integrations_router)
 app.include_router(calendars_router)
-
-
-@app.middleware("http")
-async def metrics_middleware(request: Request, call_next):
-    path = request.url.path
-    method = request.method
-    if path.startswith("/events/") and len(path) > len("/events/"):
-        path_label = "/events/:id"
-    else:
-        path_label = path
-    with REQUEST_LATENCY.labels(method=method, path=path_label).time():
-        if tracer:
-            with tracer.start_as_current_span(f"HTTP {method} {path_label}"):
-                response: Response = await call_next(request)
-        else:
-            response: Response = await call_next(request)
-    REQUEST_COUNT.labels(method=method, path=path_label, status=str(response.status_code)).inc()
-    return response
+app.include_router(admin_router)
 
 
 @app.get("/metrics")
-def metrics():  # pragma: no cover - external scrape
+def metrics(request: Request):  # pragma: no cover - external scrape
+    refresh_replica_lag()
+    # exemplars (trace ids) are only part of the OpenMetrics exposition
+    if "application/openmetrics-text" in request.headers.get("accept", ""):
+        return Response(generate_openmetrics(REGISTRY), media_type=OPENMETRICS_CONTENT_TYPE)
     return Response(generate_latest(), media_type=CONTENT_TYPE_LATEST)
 
 
@@ -0,0 +1,178 @@
+"""HTTP metrics / tracing as a pure ASGI middleware.
+
+Records per request: count by status, latency (with trace-id exemplars),
+request/response body bytes, in-flight requests and SQLAlchemy query count /
+time (QueryStats, fed by engine cursor events). Labels use the matched
+route template and a fixed method set so unknown paths or verbs cannot grow
+label cardinality. Unlike
+@app.middleware("http") it adds no extra task per request and passes
+streaming responses through untouched.
+"""
+import contextvars
+import os
+import time
+from typing import List, Optional, Tuple
+from prometheus_client import Counter, Gauge, Histogram
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+try:  # Optional OpenTelemetry
+    from opentelemetry import trace
+    _otel_available = True
+except Exception:  # pragma: no cover
+    _otel_available = False
+
+# Edges at the P95 SLOs (read 300ms / write 500ms / recommendation 1.5s) so the
+# SLO ratio can be read straight from bucket counts.
+DEFAULT_LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.4, 0.5, 0.75, 1.0, 1.5, 2.5, 5.0)
+UNMATCHED_ROUTE = "<unmatched>"
+# the method comes from the client; anything else shares one label value
+KNOWN_METHODS = frozenset({"GET", "HEAD", "POST", "PUT", "PATCH", "DELETE", "OPTIONS"})
+OTHER_METHOD = "OTHER"
+
+
+def _latency_buckets():
+    raw = os.getenv("METRICS_LATENCY_BUCKETS")
+    if not raw:
+        return DEFAULT_LATENCY_BUCKETS
+    return tuple(sorted(float(b) for b in raw.split(",") if b.strip()))
+
+
+REQUEST_COUNT = Counter(
+    "schedule_concierge_requests_total", "Total HTTP requests", ["method", "path", "status"]
+)
+REQUEST_LATENCY = Histogram(
+    "schedule_concierge_request_latency_seconds", "Latency of HTTP requests", ["method", "path"],
+    buckets=_latency_buckets(),
+)
+REQUEST_BYTES = Counter(
+    "schedule_concierge_request_bytes_total", "HTTP request body bytes received", ["method", "path"]
+)
+RESPONSE_BYTES = Counter(
+    "schedule_concierge_response_bytes_total", "HTTP response body bytes sent", ["method", "path"]
+)
+REQUESTS_IN_FLIGHT = Gauge(
+    "schedule_concierge_requests_in_flight", "HTTP requests currently being served"
+)
+DB_QUERIES_PER_REQUEST = Histogram(
+    "schedule_concierge_db_queries_per_request", "SQL statements executed per HTTP request", ["path"],
+    buckets=(0, 1, 2, 3, 5, 10, 20, 50, 100),
+)
+DB_TIME_PER_REQUEST = Histogram(
+    "schedule_concierge_db_time_per_request_seconds", "Time spent in SQL statements per HTTP request", ["path"],
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.2, 0.3, 0.5, 1.0),
+)
+
+
+class QueryStats:
+    """SQL statements of one request. Shared by reference with threadpool work via a ContextVar."""
+    __slots__ = ("count", "seconds", "statements")
+
+    def __init__(self, keep_statements: bool = False):
+        self.count = 0
+        self.seconds = 0.0
+        self.statements: Optional[List[Tuple[float, str]]] = [] if keep_statements else None
+
+    def add(self, seconds: float, statement: str) -> None:
+        self.count += 1
+        self.seconds += seconds
+        if self.statements is not None:
+            self.statements.append((seconds, statement))
+
+
+current_query_stats: contextvars.ContextVar[Optional[QueryStats]] = contextvars.ContextVar("query_stats", default=None)
+
+
+# The start time lives on the statement's execution context, so a statement that
+# fails (no after_cursor_execute) leaves nothing behind on the pooled connection.
+@event.listens_for(Engine, "before_cursor_execute")
+def _query_started(conn, cursor, statement, parameters, context, executemany):
+    if context is not None and current_query_stats.get() is not None:
+        context._sc_query_started = time.perf_counter()
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _query_finished(conn, cursor, statement, parameters, context, executemany):
+    stats = current_query_stats.get()
+    started = getattr(context, "_sc_query_started", None)
+    if stats is not None and started is not None:
+        stats.add(time.perf_counter() - started, statement)
+
+
+def route_label(scope) -> str:
+    """Matched route template (e.g. /events/{event_id}); unknown paths share one bucket."""
+    route = scope.get("route")
+    return getattr(route, "path", None) or UNMATCHED_ROUTE
+
+
+def trace_exemplar():
+    if not _otel_available:
+        return None
+    ctx = trace.get_current_span().get_span_context()
+    if not ctx.is_valid or not ctx.trace_flags.sampled:
+        return None
+    return {"trace_id": format(ctx.trace_id, "032x")}
+
+
+class MetricsMiddleware:
+    def __init__(self, app, tracer=None):
+        self.app = app
+        self.tracer = tracer
+        self._children = {}  # (method, path) -> (latency, request/response bytes, db queries/time)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        method = scope["method"] if scope["method"] in KNOWN_METHODS else OTHER_METHOD
+        started = time.perf_counter()
+        # one mutable cell instead of closures rebinding nonlocals: [status, request bytes, response bytes]
+        state = [500, 0, 0]
+
+        async def counting_receive():
+            message = await receive()
+            if message["type"] == "http.request":
+                state[1] += len(message.get("body", b""))
+            return message
+
+        async def counting_send(message):
+            if message["type"] == "http.response.start":
+                state[0] = message["status"]
+            elif message["type"] == "http.response.body":
+                state[2] += len(message.get("body", b""))
+            await send(message)
+
+        REQUESTS_IN_FLIGHT.inc()
+        queries = QueryStats()
+        token = current_query_stats.set(queries)
+        exemplar = None
+        try:
+            if self.tracer is None:
+                await self.app(scope, counting_receive, counting_send)
+                exemplar = trace_exemplar()
+            else:
+                with self.tracer.start_as_current_span(f"HTTP {method}") as span:
+                    await self.app(scope, counting_receive, counting_send)
+                    span.update_name(f"HTTP {method} {route_label(scope)}")
+                    exemplar = trace_exemplar()
+        finally:
+            current_query_stats.reset(token)
+            REQUESTS_IN_FLIGHT.dec()
+            # the route is only known once the router has matched, i.e. after the app ran
+            path = route_label(scope)
+            children = self._children.get((method, path))
+            if children is None:
+                children = self._children[(method, path)] = (
+                    REQUEST_LATENCY.labels(method=method, path=path),
+                    REQUEST_BYTES.labels(method=method, path=path),
+                    RESPONSE_BYTES.labels(method=method, path=path),
+                    DB_QUERIES_PER_REQUEST.labels(path=path),
+                    DB_TIME_PER_REQUEST.labels(path=path),
+                )
+            children[0].observe(time.perf_counter() - started, exemplar)
+            if state[1]:
+                children[1].inc(state[1])
+            if state[2]:
+                children[2].inc(state[2])
+            children[3].observe(queries.count)
+            children[4].observe(queries.seconds)
+            REQUEST_COUNT.labels(method=method, path=path, status=str(state[0])).inc()
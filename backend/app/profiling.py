@@ -0,0 +1,225 @@
+"""On-demand profiling: a pure-Python stack sampler and per-request profiles.
+
+* StackSampler snapshots every thread's stack (sys._current_frames) at a fixed
+  interval and aggregates them as collapsed stacks ("a;b;c count"), the input
+  format of flamegraph.pl / speedscope.
+* ProfilingMiddleware profiles a single request when it carries
+  "X-Profile: 1" plus a valid admin token and its route template is enabled
+  (PROFILE_ROUTES or PUT /admin/profile/routes). The result, including the
+  request's SQL statements, is kept in a small in-memory ring buffer and
+  summarised in a Server-Timing response header.
+
+Only one sampler runs at a time per process; a profile request arriving while
+another runs is served normally with "X-Profile-Status: busy".
+"""
+from __future__ import annotations
+import hmac
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from typing import Any, Dict, List, Optional, Set
+from .observability import QueryStats, current_query_stats, route_label
+
+ADMIN_TOKEN_HEADER = "x-admin-token"
+PROFILE_HEADER = "x-profile"
+MAX_PROFILE_SECONDS = 60.0
+PROFILE_STORE_SIZE = 50
+
+# Threads parked in these frames are idle and would drown out the real work.
+_IDLE_FRAMES = {
+    ("threading.py", "wait"), ("selectors.py", "select"), ("queue.py", "get"),
+    ("threading.py", "_wait_for_tstate_lock"), ("base_events.py", "_run_once"),
+}
+
+_sampler_lock = threading.Lock()
+
+
+def admin_token() -> Optional[str]:
+    return os.getenv("ADMIN_TOKEN") or None
+
+
+def admin_token_matches(candidate: Optional[str]) -> bool:
+    expected = admin_token()
+    return bool(expected and candidate and hmac.compare_digest(candidate, expected))
+
+
+def _frame_label(code) -> str:
+    filename = code.co_filename.replace("\\", "/")
+    if "/app/" in filename:
+        filename = "app/" + filename.rsplit("/app/", 1)[1]
+    else:
+        filename = filename.rsplit("/", 1)[-1]
+    return f"{code.co_name} ({filename}:{code.co_firstlineno})"
+
+
+class StackSampler:
+    """Collects collapsed stacks from all other threads every `interval` seconds."""
+
+    def __init__(self, interval: float = 0.005):
+        self.interval = interval
+        self.samples = 0
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._labels: Dict[Any, str] = {}  # code object -> label
+
+    def start(self) -> bool:
+        """Begin sampling; False when another sampler already holds the process."""
+        if not _sampler_lock.acquire(blocking=False):
+            return False
+        self._thread = threading.Thread(target=self._run, name="stack-sampler", daemon=True)
+        self._thread.start()
+        return True
+
+    def stop(self) -> "StackSampler":
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+            _sampler_lock.release()
+        return self
+
+    def _run(self) -> None:
+        me = threading.get_ident()
+        labels = self._labels
+        while not self._stop.wait(self.interval):
+            self.samples += 1
+            for tid, frame in sys._current_frames().items():
+                if tid == me:
+                    continue
+                code = frame.f_code
+                if (code.co_filename.rsplit("/", 1)[-1], code.co_name) in _IDLE_FRAMES:
+                    continue
+                parts = []
+                while frame is not None:
+                    code = frame.f_code
+                    label = labels.get(code)
+                    if label is None:
+                        label = labels[code] = _frame_label(code)
+                    parts.append(label)
+                    frame = frame.f_back
+                parts.reverse()
+                self.stacks[";".join(parts)] += 1
+
+    def collapsed(self) -> str:
+        return "\n".join(f"{stack} {count}" for stack, count in self.stacks.most_common())
+
+    def as_dict(self, limit: Optional[int] = None) -> Dict[str, Any]:
+        return {
+            "samples": self.samples,
+            "intervalMs": self.interval * 1000,
+            "stacks": [{"stack": s, "count": c} for s, c in self.stacks.most_common(limit)],
+        }
+
+
+class ProfileStore:
+    """Last N per-request profiles, newest last."""
+
+    def __init__(self, maxsize: int = PROFILE_STORE_SIZE):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, profile: Dict[str, Any]) -> None:
+        with self._lock:
+            self._data[profile["id"]] = profile
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        return self._data.get(profile_id)
+
+    def summaries(self) -> List[Dict[str, Any]]:
+        keys = ("id", "method", "route", "status", "durationMs")
+        return [{k: p[k] for k in keys} for p in reversed(self._data.values())]
+
+
+profile_store = ProfileStore()
+profiled_routes: Set[str] = {r.strip() for r in os.getenv("PROFILE_ROUTES", "").split(",") if r.strip()}
+
+
+def _header(scope, name: bytes) -> Optional[str]:
+    for key, value in scope["headers"]:
+        if key == name:
+            return value.decode("latin-1")
+    return None
+
+
+class ProfilingMiddleware:
+    """Profiles requests sent with X-Profile: 1 and an admin token.
+
+    The route template is only known once the router has matched, so sampling
+    starts for any authorised request and the result is kept (and headers
+    added) only when the matched route is enabled.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        # fast path: nothing enabled, or the request did not ask for a profile
+        if scope["type"] != "http" or not profiled_routes or _header(scope, PROFILE_HEADER.encode()) != "1":
+            await self.app(scope, receive, send)
+            return
+        if not admin_token_matches(_header(scope, ADMIN_TOKEN_HEADER.encode())):
+            await self.app(scope, receive, send)
+            return
+        await self._profile(scope, receive, send)
+
+    async def _profile(self, scope, receive, send):
+        sampler = StackSampler(interval=0.001)
+        if not sampler.start():
+            async def send_busy(message):
+                if message["type"] == "http.response.start":
+                    message.setdefault("headers", []).append((b"x-profile-status", b"busy"))
+                await send(message)
+            await self.app(scope, receive, send_busy)
+            return
+
+        profile_id = uuid.uuid4().hex[:12]
+        # replace the request's QueryStats with one that keeps statements, then fold it back
+        outer = current_query_stats.get()
+        queries = QueryStats(keep_statements=True)
+        token = current_query_stats.set(queries)
+        started = time.perf_counter()
+        status = [500]
+
+        async def profiling_send(message):
+            if message["type"] == "http.response.start" and route_label(scope) in profiled_routes:
+                status[0] = message["status"]
+                app_ms = (time.perf_counter() - started) * 1000
+                timing = f'db;dur={queries.seconds * 1000:.1f};desc="{queries.count} queries", app;dur={app_ms:.1f}'
+                message.setdefault("headers", []).extend([
+                    (b"x-profile-id", profile_id.encode()),
+                    (b"server-timing", timing.encode()),
+                ])
+            await send(message)
+
+        try:
+            await self.app(scope, receive, profiling_send)
+        finally:
+            sampler.stop()
+            current_query_stats.reset(token)
+            if outer is not None:
+                outer.count += queries.count
+                outer.seconds += queries.seconds
+            route = route_label(scope)
+            if route not in profiled_routes:
+                return
+            slowest = sorted(queries.statements or [], key=lambda q: q[0], reverse=True)[:20]
+            profile_store.add({
+                "id": profile_id,
+                "method": scope["method"],
+                "route": route,
+                "status": status[0],
+                "durationMs": round((time.perf_counter() - started) * 1000, 2),
+                "queries": {
+                    "count": queries.count,
+                    "totalMs": round(queries.seconds * 1000, 2),
+                    "slowest": [{"ms": round(sec * 1000, 3), "sql": sql[:500]} for sec, sql in slowest],
+                },
+                "profile": sampler.as_dict(limit=200),
+            })
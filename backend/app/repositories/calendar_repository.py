@@ -1,5 +1,7 @@
 from __future__ import annotations
 from typing import Protocol, List
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from ..db import models
 
@@ -67,3 +69,32 @@ class SqlAlchemyCalendarRepository:
             )
             db.add(cal)
             return cal
+
+
+class AsyncCalendarRepository(Protocol):
+    async def list_selected_by_user(self, db: AsyncSession, user_id: str) -> List[models.Calendar]:
+        ...
+
+    async def list_by_user(self, db: AsyncSession, user_id: str) -> List[models.Calendar]:
+        ...
+
+    async def get_first_by_user(self, db: AsyncSession, user_id: str) -> models.Calendar | None:
+        ...
+
+
+class AsyncSqlAlchemyCalendarRepository:
+    async def list_selected_by_user(self, db: AsyncSession, user_id: str) -> List[models.Calendar]:
+        stmt = select(models.Calendar).where(models.Calendar.user_id == user_id, models.Calendar.selected == 1)
+        return list((await db.scalars(stmt)).all())
+
+    async def list_by_user(self, db: AsyncSession, user_id: str) -> List[models.Calendar]:
+        stmt = (
+            select(models.Calendar)
+            .where(models.Calendar.user_id == user_id)
+            .order_by(models.Calendar.is_default.desc(), models.Calendar.name)
+        )
+        return list((await db.scalars(stmt)).all())
+
+    async def get_first_by_user(self, db: AsyncSession, user_id: str) -> models.Calendar | None:
+        stmt = select(models.Calendar).where(models.Calendar.user_id == user_id).limit(1)
+        return (await db.scalars(stmt)).first()
@@ -1,14 +1,53 @@
 from __future__ import annotations
-from typing import Protocol, List, Optional
+from typing import Protocol, List, Optional, Sequence, Tuple
 from datetime import datetime
+from sqlalchemy import select, and_, or_, literal_column
+from sqlalchemy.dialects.postgresql import Range, TSTZRANGE
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from ..db import models
+from ..domain.spans import EventSpan, epoch_second, from_epoch
+
+# Interval predicates compare the integer start_ts / end_ts shadow columns
+# (ix_events_user_start_ts) rather than the DateTime columns. On PostgreSQL an
+# overlap is one GiST lookup on the generated `during` range instead.
+_DURING = literal_column("events.during", TSTZRANGE)
+
+
+def _overlapping(dialect: str, start: datetime, end: datetime):
+    start_s, end_s = epoch_second(start), epoch_second(end)
+    if dialect == "postgresql":
+        return (_DURING.overlaps(Range(from_epoch(start_s), from_epoch(end_s), bounds="[)")),)
+    return models.Event.start_ts < end_s, models.Event.end_ts > start_s
+
+
+def _dialect(db) -> str:
+    return db.get_bind().dialect.name
+
+
+def _starting_within(now: datetime, end_window: datetime):
+    return models.Event.start_ts >= epoch_second(now), models.Event.start_ts <= epoch_second(end_window)
+
+
+def _future_spans(user_id: str, now: datetime, end_window: datetime, exclude_event_id: Optional[str]):
+    """Core select of (start_ts, end_ts, type, id) for find_future_events' rows."""
+    stmt = (
+        select(models.Event.start_ts, models.Event.end_ts, models.Event.type, models.Event.id)
+        .join(models.Calendar, models.Calendar.id == models.Event.calendar_id)
+        .where(models.Calendar.selected == 1, models.Event.user_id == user_id, *_starting_within(now, end_window))
+    )
+    if exclude_event_id:
+        stmt = stmt.where(models.Event.id != exclude_event_id)
+    return stmt
 
 
 class EventRepository(Protocol):
     def find_overlapping(self, db: Session, user_id: str, start: datetime, end: datetime) -> List[models.Event]: ...
     def find_future_events(self, db: Session, user_id: str, now: datetime, end_window: datetime, exclude_event_id: Optional[str] = None) -> List[models.Event]: ...
+    def find_future_spans(self, db: Session, user_id: str, now: datetime, end_window: datetime, exclude_event_id: Optional[str] = None) -> List[EventSpan]: ...
+    def find_spans_by_ids(self, db: Session, user_id: str, event_ids: Sequence[str]) -> List[EventSpan]: ...
+    def find_spans_overlapping(self, db: Session, user_id: str, ranges: Sequence[Tuple[datetime, datetime]]) -> List[EventSpan]: ...
 
 
 class SqlAlchemyEventRepository:
@@ -19,8 +58,7 @@ class SqlAlchemyEventRepository:
         q = q.join(models.Calendar, models.Calendar.id == models.Event.calendar_id)
         q = q.filter(models.Calendar.selected == 1)
         q = q.filter(models.Event.user_id == user_id)
-        q = q.filter(models.Event.start_at < end)
-        q = q.filter(models.Event.end_at > start)
+        q = q.filter(*_overlapping(_dialect(db), start, end))
         return q.all()
 
     def find_future_events(self, db: Session, user_id: str, now: datetime, end_window: datetime, exclude_event_id: Optional[str] = None) -> List[models.Event]:
@@ -28,8 +66,110 @@ class SqlAlchemyEventRepository:
         q = q.join(models.Calendar, models.Calendar.id == models.Event.calendar_id)
         q = q.filter(models.Calendar.selected == 1)
         q = q.filter(models.Event.user_id == user_id)
-        q = q.filter(models.Event.start_at >= now)
-        q = q.filter(models.Event.start_at <= end_window)
+        q = q.filter(*_starting_within(now, end_window))
         if exclude_event_id:
             q = q.filter(models.Event.id != exclude_event_id)
         return q.all()
+
+    def find_future_spans(self, db: Session, user_id: str, now: datetime, end_window: datetime, exclude_event_id: Optional[str] = None) -> List[EventSpan]:
+        """find_future_events as EventSpan tuples: a Core select on the connection (no ORM loading, no autoflush)."""
+        return EventSpan.from_rows(db.connection().execute(_future_spans(user_id, now, end_window, exclude_event_id)))
+
+    def find_spans_by_ids(self, db: Session, user_id: str, event_ids: Sequence[str]) -> List[EventSpan]:
+        """The user's events among event_ids as EventSpans (any calendar); unknown ids are skipped."""
+        stmt = (
+            select(models.Event.start_ts, models.Event.end_ts, models.Event.type, models.Event.id)
+            .where(models.Event.user_id == user_id, models.Event.id.in_(list(event_ids)))
+        )
+        return EventSpan.from_rows(db.connection().execute(stmt))
+
+    def find_spans_overlapping(self, db: Session, user_id: str, ranges: Sequence[Tuple[datetime, datetime]]) -> List[EventSpan]:
+        """EventSpans of events on selected calendars overlapping any of the (start, end) ranges."""
+        dialect = _dialect(db)
+        stmt = (
+            select(models.Event.start_ts, models.Event.end_ts, models.Event.type, models.Event.id)
+            .join(models.Calendar, models.Calendar.id == models.Event.calendar_id)
+            .where(models.Calendar.selected == 1, models.Event.user_id == user_id,
+                   or_(*(and_(*_overlapping(dialect, start, end)) for start, end in ranges)))
+        )
+        return EventSpan.from_rows(db.connection().execute(stmt))
+
+
+class AsyncEventRepository(Protocol):
+    async def find_overlapping(self, db: AsyncSession, user_id: str, start: datetime, end: datetime) -> List[models.Event]: ...
+    async def find_future_events(self, db: AsyncSession, user_id: str, now: datetime, end_window: datetime, exclude_event_id: Optional[str] = None) -> List[models.Event]: ...
+    async def find_future_spans(self, db: AsyncSession, user_id: str, now: datetime, end_window: datetime, exclude_event_id: Optional[str] = None) -> List[EventSpan]: ...
+    async def list_page(self, db: AsyncSession, user_id: str, columns: Sequence[str], start_from: Optional[datetime] = None, start_to: Optional[datetime] = None, after: Optional[Tuple[datetime, str]] = None, limit: Optional[int] = None) -> list: ...
+    async def find_busy_for_users(self, db: AsyncSession, user_ids: Sequence[str], start: datetime, end: datetime) -> list: ...
+
+
+class AsyncSqlAlchemyEventRepository:
+    """AsyncSession variant of SqlAlchemyEventRepository (same selected-calendar semantics)."""
+
+    def _selected(self, user_id: str):
+        return (
+            select(models.Event)
+            .join(models.Calendar, models.Calendar.id == models.Event.calendar_id)
+            .where(models.Calendar.selected == 1, models.Event.user_id == user_id)
+        )
+
+    async def find_overlapping(self, db: AsyncSession, user_id: str, start: datetime, end: datetime) -> List[models.Event]:
+        stmt = self._selected(user_id).where(*_overlapping(_dialect(db), start, end))
+        return list((await db.scalars(stmt)).all())
+
+    async def find_future_events(self, db: AsyncSession, user_id: str, now: datetime, end_window: datetime, exclude_event_id: Optional[str] = None) -> List[models.Event]:
+        stmt = self._selected(user_id).where(*_starting_within(now, end_window))
+        if exclude_event_id:
+            stmt = stmt.where(models.Event.id != exclude_event_id)
+        return list((await db.scalars(stmt)).all())
+
+    async def find_future_spans(self, db: AsyncSession, user_id: str, now: datetime, end_window: datetime, exclude_event_id: Optional[str] = None) -> List[EventSpan]:
+        stmt = _future_spans(user_id, now, end_window, exclude_event_id)
+        return EventSpan.from_rows(await (await db.connection()).execute(stmt))
+
+    async def list_page(
+        self,
+        db: AsyncSession,
+        user_id: str,
+        columns: Sequence[str],
+        start_from: Optional[datetime] = None,
+        start_to: Optional[datetime] = None,
+        after: Optional[Tuple[datetime, str]] = None,
+        limit: Optional[int] = None,
+    ) -> list:
+        """Core select of only `columns`, keyset-ordered by (start_at, id).
+
+        `after` is the (start_at, id) of the last row of the previous page.
+        Returns Row tuples in `columns` order; start_at and id are appended
+        when not requested so callers can always build the next cursor.
+        """
+        names = list(columns) + [n for n in ("start_at", "id") if n not in columns]
+        stmt = (
+            select(*(getattr(models.Event, n) for n in names))
+            .join(models.Calendar, models.Calendar.id == models.Event.calendar_id)
+            .where(models.Calendar.selected == 1, models.Event.user_id == user_id)
+        )
+        if start_from is not None:
+            stmt = stmt.where(models.Event.start_at >= start_from)
+        if start_to is not None:
+            stmt = stmt.where(models.Event.start_at < start_to)
+        if after is not None:
+            after_start, after_id = after
+            stmt = stmt.where(or_(
+                models.Event.start_at > after_start,
+                and_(models.Event.start_at == after_start, models.Event.id > after_id),
+            ))
+        stmt = stmt.order_by(models.Event.start_at, models.Event.id)
+        if limit is not None:
+            stmt = stmt.limit(limit)
+        return list((await db.execute(stmt)).all())
+
+    async def find_busy_for_users(self, db: AsyncSession, user_ids: Sequence[str], start: datetime, end: datetime) -> list:
+        """(user_id, start_ts, end_ts, type) rows overlapping [start, end) for all users in one query."""
+        stmt = (
+            select(models.Event.user_id, models.Event.start_ts, models.Event.end_ts, models.Event.type)
+            .join(models.Calendar, models.Calendar.id == models.Event.calendar_id)
+            .where(models.Calendar.selected == 1, models.Event.user_id.in_(list(user_ids)),
+                   *_overlapping(_dialect(db), start, end))
+        )
+        return list((await db.execute(stmt)).all())
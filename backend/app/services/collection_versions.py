@@ -0,0 +1,140 @@
+"""Per-user collection versions backing ETags for polled list endpoints.
+
+Every commit that touches events / calendars / tasks rows bumps the owning
+user's counter for that collection (via the session write listener), so GET
+handlers can compare If-None-Match against the current versions without
+querying the collection itself.
+
+Backend is selectable via COLLECTION_VERSION_BACKEND (memory | redis). The
+memory store is per process and only sees that process's commits, so it is
+used only when WEB_CONCURRENCY is unset or 1; with several workers (or when
+redis was requested but cannot be loaded) ETags are disabled instead of
+risking a stale 304. Versions fail open: while a redis bump is unconfirmed
+the store raises and handlers serve a full 200.
+"""
+from __future__ import annotations
+from typing import Protocol, Sequence, List, Iterable, Set, Tuple
+import hashlib
+import logging
+import os
+import threading
+import uuid
+
+from ..db.session import register_write_listener
+
+logger = logging.getLogger(__name__)
+
+VERSIONED_COLLECTIONS = {"events", "calendars", "tasks"}
+
+
+class VersionStore(Protocol):
+    epoch: str
+
+    def get_many(self, user_id: str, collections: Sequence[str]) -> List[int]: ...
+    def bump(self, user_id: str, collection: str) -> None: ...
+
+
+class MemoryVersionStore:
+    def __init__(self):
+        # A fresh epoch per process keeps ETags from before a restart from matching.
+        self.epoch = uuid.uuid4().hex[:8]
+        self._data: dict[tuple[str, str], int] = {}
+        self._lock = threading.Lock()
+
+    def get_many(self, user_id: str, collections: Sequence[str]) -> List[int]:
+        return [self._data.get((user_id, c), 0) for c in collections]
+
+    def bump(self, user_id: str, collection: str) -> None:
+        with self._lock:
+            key = (user_id, collection)
+            self._data[key] = self._data.get(key, 0) + 1
+
+
+class RedisVersionStore:
+    """Counters live at sc:ver:<user_id>:<collection> (INCR / MGET).
+
+    A failed INCR is kept and retried before the next read; until it lands
+    get_many raises, so this process serves no 304s on stale versions.
+    """
+    KEY_PREFIX = "sc:ver:"
+
+    def __init__(self, redis_client):
+        self.redis = redis_client
+        self.epoch = "r"
+        self._pending: Set[str] = set()
+        self._lock = threading.Lock()
+
+    def get_many(self, user_id: str, collections: Sequence[str]) -> List[int]:
+        self._flush_pending()
+        vals = self.redis.mget([f"{self.KEY_PREFIX}{user_id}:{c}" for c in collections])
+        return [int(v or 0) for v in vals]
+
+    def bump(self, user_id: str, collection: str) -> None:
+        key = f"{self.KEY_PREFIX}{user_id}:{collection}"
+        try:
+            self.redis.incr(key)
+        except Exception:
+            with self._lock:
+                self._pending.add(key)
+            raise
+
+    def _flush_pending(self) -> None:
+        with self._lock:
+            pending = list(self._pending)
+        for key in pending:
+            self.redis.incr(key)  # raises (-> no ETag) while redis is still unavailable
+            with self._lock:
+                self._pending.discard(key)
+
+
+class DisabledVersionStore:
+    """No shared versions available: every lookup fails, so ETags are never issued."""
+    epoch = "-"
+
+    def get_many(self, user_id: str, collections: Sequence[str]) -> List[int]:
+        raise RuntimeError("collection versions are disabled")
+
+    def bump(self, user_id: str, collection: str) -> None:
+        pass
+
+
+_store: VersionStore | None = None
+
+
+def get_version_store() -> VersionStore:
+    global _store
+    if _store is None:
+        if os.getenv("COLLECTION_VERSION_BACKEND", "memory").lower() == "redis":
+            try:
+                import redis  # type: ignore
+                _store = RedisVersionStore(redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379/0")))
+            except Exception:
+                logger.warning("COLLECTION_VERSION_BACKEND=redis unavailable; ETags disabled")
+                _store = DisabledVersionStore()
+        elif int(os.getenv("WEB_CONCURRENCY", "1") or 1) > 1:
+            # other workers' commits would never bump this process's counters
+            logger.warning("memory collection versions need a single worker; ETags disabled "
+                           "(set COLLECTION_VERSION_BACKEND=redis)")
+            _store = DisabledVersionStore()
+        else:
+            _store = MemoryVersionStore()
+    return _store
+
+
+@register_write_listener
+def bump_for_writes(writes: Iterable[Tuple[str, str]]):
+    store = get_version_store()
+    for user_id, table in writes:
+        if table in VERSIONED_COLLECTIONS:
+            try:
+                store.bump(user_id, table)
+            except Exception:  # never fail a commit over cache metadata; the store retries it
+                logger.warning("collection version bump failed for %s/%s", user_id, table)
+
+
+def collection_etag(user_id: str, collections: Sequence[str], *extra: str) -> str:
+    """Strong ETag over the user's collection versions plus request-specific parts."""
+    store = get_version_store()
+    versions = store.get_many(user_id, collections)
+    raw = "|".join([store.epoch, user_id, *collections, *map(str, versions), *extra])
+    return '"' + hashlib.blake2b(raw.encode(), digest_size=12).hexdigest() + '"'
@@ -0,0 +1,126 @@
+"""Common free slots for a group of users (group scheduling).
+
+Busy time for every participant comes from one query. Each participant's
+events become an OccupancyBitmap, and the group's free time is the AND of
+their free cells over the horizon, so cost grows with participants x days
+rather than with pairwise event comparisons. An event covering part of a
+15-minute cell blocks the whole cell.
+
+FOCUS blocks are a hard constraint (treated as busy) or a soft one (allowed,
+but the slot takes the usual FOCUS penalty and lists whose focus time it hits).
+
+Free/busy is only shared inside an organization: a caller may include users
+whose email domain matches their own (visible_to).
+"""
+from collections import defaultdict
+from datetime import datetime, timedelta
+from math import ceil
+from types import SimpleNamespace
+from typing import Any, Dict, Iterable, List, Sequence
+import time
+
+from prometheus_client import Histogram
+
+from .recommendation_service import (
+    SLOT_GRANULARITY_MIN, OccupancyBitmap, cell_of, cell_start, first_whole_cell, free_runs, score_slot,
+)
+
+FOCUS_MODES = ("soft", "hard")
+MAX_PARTICIPANTS = 100
+MAX_HORIZON_DAYS = 31
+FOCUS_PENALTY = 0.1  # same multiplier score_slot applies to a single user's FOCUS overlap
+
+COMMON_SLOT_DURATION = Histogram(
+    "schedule_concierge_common_slots_duration_seconds",
+    "Time spent intersecting participants' calendars for common slots",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 1.5),
+)
+
+
+def _domain(email: str) -> str:
+    return email.rpartition("@")[2].lower()
+
+
+def visible_to(caller_email: str, email: str) -> bool:
+    """Whether the caller may see this user's free/busy (same email domain)."""
+    return bool(_domain(caller_email)) and _domain(caller_email) == _domain(email)
+
+
+def workday_windows(start: datetime, end: datetime, first_hour: int = 9, last_hour: int = 17) -> List[Dict[str, datetime]]:
+    """Weekday working-hour windows between start and end (clipped to both)."""
+    windows = []
+    day = start.replace(hour=0, minute=0, second=0, microsecond=0)
+    while day < end:
+        if day.weekday() < 5:
+            w_start, w_end = max(day.replace(hour=first_hour), start), min(day.replace(hour=last_hour), end)
+            if w_start < w_end:
+                windows.append({"start": w_start, "end": w_end})
+        day += timedelta(days=1)
+    return windows
+
+
+def common_slots(
+    busy: Iterable[Any],
+    user_ids: Sequence[str],
+    availability: List[Dict[str, datetime]],
+    duration_minutes: int,
+    focus: str = "soft",
+    limit: int = 5,
+    priority: int = 3,
+) -> List[Dict[str, Any]]:
+    """Rank slots of `duration_minutes` free for every user in user_ids.
+
+    busy: rows with user_id, start_ts, end_ts (or start_at, end_at), type (any participant, any order).
+    Candidates start on the 15-minute grid inside an availability window.
+    """
+    started = time.perf_counter()
+    if not availability:
+        return []
+    by_user: Dict[str, List[Any]] = defaultdict(list)
+    for row in busy:
+        by_user[row.user_id].append(row)
+
+    first = cell_of(min(w["start"] for w in availability))
+    cells = cell_of(max(w["end"] for w in availability)) + 1 - first
+    window_bits = 0
+    for w in availability:
+        lo, hi = first_whole_cell(w["start"]), cell_of(w["end"])
+        if hi > lo:
+            window_bits |= ((1 << (hi - lo)) - 1) << (lo - first)
+
+    busy_bits = focus_bits = 0
+    focus_by_user: Dict[str, int] = {}
+    for user_id in user_ids:
+        rows = by_user.get(user_id, [])
+        focus_rows = [r for r in rows if r.type == "FOCUS"]
+        other_rows = [r for r in rows if r.type != "FOCUS"] if focus_rows else rows
+        busy_bits |= OccupancyBitmap(other_rows).span_bits(first, cells)[0]
+        if focus_rows:
+            user_focus = OccupancyBitmap(focus_rows).span_bits(first, cells)[0]
+            if user_focus:
+                focus_by_user[user_id] = user_focus
+                focus_bits |= user_focus
+    if focus == "hard":
+        busy_bits |= focus_bits
+
+    slot_cells = ceil(duration_minutes / SLOT_GRANULARITY_MIN)
+    starts = free_runs(window_bits & ~busy_bits, slot_cells)
+    meeting = SimpleNamespace(priority=priority, due_at=None, estimated_minutes=duration_minutes, energy_tag=None)
+    slot_mask = (1 << slot_cells) - 1
+    ranked = []
+    while starts:
+        low = starts & -starts
+        starts ^= low
+        i = low.bit_length() - 1
+        mask = slot_mask << i
+        hit = [u for u, bits in focus_by_user.items() if bits & mask] if focus_bits & mask else []
+        slot_start = cell_start(first + i)
+        slot_end = slot_start + timedelta(minutes=duration_minutes)
+        score = score_slot(meeting, slot_start, slot_end, focus_penalty=FOCUS_PENALTY if hit else 1.0)
+        ranked.append((-round(score, 4), len(hit), i, slot_start, slot_end, hit))
+    ranked.sort(key=lambda r: r[:3])
+    COMMON_SLOT_DURATION.observe(time.perf_counter() - started)
+    return [
+        {"startAt": s.isoformat(), "endAt": e.isoformat(), "score": -neg, "focusConflicts": hit}
+        for neg, _, _, s, e, hit in ranked[:limit]
+    ]
@@ -1,14 +1,109 @@
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from datetime import datetime, timezone, timedelta
-from typing import List, Dict
+from typing import List, Dict, NamedTuple, Optional
+from prometheus_client import Histogram
 from ..db import models
-from ..repositories.event_repository import EventRepository, SqlAlchemyEventRepository
-from .recommendation_service import compute_slots
+from ..domain.spans import EventSpan, epoch_second
+from ..repositories.event_repository import (
+    EventRepository,
+    SqlAlchemyEventRepository,
+    AsyncEventRepository,
+    AsyncSqlAlchemyEventRepository,
+)
+from .recommendation_service import OccupancyBitmap, compute_slots
+
+RESOLUTION_HORIZON_DAYS = 14  # alternatives are searched over the next two weeks
+
+
+# batch resolution order: the most protected event keeps its place first
+_TYPE_RANK = {"FOCUS": 0, "MEETING": 1, "GENERAL": 2, "BUFFER": 3}
+
+RESOLUTION_BATCH_SIZE = Histogram(
+    "schedule_concierge_conflict_resolution_batch_size", "Events per suggest_resolutions call",
+    buckets=(1, 5, 10, 25, 50, 100, 200, 500),
+)
+
+
+class _EventTask(NamedTuple):
+    """An event seen as a task by the recommendation engine."""
+    estimated_minutes: int
+    priority: int = 3
+    due_at: Optional[datetime] = None
+    energy_tag: Optional[str] = None
+
+
+def _as_task(event) -> _EventTask:
+    minutes = int((event.end_at - event.start_at).total_seconds() / 60)
+    if event.type == "FOCUS":
+        return _EventTask(minutes, energy_tag="deep")
+    if event.type == "MEETING":
+        return _EventTask(minutes, priority=2)  # Higher priority for meetings
+    return _EventTask(minutes)
+
+
+def _resolution_order(event):
+    return _TYPE_RANK.get(event.type, len(_TYPE_RANK)), _utc_bounds(event)[0], event.id
+
+
+def resolution_availability(now: datetime) -> List[Dict[str, datetime]]:
+    """Working hours (9-17) on weekdays over the next RESOLUTION_HORIZON_DAYS."""
+    availability = []
+    for day in range(RESOLUTION_HORIZON_DAYS):
+        day_start = now.replace(hour=9, minute=0, second=0, microsecond=0) + timedelta(days=day)
+        if day_start.weekday() < 5:  # Monday = 0, Friday = 4
+            availability.append({"start": day_start, "end": day_start.replace(hour=17)})
+    return availability
+
 
 class ConflictDetected(Exception):
     """Raised when event conflicts are detected and not allowed"""
     pass
 
+def is_focus_exclusion_violation(exc: IntegrityError) -> bool:
+    """True when a write was rejected by the PostgreSQL FOCUS exclusion constraint (SQLSTATE 23P01)."""
+    orig = exc.orig
+    sqlstate = getattr(orig, "pgcode", None) or getattr(orig, "sqlstate", None)
+    return sqlstate == "23P01" and models.FOCUS_EXCLUSION_CONSTRAINT in str(orig)
+
+
+def _utc_bounds(event: models.Event):
+    """Return (start, end) of an event as timezone-aware UTC datetimes."""
+    start = event.start_at
+    end = event.end_at
+    if start.tzinfo is None:
+        start = start.replace(tzinfo=timezone.utc)
+    if end.tzinfo is None:
+        end = end.replace(tzinfo=timezone.utc)
+    return start, end
+
+
+def _exclude_self(events: List[models.Event], new_event: models.Event) -> List[models.Event]:
+    # Don't conflict with self (only if the event has an ID)
+    if getattr(new_event, 'id', None):
+        return [e for e in events if e.id != new_event.id]
+    return events
+
+
+def _ensure_focus_allowed(conflicts: List[models.Event], new_event: models.Event, allow_focus_override: bool):
+    """Raise ConflictDetected when a non-FOCUS event would overlap a FOCUS block."""
+    if not conflicts:
+        return  # No conflicts
+
+    # Check for FOCUS time conflicts (but only prevent non-FOCUS events from conflicting)
+    focus_conflicts = [c for c in conflicts if c.type == "FOCUS"]
+
+    if focus_conflicts and new_event.type != "FOCUS" and not allow_focus_override:
+        raise ConflictDetected(
+            f"FOCUS time is protected. Cannot create event during focus blocks: "
+            f"{[c.title for c in focus_conflicts]}"
+        )
+
+    # For now, we allow other types of conflicts with warnings
+    # In the future, this could be more sophisticated
+
+
 class ConflictService:
     """Service for detecting and resolving event conflicts"""
     def __init__(self, repository: EventRepository | None = None):
@@ -25,25 +120,13 @@ class ConflictService:
         Returns:
             List of conflicting existing events
         """
-        # Ensure timezone consistency
-        new_start = new_event.start_at
-        new_end = new_event.end_at
-        
-        if new_start.tzinfo is None:
-            new_start = new_start.replace(tzinfo=timezone.utc)
-        if new_end.tzinfo is None:
-            new_end = new_end.replace(tzinfo=timezone.utc)
-
+        new_start, new_end = _utc_bounds(new_event)
         # Find overlapping events via repository (selected calendars only)
         overlapping_events = self.repo.find_overlapping(db, new_event.user_id, new_start, new_end)
-        # Don't conflict with self (only if the event has an ID)
-        if getattr(new_event, 'id', None):
-            overlapping_events = [e for e in overlapping_events if e.id != new_event.id]
-
-        return overlapping_events
+        return _exclude_self(overlapping_events, new_event)
     
     def suggest_resolution(self, db: Session, conflicting_event: models.Event, 
-                          limit: int = 5) -> List[Dict]:
+                          limit: int = 5, existing_events: Optional[List[EventSpan]] = None) -> List[Dict]:
         """
         Suggest alternative time slots for a conflicting event.
         
@@ -51,53 +134,90 @@ class ConflictService:
             db: Database session
             conflicting_event: Event that has conflicts
             limit: Maximum number of suggestions
+            existing_events: Preloaded spans of the user's other events over the
+                next RESOLUTION_HORIZON_DAYS (skips the query; must exclude the event)
             
         Returns:
             List of alternative time slot suggestions with scores
         """
-        # Get all existing events to avoid new conflicts
-        user_id = conflicting_event.user_id
         now = datetime.now(timezone.utc)
-        end_window = now + timedelta(days=14)  # Look ahead 2 weeks
-
-        existing_events = self.repo.find_future_events(db, user_id, now, end_window, exclude_event_id=conflicting_event.id)
-
-        # Create availability windows for next 2 weeks (working hours)
-        availability = []
-        for day in range(14):
-            day_start = now.replace(hour=9, minute=0, second=0, microsecond=0) + timedelta(days=day)
-            day_end = day_start.replace(hour=17)  # 9 AM to 5 PM
-
-            # Skip weekends (rough approximation)
-            if day_start.weekday() < 5:  # Monday = 0, Friday = 4
-                availability.append({"start": day_start, "end": day_end})
-
-        # Create a task-like object for the recommendation engine
-        duration_minutes = int((conflicting_event.end_at - conflicting_event.start_at).total_seconds() / 60)
-
-        # Mock a task object with the properties needed by the recommendation engine
-        class MockTask:
-            def __init__(self, event):
-                self.estimated_minutes = duration_minutes
-                self.priority = 3  # Default priority
-                self.due_at = None  # No specific due date
-                self.energy_tag = None
-                if event.type == "FOCUS":
-                    self.energy_tag = "deep"
-                elif event.type == "MEETING":
-                    self.priority = 2  # Higher priority for meetings
-
-        mock_task = MockTask(conflicting_event)
-
-        # Get recommendations
-        suggestions = compute_slots(
-            mock_task,
-            availability,
+        if existing_events is None:
+            # Get all existing events to avoid new conflicts
+            end_window = now + timedelta(days=RESOLUTION_HORIZON_DAYS)
+            existing_events = self.repo.find_future_spans(
+                db, conflicting_event.user_id, now, end_window, exclude_event_id=conflicting_event.id
+            )
+        return compute_slots(
+            _as_task(conflicting_event),
+            resolution_availability(now),
             limit=limit,
             existing_events=existing_events,
         )
 
-        return suggestions
+    def suggest_resolutions(self, db: Session, events: List, limit: int = 5,
+                            existing_events: Optional[List[EventSpan]] = None,
+                            user_id: Optional[str] = None) -> List[Dict]:
+        """
+        Resolve many conflicting events together, in priority order.
+
+        Each user's horizon is loaded once into one OccupancyBitmap holding
+        every event outside the batch. Batch events are then taken FOCUS,
+        MEETING, GENERAL, BUFFER (earlier start first): an event that no
+        longer overlaps the timeline keeps its place, otherwise it gets
+        alternatives and its top alternative is reserved, so later events
+        are never offered a slot an earlier one was moved to. A batch event
+        outside the horizon (past, or ending after it) is checked against
+        the events overlapping its own range, loaded in one extra query.
+
+        Args:
+            db: Database session
+            events: Events (or EventSpans) to resolve
+            limit: Maximum number of suggestions per event
+            existing_events: Preloaded spans of the user's events over the next
+                RESOLUTION_HORIZON_DAYS (skips the query; all events must
+                then belong to user_id)
+            user_id: Owner of events; required with existing_events
+
+        Returns:
+            One {"eventId", "action": "keep" | "move", "slots"} per event, in input order
+        """
+        now = datetime.now(timezone.utc)
+        end_window = now + timedelta(days=RESOLUTION_HORIZON_DAYS)
+        availability = resolution_availability(now)
+        if existing_events is not None:
+            if user_id is None:
+                raise ValueError("user_id is required with existing_events")
+            groups = [(user_id, events, existing_events)]
+        else:
+            by_user: Dict[str, List] = {}
+            for event in events:
+                by_user.setdefault(event.user_id, []).append(event)
+            groups = [(owner, batch, self.repo.find_future_spans(db, owner, now, end_window))
+                      for owner, batch in by_user.items()]
+
+        first, last = epoch_second(now), epoch_second(end_window)
+        results: Dict[str, Dict] = {}
+        for owner, batch, spans in groups:
+            outside = [(e.start_at, e.end_at) for e in batch
+                       if epoch_second(e.start_at) < first or epoch_second(e.end_at) > last]
+            if outside:  # the horizon load cannot see their conflicts; never report a false "keep"
+                loaded = {s.id for s in spans}
+                spans = list(spans) + [s for s in self.repo.find_spans_overlapping(db, owner, outside)
+                                       if s.id not in loaded]
+            moving = {e.id for e in batch}
+            timeline = OccupancyBitmap([s for s in spans if s.id not in moving])
+            for event in sorted(batch, key=_resolution_order):
+                if not timeline.overlaps(event.start_at, event.end_at):
+                    timeline.add(event.start_at, event.end_at, event.type)
+                    results[event.id] = {"eventId": event.id, "action": "keep", "slots": []}
+                    continue
+                slots = compute_slots(_as_task(event), availability, limit=limit, occupancy=timeline)
+                if slots:
+                    timeline.add(datetime.fromisoformat(slots[0]["startAt"]),
+                                 datetime.fromisoformat(slots[0]["endAt"]), event.type)
+                results[event.id] = {"eventId": event.id, "action": "move", "slots": slots}
+        RESOLUTION_BATCH_SIZE.observe(len(events))
+        return [results[e.id] for e in events]
     
     def validate_event_creation(self, db: Session, new_event: models.Event, 
                                allow_focus_override: bool = False):
@@ -113,21 +233,7 @@ class ConflictService:
             ConflictDetected: If conflicts are detected and not allowed
         """
         conflicts = self.detect_conflicts(db, new_event)
-        
-        if not conflicts:
-            return  # No conflicts
-        
-        # Check for FOCUS time conflicts (but only prevent non-FOCUS events from conflicting)
-        focus_conflicts = [c for c in conflicts if c.type == "FOCUS"]
-        
-        if focus_conflicts and new_event.type != "FOCUS" and not allow_focus_override:
-            raise ConflictDetected(
-                f"FOCUS time is protected. Cannot create event during focus blocks: "
-                f"{[c.title for c in focus_conflicts]}"
-            )
-        
-        # For now, we allow other types of conflicts with warnings
-        # In the future, this could be more sophisticated
+        _ensure_focus_allowed(conflicts, new_event, allow_focus_override)
     
     def analyze_conflicts(self, conflicts: List[models.Event], 
                          new_event: models.Event) -> Dict:
@@ -164,4 +270,20 @@ class ConflictService:
         if len(conflicts) > 0:
             analysis["severity_score"] = analysis["severity_score"] / len(conflicts)
         
-        return analysis
\ No newline at end of file
+        return analysis
+
+
+class AsyncConflictService:
+    """AsyncSession variant of the conflict check path used by async endpoints."""
+    def __init__(self, repository: AsyncEventRepository | None = None):
+        self.repo = repository or AsyncSqlAlchemyEventRepository()
+
+    async def detect_conflicts(self, db: AsyncSession, new_event: models.Event) -> List[models.Event]:
+        new_start, new_end = _utc_bounds(new_event)
+        overlapping_events = await self.repo.find_overlapping(db, new_event.user_id, new_start, new_end)
+        return _exclude_self(overlapping_events, new_event)
+
+    async def validate_event_creation(self, db: AsyncSession, new_event: models.Event,
+                                      allow_focus_override: bool = False):
+        conflicts = await self.detect_conflicts(db, new_event)
+        _ensure_focus_allowed(conflicts, new_event, allow_focus_override)
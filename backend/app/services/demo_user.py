@@ -17,3 +17,4 @@ def get_or_create_demo_user(db: Session) -> models.User:
     db.add(user)
     db.commit()
     return db.query(models.User).filter(models.User.id == DEMO_USER_ID).first()
+
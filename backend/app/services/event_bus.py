@@ -0,0 +1,209 @@
+"""Calendar change notifications for background consumers (scheduler worker).
+
+EventService and the sync use cases publish one message per created /
+updated / deleted event after their commit; the scheduler worker
+(scheduler_worker.py) consumes them in batches.
+
+Backend is selectable via EVENT_BUS_BACKEND (memory | redis). The memory bus
+is a bounded in-process queue consumed by the worker thread started with the
+app; use redis (a Redis Stream read through a consumer group) when the
+worker runs as its own process or there are several API workers.
+"""
+from __future__ import annotations
+from collections import deque
+from dataclasses import dataclass
+from typing import Deque, Iterable, List, Optional, Protocol, Tuple
+import logging
+import os
+import socket
+import threading
+import time
+
+from prometheus_client import Counter
+
+logger = logging.getLogger(__name__)
+
+EVENT_CREATED = "event.created"
+EVENT_UPDATED = "event.updated"
+EVENT_DELETED = "event.deleted"
+
+EVENT_BUS_PUBLISHED = Counter(
+    "schedule_concierge_event_bus_published_total", "Calendar change messages published", ["type"]
+)
+EVENT_BUS_DROPPED = Counter(
+    "schedule_concierge_event_bus_dropped_total", "Messages dropped because the memory bus was full"
+)
+
+
+@dataclass(frozen=True)
+class DomainEvent:
+    type: str
+    user_id: str
+    event_id: str
+    occurred_at: float  # epoch seconds at publish time (queueing lag is measured from here)
+
+    def to_fields(self) -> dict:
+        return {"type": self.type, "userId": self.user_id, "eventId": self.event_id, "occurredAt": repr(self.occurred_at)}
+
+    @classmethod
+    def from_fields(cls, fields: dict) -> "DomainEvent":
+        f = {(k.decode() if isinstance(k, bytes) else k): (v.decode() if isinstance(v, bytes) else v)
+             for k, v in fields.items()}
+        return cls(f["type"], f["userId"], f["eventId"], float(f["occurredAt"]))
+
+
+class EventBus(Protocol):
+    def publish(self, messages: Iterable[DomainEvent]) -> None: ...
+    def read(self, max_count: int, block_seconds: float) -> List[Tuple[str, DomainEvent]]: ...
+    def ack(self, ids: Iterable[str]) -> None: ...
+
+
+class MemoryEventBus:
+    """Bounded FIFO; when full the oldest messages are dropped (and counted)."""
+
+    def __init__(self, max_messages: int = 10_000):
+        self._queue: Deque[Tuple[str, DomainEvent]] = deque()
+        self._max = max_messages
+        self._seq = 0
+        self._cond = threading.Condition()
+
+    def publish(self, messages: Iterable[DomainEvent]) -> None:
+        with self._cond:
+            for message in messages:
+                self._seq += 1
+                self._queue.append((str(self._seq), message))
+                if len(self._queue) > self._max:
+                    self._queue.popleft()
+                    EVENT_BUS_DROPPED.inc()
+            self._cond.notify_all()
+
+    def read(self, max_count: int, block_seconds: float) -> List[Tuple[str, DomainEvent]]:
+        with self._cond:
+            if not self._queue and block_seconds > 0:
+                self._cond.wait(block_seconds)
+            batch = []
+            while self._queue and len(batch) < max_count:
+                batch.append(self._queue.popleft())
+            return batch
+
+    def ack(self, ids: Iterable[str]) -> None:
+        pass  # read already removed them; a crash loses the in-flight batch
+
+    def __len__(self) -> int:
+        return len(self._queue)
+
+
+class RedisStreamEventBus:
+    """Stream sc:events read through consumer group "scheduler" (XADD / XREADGROUP / XACK).
+
+    Unacknowledged messages stay in the group's pending list. Before reading
+    new messages, read() takes over entries that have been pending for
+    claim_idle_seconds (XAUTOCLAIM), whichever consumer they were delivered
+    to: a crashed or restarted worker's batch, or users whose processing
+    failed and was not acked, are retried. The stream is capped
+    (approximately) at maxlen.
+    """
+    STREAM_KEY = "sc:events"
+    GROUP = "scheduler"
+
+    def __init__(self, redis_client, consumer: Optional[str] = None, maxlen: int = 100_000,
+                 claim_idle_seconds: float = 60.0):
+        self.redis = redis_client
+        self.consumer = consumer or f"{socket.gethostname()}-{os.getpid()}"
+        self.maxlen = maxlen
+        self.claim_idle_ms = int(claim_idle_seconds * 1000)
+        self._group_ready = False
+        self._claim_cursor = "0-0"
+        self._next_claim = 0.0  # monotonic time of the next pending-list scan
+
+    def _ensure_group(self) -> None:
+        if self._group_ready:
+            return
+        try:
+            self.redis.xgroup_create(self.STREAM_KEY, self.GROUP, id="0", mkstream=True)
+        except Exception as exc:  # BUSYGROUP: already created by another consumer
+            if "BUSYGROUP" not in str(exc):
+                raise
+        self._group_ready = True
+
+    def publish(self, messages: Iterable[DomainEvent]) -> None:
+        pipe = self.redis.pipeline(transaction=False)
+        for message in messages:
+            pipe.xadd(self.STREAM_KEY, message.to_fields(), maxlen=self.maxlen, approximate=True)
+        pipe.execute()
+
+    def read(self, max_count: int, block_seconds: float) -> List[Tuple[str, DomainEvent]]:
+        self._ensure_group()
+        claimed = self._claim_pending(max_count)
+        if claimed:
+            return claimed
+        block_ms = int(block_seconds * 1000) or None
+        reply = self.redis.xreadgroup(self.GROUP, self.consumer, {self.STREAM_KEY: ">"},
+                                      count=max_count, block=block_ms)
+        return [entry for _stream, entries in reply or [] for entry in self._decode(entries)]
+
+    def _claim_pending(self, max_count: int) -> List[Tuple[str, DomainEvent]]:
+        """Take over entries idle for claim_idle_ms; scans the pending list once per idle period."""
+        if time.monotonic() < self._next_claim:
+            return []
+        reply = self.redis.xautoclaim(self.STREAM_KEY, self.GROUP, self.consumer, self.claim_idle_ms,
+                                      start_id=self._claim_cursor, count=max_count)
+        cursor, entries = reply[0], reply[1]
+        self._claim_cursor = cursor.decode() if isinstance(cursor, bytes) else cursor
+        if self._claim_cursor == "0-0":  # scanned to the end; look again after another idle period
+            self._next_claim = time.monotonic() + self.claim_idle_ms / 1000
+        trimmed = [msg_id for msg_id, fields in entries if not fields]  # trimmed away by maxlen
+        if trimmed:
+            self.ack(self._id(msg_id) for msg_id in trimmed)
+        return self._decode([(msg_id, fields) for msg_id, fields in entries if fields])
+
+    @staticmethod
+    def _id(msg_id) -> str:
+        return msg_id.decode() if isinstance(msg_id, bytes) else msg_id
+
+    def _decode(self, entries) -> List[Tuple[str, DomainEvent]]:
+        return [(self._id(msg_id), DomainEvent.from_fields(fields)) for msg_id, fields in entries]
+
+    def ack(self, ids: Iterable[str]) -> None:
+        ids = list(ids)
+        if ids:
+            self.redis.xack(self.STREAM_KEY, self.GROUP, *ids)
+
+
+_bus: EventBus | None = None
+_bus_lock = threading.Lock()
+
+
+def get_event_bus() -> EventBus:
+    global _bus
+    if _bus is None:
+        with _bus_lock:
+            if _bus is None:
+                if os.getenv("EVENT_BUS_BACKEND", "memory").lower() == "redis":
+                    try:
+                        import redis  # type: ignore
+                        _bus = RedisStreamEventBus(redis.from_url(os.getenv("REDIS_URL", "redis://localhost:6379/0")))
+                    except Exception:
+                        _bus = MemoryEventBus()
+                else:
+                    _bus = MemoryEventBus()
+    return _bus
+
+
+def publish_event_changes(changes: Iterable[Tuple[str, str, str]]) -> None:
+    """Publish (type, user_id, event_id) changes; call after the commit that made them.
+
+    Never raises: a lost notification only delays a proposal until the
+    event's next change.
+    """
+    now = time.time()
+    messages = [DomainEvent(kind, user_id, event_id, now) for kind, user_id, event_id in changes]
+    if not messages:
+        return
+    try:
+        get_event_bus().publish(messages)
+    except Exception:
+        logger.exception("event bus publish failed (%d messages)", len(messages))
+        return
+    for message in messages:
+        EVENT_BUS_PUBLISHED.labels(type=message.type).inc()
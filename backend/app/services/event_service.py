@@ -2,6 +2,7 @@ from sqlalchemy.orm import Session
 from datetime import datetime, timezone
 from typing import Optional
 from ..db import models
+from .event_bus import EVENT_CREATED, EVENT_DELETED, EVENT_UPDATED, publish_event_changes
 from .google_calendar_service import GoogleCalendarService
 from .oauth_service import OAuthService
 
@@ -28,6 +29,7 @@ class EventService:
         db.add(event)
         db.commit()
         db.refresh(event)
+        publish_event_changes([(EVENT_CREATED, event.user_id, event.id)])
         
         # Sync to Google Calendar if enabled and integration exists
         if sync_to_google:
@@ -67,6 +69,7 @@ class EventService:
         event.updated_at = datetime.now(timezone.utc)
         db.commit()
         db.refresh(event)
+        publish_event_changes([(EVENT_UPDATED, event.user_id, event.id)])
         
         # Sync updates to Google Calendar if enabled
         if sync_to_google:
@@ -87,5 +90,7 @@ class EventService:
             except Exception:
                 pass  # Don't fail deletion if Google sync fails
                 
+        user_id = event.user_id
         db.delete(event)
-        db.commit()
\ No newline at end of file
+        db.commit()
+        publish_event_changes([(EVENT_DELETED, user_id, event_id)])
\ No newline at end of file
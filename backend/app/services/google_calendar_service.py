@@ -14,6 +14,7 @@ from sqlalchemy.orm import Session
 from ..db import models
 from ..errors import BaseAppException
 from .oauth_service import OAuthService
+from .event_bus import EVENT_CREATED, EVENT_DELETED, EVENT_UPDATED, publish_event_changes
 
 
 class GoogleCalendarError(BaseAppException):
@@ -76,6 +77,7 @@ class GoogleCalendarService:
                 ).all()
                 
             synced_events = 0
+            changes = []
             for calendar in calendars:
                 if not calendar.external_id:
                     continue
@@ -97,7 +99,9 @@ class GoogleCalendarService:
                 
                 # Process events
                 for google_event in events_result.get('items', []):
-                    self._sync_event(db, calendar, google_event)
+                    change = self._sync_event(db, calendar, google_event)
+                    if change:
+                        changes.append(change)
                     synced_events += 1
                     
                 # Update sync token
@@ -105,6 +109,7 @@ class GoogleCalendarService:
                     integration.sync_token = events_result['nextSyncToken']
                     
             db.commit()
+            publish_event_changes(changes)
             return {"syncedEvents": synced_events}
             
         except HttpError as e:
@@ -338,7 +343,7 @@ class GoogleCalendarService:
         calendar: models.Calendar, 
         google_event: Dict[str, Any]
     ):
-        """Sync a single Google event to local database."""
+        """Sync a single Google event to local database; returns the change to publish, if any."""
         if google_event.get('status') == 'cancelled':
             # Handle deleted events
             existing = db.query(models.Event).filter(
@@ -346,14 +351,15 @@ class GoogleCalendarService:
             ).first()
             if existing:
                 db.delete(existing)
-            return
+                return EVENT_DELETED, existing.user_id, existing.id
+            return None
             
         # Parse start/end times
         start = google_event.get('start', {})
         end = google_event.get('end', {})
         
         if 'dateTime' not in start or 'dateTime' not in end:
-            return  # Skip all-day events for now
+            return None  # Skip all-day events for now
             
         start_dt = datetime.fromisoformat(start['dateTime'].replace('Z', '+00:00'))
         end_dt = datetime.fromisoformat(end['dateTime'].replace('Z', '+00:00'))
@@ -370,6 +376,7 @@ class GoogleCalendarService:
             existing.start_at = start_dt
             existing.end_at = end_dt
             existing.updated_at = datetime.now(timezone.utc)
+            return EVENT_UPDATED, existing.user_id, existing.id
         else:
             # Create new event
             event = models.Event(
@@ -383,4 +390,5 @@ class GoogleCalendarService:
                 type='GENERAL',  # Default type for imported events
                 external_event_id=google_event['id']
             )
-            db.add(event)
\ No newline at end of file
+            db.add(event)
+            return EVENT_CREATED, event.user_id, event.id
\ No newline at end of file
@@ -0,0 +1,137 @@
+"""Turn NLP drafts into tasks plus slot suggestions (single and batched commit)."""
+from datetime import datetime, date, time, timedelta, timezone
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from ..db import models
+from ..domain.spans import EventSpan
+from . import task_service
+from .recommendation_service import OccupancyBitmap, compute_slots
+
+SLOT_LIMIT = 5
+
+
+class TaskSnapshot(NamedTuple):
+    """Picklable stand-in for a Task when slot planning runs in another process."""
+    id: str
+    priority: int
+    due_at: Optional[datetime]
+    estimated_minutes: Optional[int]
+    energy_tag: Optional[str]
+
+    @classmethod
+    def of(cls, task) -> "TaskSnapshot":
+        return cls(task.id, task.priority, task.due_at, task.estimated_minutes, task.energy_tag)
+
+
+class EventSnapshot(NamedTuple):
+    start_at: datetime
+    end_at: datetime
+    type: str
+
+    @classmethod
+    def of(cls, event) -> "EventSnapshot":
+        return cls(event.start_at, event.end_at, event.type)
+
+
+SlotPlanner = Callable[[List[Any], List[Any], List[Dict[str, datetime]]], List[List[Dict]]]
+
+
+def draft_task_fields(draft: Dict[str, Any]) -> Dict[str, Any]:
+    due_at = None
+    due_date_str = draft.get("date")
+    if due_date_str:
+        try:
+            d = date.fromisoformat(due_date_str)
+            due_at = datetime.combine(d, time(23, 59)).replace(tzinfo=timezone.utc)
+        except Exception:
+            due_at = None
+    return {
+        "title": draft.get("title") or "タスク",
+        "due_at": due_at,
+        "priority": 3,
+        "estimated_minutes": draft.get("estimatedMinutes") or 30,
+        "energy_tag": draft.get("energyTag"),
+    }
+
+
+def default_availability(now: Optional[datetime] = None) -> List[Dict[str, datetime]]:
+    """Weekday 9-17 windows over the next five days."""
+    now = now or datetime.now(timezone.utc)
+    availability = []
+    for day in range(5):
+        day_start = now.replace(hour=9, minute=0, second=0, microsecond=0) + timedelta(days=day)
+        if day_start.weekday() < 5:
+            availability.append({"start": day_start, "end": day_start.replace(hour=17)})
+    return availability
+
+
+def load_selected_events(db: Session, user_id: str) -> List[EventSpan]:
+    stmt = (
+        select(models.Event.start_ts, models.Event.end_ts, models.Event.type, models.Event.id)
+        .join(models.Calendar, models.Calendar.id == models.Event.calendar_id)
+        .where(models.Event.user_id == user_id, models.Calendar.selected == 1)
+    )
+    return EventSpan.from_rows(db.connection().execute(stmt))
+
+
+def task_out(task: models.Task) -> Dict[str, Any]:
+    return {
+        "id": task.id,
+        "title": task.title,
+        "dueAt": task.due_at,
+        "priority": task.priority,
+        "estimatedMinutes": task.estimated_minutes,
+        "status": task.status,
+        "energyTag": task.energy_tag,
+    }
+
+
+def plan_slots(tasks: List[Any], events: List[Any], availability: List[Dict[str, datetime]]) -> List[List[Dict]]:
+    """Suggest slots for tasks in order against one shared occupancy bitmap.
+
+    Each task's top slot is reserved, so later tasks are not offered a slot
+    overlapping an earlier task's pick. An earlier task's alternatives were
+    found before later picks were reserved, so those overlapping a later pick
+    are dropped afterwards (a task may end up with fewer than SLOT_LIMIT).
+    Pure CPU work: safe to run in a worker process when given snapshots.
+    """
+    # built once: conflicts and the FOCUS penalty for every task come from the bitmap
+    occupancy = OccupancyBitmap(events)
+    all_slots = []
+    picks = []  # reserved (start, end) per task, None when it got no slot
+    for task in tasks:
+        slots = compute_slots(task, availability, limit=SLOT_LIMIT, occupancy=occupancy)
+        pick = None
+        if slots:
+            pick = (datetime.fromisoformat(slots[0]["startAt"]), datetime.fromisoformat(slots[0]["endAt"]))
+            occupancy.add(*pick)
+        all_slots.append(slots)
+        picks.append(pick)
+    for i, slots in enumerate(all_slots):
+        later = [p for p in picks[i + 1:] if p]
+        if later and len(slots) > 1:
+            all_slots[i] = slots[:1] + [s for s in slots[1:] if not _overlaps_any(s, later)]
+    return all_slots
+
+
+def _overlaps_any(slot: Dict, picks: List) -> bool:
+    start, end = datetime.fromisoformat(slot["startAt"]), datetime.fromisoformat(slot["endAt"])
+    return any(start < pick_end and end > pick_start for pick_start, pick_end in picks)
+
+
+def commit_draft(db: Session, user_id: str, draft: Dict[str, Any], planner: SlotPlanner = plan_slots) -> Dict[str, Any]:
+    task = task_service.create_task(db, user_id=user_id, **draft_task_fields(draft))
+    slots = planner([task], load_selected_events(db, user_id), default_availability())[0]
+    return {"task": task_out(task), "slots": slots}
+
+
+def commit_drafts(db: Session, user_id: str, drafts: List[Dict[str, Any]], planner: SlotPlanner = plan_slots) -> List[Dict[str, Any]]:
+    """Create one task per draft in a single transaction and suggest slots for each.
+
+    Events are loaded once and slots come from one plan_slots pass over all tasks.
+    """
+    tasks = task_service.create_tasks_bulk(db, user_id, [draft_task_fields(d) for d in drafts])
+    all_slots = planner(tasks, load_selected_events(db, user_id), default_availability())
+    return [{"task": task_out(t), "slots": s} for t, s in zip(tasks, all_slots)]
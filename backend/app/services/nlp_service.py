@@ -1,6 +1,10 @@
+from collections import OrderedDict, deque
 from datetime import datetime, date, time, timedelta, timezone
+import json
+import os
 import re
-from typing import Optional, Dict, Any
+import threading
+from typing import Optional, Dict, Any, Iterable, List, NamedTuple, Protocol, Tuple
 
 class NLPScheduleParser:
     """Rule-based lightweight Japanese schedule parser.
@@ -13,11 +17,34 @@ class NLPScheduleParser:
         "書きたい", "したい"
     ]
 
-    ENERGY_RULES = [
-        (re.compile(r"集中|深く|ディープ|集中して"), "deep"),
-        (re.compile(r"朝|午前"), "morning"),
-        (re.compile(r"午後|昼"), "afternoon"),
-    ]
+    # Single-pass lexer. One scan yields date words, clock times ("[午前|午後]H時[M分]",
+    # "H時間"), bare minute durations, AM/PM markers, wish suffixes and energy words.
+    # Branch order mirrors NOISE_PATTERNS priority so title noise spans equal what
+    # the sequential re.sub chain removes. Minutes without 分 ("3時15") are only
+    # looked ahead at: the digits stay in the text and are lexed again, since they
+    # can start a longer duration ("3時150分") or stay in the title.
+    _LEXER = re.compile(
+        r"(?P<clock>(?P<ampm>午前|午後)?(?P<hour>\d{1,2})時"
+        r"(?:(?P<minute>\d{1,2})分|(?=(?P<bare_minute>\d{1,2}))|(?P<hours_unit>間))?)"
+        r"|(?P<minutes>\d{1,3})分"
+        r"|(?P<day>今日は|明後日|明日)"
+        r"|(?P<marker>午前|午後)"
+        r"|(?P<wish>書きたい|したい)"
+        r"|(?P<deep>集中|深く|ディープ)"
+        r"|(?P<morning>朝)"
+        r"|(?P<afternoon>昼)"
+    )
+    # Removing a noise span can join its neighbours into a new noise match (e.g.
+    # "1午前2時" -> "12時"), which the sequential chain would then also strip.
+    # Such a join needs a kept neighbour that can continue a pattern across the
+    # gap: non-final pattern chars on the left, non-initial ones on the right.
+    # (p1 "今日は" runs first so never matches a join; "H時間" never survives "H時".)
+    _JOIN_LEFT_CHARS = frozenset("明後午時書きたし")
+    _JOIN_RIGHT_CHARS = frozenset("日後前時分きたい")
+
+    _NOISE_RES = [re.compile(p) for p in NOISE_PATTERNS]
+    _LEADING_PARTICLES_RE = re.compile(r"^(に|を|へ|で)+")
+    _TRAILING_PARTICLE_RE = re.compile(r"(を|の|へ|に)$")
 
     @classmethod
     def parse(cls, text: str, base_date: Optional[date] = None) -> Dict[str, Any]:
@@ -26,76 +53,133 @@ class NLPScheduleParser:
             return {"intents": [], "draft": None}
 
         today = base_date or date.today()
+        tomorrow = day_after = False
+        clock = timed = hours_tok = None  # first clock / first clock with minutes / first "H時間"
+        minute = 0
+        consumed_end = 0  # end of the first clock's minutes; earlier minute counts are not durations
+        minute_candidates = []  # (start, minutes) in text order, like finditer(r"(\d{1,3})分")
+        noise = []  # spans removed from the title
+        has_deep = has_morning = has_afternoon = False
+
+        for tok in cls._LEXER.finditer(text):
+            kind = tok.lastgroup
+            if kind == "clock":
+                ampm = tok.group("ampm")
+                if ampm:
+                    noise.append(tok.span("ampm"))
+                    has_morning = has_morning or ampm == "午前"
+                    has_afternoon = has_afternoon or ampm == "午後"
+                if clock is None:
+                    clock = tok
+                minute_group = "minute" if tok.group("minute") else "bare_minute"
+                if tok.group(minute_group) and timed is None:
+                    timed = tok
+                    minute = int(tok.group(minute_group))
+                    consumed_end = tok.end(minute_group)
+                if tok.group("minute"):
+                    minute_candidates.append((tok.start("minute"), int(tok.group("minute"))))
+                    noise.append((tok.start("hour"), tok.end()))
+                else:
+                    if tok.group("hours_unit") and hours_tok is None:
+                        hours_tok = tok
+                    noise.append((tok.start("hour"), tok.end("hour") + 1))  # "H時" ("間" stays)
+            elif kind == "minutes":
+                minute_candidates.append((tok.start(), int(tok.group("minutes"))))
+                noise.append(tok.span())
+            elif kind == "day":
+                word = tok.group()
+                tomorrow = tomorrow or word == "明日"
+                day_after = day_after or word == "明後日"
+                noise.append(tok.span())
+            elif kind == "marker":
+                has_morning = has_morning or tok.group() == "午前"
+                has_afternoon = has_afternoon or tok.group() == "午後"
+                noise.append(tok.span())
+            elif kind == "wish":
+                noise.append(tok.span())
+            elif kind == "deep":
+                has_deep = True
+            elif kind == "morning":
+                has_morning = True
+            else:
+                has_afternoon = True
+
         target_date = today
-        if "明日" in text:
+        if tomorrow:
             target_date = today + timedelta(days=1)
-        elif "明後日" in text:
+        elif day_after:
             target_date = today + timedelta(days=2)
 
         hour = 9
-        minute = 0
-        # full pattern hh時mm分
-        tm = re.search(r"(午前|午後)?(\d{1,2})時(\d{1,2})分?", text)
-        standalone_time_used = False
-        if tm:
-            h = int(tm.group(2))
-            if tm.group(1) == "午後" and h < 12 and h != 12:
-                h += 12
-            hour = h
-            minute = int(tm.group(3))
-            standalone_time_used = True
-        else:
-            m = re.search(r"(午前|午後)?(\d{1,2})時", text)
-            if m:
-                h = int(m.group(2))
-                if m.group(1) == "午後" and h < 12 and h != 12:
-                    h += 12
-                hour = h
-
-        # duration inference
+        if timed:
+            hour = cls._to_24h(timed.group("ampm"), int(timed.group("hour")))
+        elif clock:
+            hour = cls._to_24h(clock.group("ampm"), int(clock.group("hour")))
+
+        # duration inference: minutes inside the start time do not count
         duration = 60
-        dm = None
-        time_consumed_span_end = tm.end() if tm else 0
-        dm_candidates = list(re.finditer(r"(\d{1,3})分", text))
-        if dm_candidates:
-            if standalone_time_used:
-                for cand in dm_candidates:
-                    if cand.start() >= time_consumed_span_end:
-                        dm = cand
-                        break
-            else:
-                dm = dm_candidates[0]
-        hm = re.search(r"(\d{1,2})時間", text)
-        if hm:
-            duration = int(hm.group(1)) * 60
-        elif dm:
-            duration = min(480, int(dm.group(1)))
+        dm = next((m for start, m in minute_candidates if start >= consumed_end), None)
+        if hours_tok:
+            duration = int(hours_tok.group("hour")) * 60
+        elif dm is not None:
+            duration = min(480, dm)
 
         start_dt = datetime.combine(target_date, time(hour=hour, minute=minute, tzinfo=timezone.utc))
+        title = cls._strip_noise(text, noise)
+        energy_tag = cls._energy_tag(hour, has_deep, has_morning, has_afternoon)
+        return cls._result(title, target_date, start_dt, duration, energy_tag)
+
+    @classmethod
+    def _strip_noise(cls, text: str, spans) -> str:
+        """Cut noise spans out of text by slicing (sequential re.sub chain if spans could join)."""
+        pieces = []
+        pos = 0
+        for start, end in spans:
+            if start > pos:
+                if pos and (text[pos] in cls._JOIN_RIGHT_CHARS or text[pos].isdecimal()):
+                    return cls._clean_title(cls._strip_noise_sequential(text))
+                if text[start - 1] in cls._JOIN_LEFT_CHARS or text[start - 1].isdecimal():
+                    return cls._clean_title(cls._strip_noise_sequential(text))
+                pieces.append(text[pos:start])
+            pos = end
+        if pos and pos < len(text) and (text[pos] in cls._JOIN_RIGHT_CHARS or text[pos].isdecimal()):
+            return cls._clean_title(cls._strip_noise_sequential(text))
+        pieces.append(text[pos:])
+        return cls._clean_title("".join(pieces))
+
+    @classmethod
+    def _strip_noise_sequential(cls, text: str) -> str:
+        for p in cls._NOISE_RES:
+            text = p.sub("", text)
+        return text
 
-        title = text
-        for p in cls.NOISE_PATTERNS:
-            title = re.sub(p, "", title)
+    @classmethod
+    def _clean_title(cls, title: str) -> str:
         title = title.replace("  ", " ").strip(" 。、 ")
-        title = re.sub(r"^(に|を|へ|で)+", "", title)
+        title = cls._LEADING_PARTICLES_RE.sub("", title)
         if not title:
             title = "タスク"
-        title = re.sub(r"(を|の|へ|に)$", "", title)
-
-        # energy tag inference
-        energy_tag = None
-        for pattern, tag in cls.ENERGY_RULES:
-            if pattern.search(text):
-                # special handling: morning/afternoon tags only if hour consistent
-                if tag == "morning" and hour < 11:
-                    energy_tag = tag
-                elif tag == "afternoon" and 11 <= hour <= 18:
-                    energy_tag = tag
-                elif tag == "deep":
-                    energy_tag = tag
-                if energy_tag:
-                    break
+        return cls._TRAILING_PARTICLE_RE.sub("", title)
+
+    @staticmethod
+    def _to_24h(ampm: Optional[str], h: int) -> int:
+        if ampm == "午後" and h < 12 and h != 12:
+            h += 12
+        return h
 
+    @staticmethod
+    def _energy_tag(hour: int, deep: bool, morning: bool, afternoon: bool) -> Optional[str]:
+        # deep wins; morning / afternoon words only count if the start hour agrees
+        if deep:
+            return "deep"
+        if morning and hour < 11:
+            return "morning"
+        if afternoon and 11 <= hour <= 18:
+            return "afternoon"
+        return None
+
+    @staticmethod
+    def _result(title: str, target_date: date, start_dt: datetime, duration: int, energy_tag: Optional[str]) -> Dict[str, Any]:
         draft = {
             "title": title,
             "date": target_date.isoformat(),
@@ -106,6 +190,441 @@ class NLPScheduleParser:
         return {"intents": [{"type": "create_task", "confidence": 0.9}], "draft": draft}
 
 
-def parse_schedule_text(text: str) -> Dict[str, Any]:
+# --- Pluggable engines -------------------------------------------------------
+
+class NLPEngine(Protocol):
+    """Parses free text into the {"intents", "draft"} shape for one language."""
+    language: str
+
+    def parse(self, text: str, base_date: Optional[date] = None) -> Dict[str, Any]: ...
+
+
+RULE_KINDS = {"day", "ampm", "duration", "energy", "noise", "connector"}
+
+
+class Rule(NamedTuple):
+    """One rule-table entry.
+
+    kind/value: day -> day offset, ampm -> "am"/"pm", duration -> minutes per
+    unit (follows a number), energy -> tag, noise -> removed from the title,
+    connector -> removed only in front of a time or duration ("at 3pm").
+    """
+    phrase: str
+    kind: str
+    value: Any = None
+
+
+def load_rules(data: Dict[str, List[Dict[str, Any]]]) -> Dict[str, List[Rule]]:
+    """Validate {"<locale>": [{"phrase", "kind", "value"}, ...]} into rules per language."""
+    rules: Dict[str, List[Rule]] = {}
+    for locale, entries in (data or {}).items():
+        for entry in entries:
+            rule = Rule(entry.get("phrase") or "", entry.get("kind"), entry.get("value"))
+            if not rule.phrase or rule.kind not in RULE_KINDS:
+                raise ValueError(f"invalid NLP rule for {locale}: {entry!r}")
+            rules.setdefault(language_of(locale), []).append(rule)
+    return rules
+
+
+def language_of(locale: Optional[str]) -> str:
+    return (locale or "").replace("_", "-").split("-")[0].lower()
+
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over rule phrases.
+
+    Built once per rule table; a scan is one pass over the text whatever the
+    number of phrases. Matches are leftmost-longest and non-overlapping.
+    """
+
+    def __init__(self, entries: Iterable[Tuple[str, Any]], ignore_case: bool = False, word_boundaries: bool = False):
+        self.ignore_case = ignore_case
+        self.word_boundaries = word_boundaries
+        self._goto: List[Dict[str, int]] = [{}]
+        self._fail: List[int] = [0]
+        self._out: List[List[Tuple[int, Any]]] = [[]]  # (phrase length, payload)
+        for phrase, payload in entries:
+            node = 0
+            for ch in self._fold(phrase):
+                nxt = self._goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._out.append([])
+                    self._goto[node][ch] = nxt
+                node = nxt
+            if node:
+                self._out[node].append((len(phrase), payload))
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for ch, child in self._goto[node].items():
+                queue.append(child)
+                f = self._fail[node]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                self._fail[child] = self._goto[f].get(ch, 0)
+                # fail states are shallower, so their outputs are already complete
+                self._out[child] = self._out[child] + self._out[self._fail[child]]
+
+    def _fold(self, s: str) -> str:
+        return "".join(self._fold_char(c) for c in s) if self.ignore_case else s
+
+    def _fold_char(self, c: str) -> str:
+        if not self.ignore_case:
+            return c
+        low = c.lower()
+        return low if len(low) == 1 else c  # keep offsets aligned with the input
+
+    def _at_boundary(self, text: str, start: int, end: int) -> bool:
+        # digits may precede a phrase so units attach to numbers ("3pm", "30min")
+        return (start == 0 or not text[start - 1].isalpha()) and (end == len(text) or not text[end].isalnum())
+
+    def finditer(self, text: str) -> List[Tuple[int, int, Any]]:
+        goto, fail, out = self._goto, self._fail, self._out
+        found = []
+        node = 0
+        for i, c in enumerate(text):
+            ch = self._fold_char(c)
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            for length, payload in out[node]:
+                start = i + 1 - length
+                if self.word_boundaries and not self._at_boundary(text, start, i + 1):
+                    continue
+                found.append((start, i + 1, payload))
+        found.sort(key=lambda m: (m[0], -m[1]))  # stable: earlier-registered phrases win ties
+        selected = []
+        pos = 0
+        for m in found:
+            if m[0] >= pos:
+                selected.append(m)
+                pos = m[1]
+        return selected
+
+
+class RuleTable:
+    """Compiles a language's rules into a KeywordMatcher (user rules take precedence)."""
+
+    def __init__(self, language: str, rules: Iterable[Rule], ignore_case: bool = True, word_boundaries: bool = True,
+                 default_title: str = "Task"):
+        self.language = language
+        self.rules = list(rules)
+        self.default_title = default_title
+        self.matcher = KeywordMatcher(((r.phrase, r) for r in self.rules), ignore_case, word_boundaries)
+
+
+ENGLISH_RULES: List[Rule] = [
+    Rule("today", "day", 0), Rule("tomorrow", "day", 1), Rule("day after tomorrow", "day", 2),
+    Rule("am", "ampm", "am"), Rule("a.m.", "ampm", "am"), Rule("pm", "ampm", "pm"), Rule("p.m.", "ampm", "pm"),
+    *[Rule(u, "duration", 1) for u in ("min", "mins", "minute", "minutes")],
+    *[Rule(u, "duration", 60) for u in ("h", "hr", "hrs", "hour", "hours")],
+    Rule("focus", "energy", "deep"), Rule("deep work", "energy", "deep"), Rule("deep", "energy", "deep"),
+    Rule("morning", "energy", "morning"), Rule("afternoon", "energy", "afternoon"),
+    *[Rule(p, "noise") for p in ("i want to", "i need to", "i'd like to", "want to", "need to", "remind me to", "please")],
+    Rule("at", "connector"), Rule("for", "connector"),
+]
+
+
+class RuleTableEngine:
+    """Generic engine driven entirely by a RuleTable plus a number scanner.
+
+    Numbers pair with a following ampm/duration rule ("3pm", "30 min"); "h:mm"
+    and "at <n>" read as 24h clock times. Defaults match the Japanese engine
+    (09:00 start, 60 minutes).
+    """
+    _NUMBER_RE = re.compile(r"(\d{1,2}):(\d{2})|(\d{1,4})")
+    _TITLE_STRIP = " ,.;:-"
+
+    def __init__(self, table: RuleTable):
+        self.table = table
+        self.language = table.language
+
+    def parse(self, text: str, base_date: Optional[date] = None) -> Dict[str, Any]:
+        text = (text or "").strip()
+        if not text:
+            return {"intents": [], "draft": None}
+        today = base_date or date.today()
+
+        tokens = [(s, e, r) for s, e, r in self.table.matcher.finditer(text)]
+        tokens += [(m.start(), m.end(), m) for m in self._NUMBER_RE.finditer(text)]
+        tokens.sort(key=lambda t: t[0])
+
+        day_offset = None
+        clock = None  # (hour, minute)
+        minutes = hours = None
+        flags = set()
+        remove: List[Tuple[int, int]] = []
+
+        def adjacent(a, b) -> bool:
+            return not text[a[1]:b[0]].strip()
+
+        for i, tok in enumerate(tokens):
+            payload = tok[2]
+            if isinstance(payload, Rule):
+                if payload.kind == "day":
+                    if day_offset is None:
+                        day_offset = int(payload.value)
+                    remove.append(tok[:2])
+                elif payload.kind == "energy":
+                    flags.add(payload.value)
+                elif payload.kind == "noise":
+                    remove.append(tok[:2])
+                continue
+            nxt = tokens[i + 1] if i + 1 < len(tokens) else None
+            prev = tokens[i - 1] if i else None
+            unit = nxt[2] if nxt and isinstance(nxt[2], Rule) and adjacent(tok, nxt) else None
+            consumed_end = None
+            if payload.group(1):  # h:mm
+                hour, minute = int(payload.group(1)), int(payload.group(2))
+                if unit is not None and unit.kind == "ampm":
+                    hour = self._to_24h(hour, unit.value)
+                    consumed_end = nxt[1]
+                    flags.add("morning" if unit.value == "am" else "afternoon")
+                if hour < 24 and minute < 60:
+                    clock = clock or (hour, minute)
+                    consumed_end = consumed_end or tok[1]
+                else:
+                    consumed_end = None
+            else:
+                n = int(payload.group(3))
+                if unit is not None and unit.kind == "ampm" and 1 <= n <= 12:
+                    clock = clock or (self._to_24h(n, unit.value), 0)
+                    flags.add("morning" if unit.value == "am" else "afternoon")
+                    consumed_end = nxt[1]
+                elif unit is not None and unit.kind == "duration":
+                    if unit.value >= 60:
+                        hours = hours if hours is not None else n * int(unit.value)
+                    else:
+                        minutes = minutes if minutes is not None else n * int(unit.value)
+                    consumed_end = nxt[1]
+                elif prev and isinstance(prev[2], Rule) and prev[2].kind == "connector" and adjacent(prev, tok) and n < 24:
+                    clock = clock or (n, 0)
+                    consumed_end = tok[1]
+            if consumed_end is not None:
+                start = tok[0]
+                if prev and isinstance(prev[2], Rule) and prev[2].kind == "connector" and adjacent(prev, tok):
+                    start = prev[0]
+                remove.append((start, consumed_end))
+
+        target_date = today + timedelta(days=day_offset or 0)
+        hour, minute = clock or (9, 0)
+        if hours is not None:
+            duration = hours
+        elif minutes is not None:
+            duration = min(480, minutes)
+        else:
+            duration = 60
+        start_dt = datetime.combine(target_date, time(hour=hour, minute=minute, tzinfo=timezone.utc))
+        title = self._title(text, remove)
+        energy_tag = NLPScheduleParser._energy_tag(hour, "deep" in flags, "morning" in flags, "afternoon" in flags)
+        return NLPScheduleParser._result(title, target_date, start_dt, duration, energy_tag)
+
+    @staticmethod
+    def _to_24h(hour: int, ampm: str) -> int:
+        if ampm == "pm" and hour < 12:
+            return hour + 12
+        if ampm == "am" and hour == 12:
+            return 0
+        return hour
+
+    def _title(self, text: str, spans: List[Tuple[int, int]]) -> str:
+        pieces = []
+        pos = 0
+        for start, end in sorted(spans):
+            if start > pos:
+                pieces.append(text[pos:start])
+            pos = max(pos, end)
+        pieces.append(text[pos:])
+        title = " ".join("".join(pieces).split()).strip(self._TITLE_STRIP)
+        return title or self.table.default_title
+
+
+class JapaneseEngine:
+    """Built-in Japanese rules via the single-pass lexer (NLPScheduleParser).
+
+    User-supplied ja rules are compiled into a KeywordMatcher and applied on
+    top: day rules set the date when no built-in date word matched, energy
+    rules fill an empty tag, noise rules are cut from the title.
+    """
+    language = "ja"
+
+    def __init__(self, extra_rules: Iterable[Rule] = ()):
+        extra = [r for r in extra_rules if r.kind in {"day", "energy", "noise"}]
+        self.table = RuleTable("ja", extra, ignore_case=False, word_boundaries=False, default_title="タスク") if extra else None
+
+    def parse(self, text: str, base_date: Optional[date] = None) -> Dict[str, Any]:
+        result = NLPScheduleParser.parse(text, base_date=base_date)
+        if self.table is None or result["draft"] is None:
+            return result
+        today = base_date or date.today()
+        draft = result["draft"]
+        start_dt = datetime.fromisoformat(draft["startAt"])
+        matches = self.table.matcher.finditer(text.strip())
+        for _, _, rule in matches:
+            if rule.kind == "day" and draft["date"] == today.isoformat():
+                target = today + timedelta(days=int(rule.value))
+                draft["date"] = target.isoformat()
+                draft["startAt"] = datetime.combine(target, start_dt.timetz()).isoformat()
+                break
+        if draft["energyTag"] is None:
+            flags = {r.value for _, _, r in matches if r.kind == "energy"}
+            draft["energyTag"] = NLPScheduleParser._energy_tag(
+                start_dt.hour, "deep" in flags, "morning" in flags, "afternoon" in flags
+            )
+        for _, _, rule in matches:
+            if rule.kind in {"day", "noise"}:
+                draft["title"] = draft["title"].replace(rule.phrase, "")
+        draft["title"] = NLPScheduleParser._clean_title(draft["title"])
+        return result
+
+
+class EngineRegistry:
+    """One compiled engine per language, built once (at startup via warm()).
+
+    Japanese-script input always goes to the ja engine: every account defaults
+    to locale en-US today, so the locale alone would misroute Japanese text.
+    Unknown languages fall back to NLP_DEFAULT_LOCALE.
+    """
+    _JAPANESE_SCRIPT_RE = re.compile(r"[\u3040-\u30ff\u3400-\u9fff]")
+
+    def __init__(self, user_rules: Optional[Dict[str, List[Rule]]] = None, default_language: str = "ja"):
+        self.user_rules = user_rules or {}
+        self.default_language = default_language
+        self._engines: Dict[str, NLPEngine] = {}
+        self._lock = threading.Lock()
+
+    def _build(self, language: str) -> NLPEngine:
+        extra = self.user_rules.get(language, [])
+        if language == "ja":
+            return JapaneseEngine(extra)
+        return RuleTableEngine(RuleTable("en", [*extra, *ENGLISH_RULES]))
+
+    def languages(self) -> List[str]:
+        return sorted({"ja", "en", *self.user_rules})
+
+    def get(self, language: str) -> NLPEngine:
+        engine = self._engines.get(language)
+        if engine is None:
+            with self._lock:
+                engine = self._engines.get(language) or self._build(language)
+                self._engines[language] = engine
+        return engine
+
+    def warm(self) -> None:
+        for language in self.languages():
+            self.get(language)
+
+    def register_rules(self, locale: str, rules: Iterable[Rule]) -> None:
+        """Add rules for a locale and recompile its engine (this process only)."""
+        language = language_of(locale)
+        with self._lock:
+            self.user_rules[language] = [*rules, *self.user_rules.get(language, [])]
+            self._engines.pop(language, None)
+
+    def resolve_language(self, text: str, locale: Optional[str] = None) -> str:
+        if self._JAPANESE_SCRIPT_RE.search(text):
+            return "ja"
+        language = language_of(locale) or self.default_language
+        return language if language in self.languages() else self.default_language
+
+
+def _load_user_rules() -> Dict[str, List[Rule]]:
+    path = os.getenv("NLP_RULES_PATH")
+    if not path:
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return load_rules(json.load(f))
+
+
+engines = EngineRegistry(_load_user_rules(), default_language=language_of(os.getenv("NLP_DEFAULT_LOCALE", "ja")))
+
+
+class ParseCache:
+    """Thread-safe LRU of parse results keyed on (normalized text, base_date, language).
+
+    Parsing is deterministic for a given key, so entries never go stale; the
+    resolved base_date is part of the key so "明日" rolls over with the day.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        self.maxsize = maxsize
+        self._data: "OrderedDict[Tuple[str, date, str], Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def key(text: Optional[str], base_date: Optional[date] = None, locale: Optional[str] = None) -> Tuple[str, date, str]:
+        text = normalize_text(text)
+        return text, base_date or date.today(), engines.resolve_language(text, locale)
+
+    def get(self, key: Tuple[str, date, str]) -> Optional[Dict[str, Any]]:
+        """Cached copy for key, or None (counted as a miss)."""
+        with self._lock:
+            result = self._data.get(key)
+            if result is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return _copy_result(result)
+
+    def put(self, key: Tuple[str, date, str], result: Dict[str, Any]) -> None:
+        if self.maxsize <= 0:
+            return
+        with self._lock:
+            self._data[key] = result
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def get_or_parse(self, text: str, base_date: Optional[date] = None, locale: Optional[str] = None) -> Tuple[Dict[str, Any], bool]:
+        """Return (result, hit). Results are copies so callers may mutate them."""
+        key = self.key(text, base_date, locale)
+        cached = self.get(key)
+        if cached is not None:
+            return cached, True
+        result = parse_key(key)
+        self.put(key, result)
+        return _copy_result(result), False
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self.hits = self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def normalize_text(text: Optional[str]) -> str:
+    # parse() only looks at the stripped input, so this is the widest key
+    # normalization that still yields identical drafts.
+    return (text or "").strip()
+
+
+def _copy_result(result: Dict[str, Any]) -> Dict[str, Any]:
+    draft = result.get("draft")
+    copy = {
+        "intents": [dict(i) for i in result.get("intents", [])],
+        "draft": dict(draft) if draft is not None else None,
+    }
+    if "error" in result:
+        copy["error"] = dict(result["error"])
+    return copy
+
+
+parse_cache = ParseCache(maxsize=int(os.getenv("NLP_PARSE_CACHE_SIZE", "1024")))
+
+
+def parse_key(key: Tuple[str, date, str]) -> Dict[str, Any]:
+    text, base_date, language = key
+    return engines.get(language).parse(text, base_date=base_date)
+
+
+def parse_schedule_text(text: str, base_date: Optional[date] = None, locale: Optional[str] = None) -> Dict[str, Any]:
     """Public helper used by API layer."""
-    return NLPScheduleParser.parse(text)
+    return parse_cache.get_or_parse(text, base_date, locale)[0]
@@ -0,0 +1,168 @@
+"""Run NLP parse / commit work off the event loop with bounded concurrency.
+
+NLP_WORKER_MODE selects where the CPU-bound parts run:
+  * thread (default): parsing, DB writes and slot planning run in the
+    threadpool, keeping the event loop free for other requests.
+  * process: regex parsing and slot planning are shipped to a process pool
+    (NLP_PROCESS_WORKERS) so they do not hold the GIL; DB work stays on
+    threads because sessions cannot cross processes.
+
+At most NLP_MAX_CONCURRENCY jobs run at once per worker. Callers wait up to
+NLP_QUEUE_TIMEOUT_SECONDS for a free slot and then get 503 NLP_BUSY.
+"""
+from __future__ import annotations
+import asyncio
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+from prometheus_client import Counter, Gauge, Histogram
+from starlette.concurrency import run_in_threadpool
+
+from ..errors import ServiceUnavailableError
+from .nlp_commit_service import EventSnapshot, TaskSnapshot, plan_slots
+from .nlp_service import _copy_result, parse_cache, parse_key
+
+NLP_WORKER_MODE = os.getenv("NLP_WORKER_MODE", "thread").lower()
+NLP_MAX_CONCURRENCY = int(os.getenv("NLP_MAX_CONCURRENCY", "8"))
+NLP_QUEUE_TIMEOUT_SECONDS = float(os.getenv("NLP_QUEUE_TIMEOUT_SECONDS", "5"))
+NLP_PROCESS_WORKERS = int(os.getenv("NLP_PROCESS_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+NLP_JOBS_IN_FLIGHT = Gauge(
+    "schedule_concierge_nlp_jobs_in_flight", "NLP jobs currently running off the event loop"
+)
+NLP_JOBS_WAITING = Gauge(
+    "schedule_concierge_nlp_jobs_waiting", "NLP jobs waiting for a concurrency slot"
+)
+NLP_JOB_WAIT_SECONDS = Histogram(
+    "schedule_concierge_nlp_job_wait_seconds", "Time NLP jobs waited for a concurrency slot",
+    buckets=(0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5),
+)
+NLP_JOBS_REJECTED = Counter(
+    "schedule_concierge_nlp_jobs_rejected_total", "NLP jobs rejected because the pool stayed saturated"
+)
+
+_sem: Optional[asyncio.Semaphore] = None
+_sem_loop = None
+_process_pool: Optional[ProcessPoolExecutor] = None
+_process_pool_lock = threading.Lock()
+
+
+def process_mode() -> bool:
+    return NLP_WORKER_MODE == "process"
+
+
+def _semaphore() -> asyncio.Semaphore:
+    # asyncio primitives belong to one loop; test clients spin up several.
+    global _sem, _sem_loop
+    loop = asyncio.get_running_loop()
+    if _sem is None or _sem_loop is not loop:
+        _sem, _sem_loop = asyncio.Semaphore(NLP_MAX_CONCURRENCY), loop
+    return _sem
+
+
+@asynccontextmanager
+async def _slot():
+    sem = _semaphore()
+    started = time.monotonic()
+    NLP_JOBS_WAITING.inc()
+    try:
+        await asyncio.wait_for(sem.acquire(), NLP_QUEUE_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        NLP_JOBS_REJECTED.inc()
+        raise ServiceUnavailableError("NLP_BUSY", "NLP workers are saturated; retry later")
+    finally:
+        NLP_JOBS_WAITING.dec()
+        NLP_JOB_WAIT_SECONDS.observe(time.monotonic() - started)
+    NLP_JOBS_IN_FLIGHT.inc()
+    try:
+        yield
+    finally:
+        NLP_JOBS_IN_FLIGHT.dec()
+        sem.release()
+
+
+def _get_process_pool() -> ProcessPoolExecutor:
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is None:
+            # spawn: forking a process that already runs threads is unsafe
+            _process_pool = ProcessPoolExecutor(
+                max_workers=NLP_PROCESS_WORKERS, mp_context=multiprocessing.get_context("spawn")
+            )
+        return _process_pool
+
+
+def shutdown() -> None:
+    global _process_pool
+    with _process_pool_lock:
+        if _process_pool is not None:
+            _process_pool.shutdown(wait=False, cancel_futures=True)
+            _process_pool = None
+
+
+def _parse_key_or_error(key: Tuple[str, date, str]) -> Dict[str, Any]:
+    try:
+        return parse_key(key)
+    except ValueError as e:  # e.g. "25時": one bad input must not fail the whole batch
+        return {"intents": [], "draft": None, "error": {"code": "PARSE_FAILED", "message": str(e)}}
+
+
+def _parse_keys(keys: List[Tuple[str, date, str]]) -> List[Dict[str, Any]]:
+    return [_parse_key_or_error(k) for k in keys]
+
+
+def _parse_with_cache(texts: List[str], base_date: Optional[date], locale: Optional[str], parse_fn) -> List[Tuple[Dict[str, Any], bool]]:
+    keys = [parse_cache.key(t, base_date, locale) for t in texts]
+    out: List[Any] = [None] * len(keys)
+    hits = [False] * len(keys)
+    pending: Dict[Tuple[str, date, str], List[int]] = {}
+    for i, key in enumerate(keys):
+        if key in pending:  # repeated within this batch: parsed once, served as a hit
+            pending[key].append(i)
+            hits[i] = True
+            continue
+        cached = parse_cache.get(key)
+        if cached is None:
+            pending[key] = [i]
+        else:
+            out[i], hits[i] = cached, True
+    if pending:
+        for key, result in zip(pending, parse_fn(list(pending))):
+            parse_cache.put(key, result)
+            for i in pending[key]:
+                out[i] = _copy_result(result)
+    return list(zip(out, hits))
+
+
+def _parse_in_process(keys: List[Tuple[str, date, str]]) -> List[Dict[str, Any]]:
+    return _get_process_pool().submit(_parse_keys, keys).result()
+
+
+def _plan_in_process(tasks, events, availability):
+    return _get_process_pool().submit(
+        plan_slots, [TaskSnapshot.of(t) for t in tasks], [EventSnapshot.of(e) for e in events], availability
+    ).result()
+
+
+def slot_planner():
+    """plan_slots callable for nlp_commit_service, process-backed in process mode."""
+    return _plan_in_process if process_mode() else plan_slots
+
+
+async def parse_many(texts: List[str], base_date: Optional[date] = None,
+                     locale: Optional[str] = None) -> List[Tuple[Dict[str, Any], bool]]:
+    """Parse texts through the shared cache; returns (result, cache_hit) per text."""
+    parse_fn = _parse_in_process if process_mode() else _parse_keys
+    async with _slot():
+        return await run_in_threadpool(_parse_with_cache, texts, base_date, locale, parse_fn)
+
+
+async def run(fn, *args, **kwargs):
+    """Run a blocking function (DB + planning) in the threadpool under the concurrency limit."""
+    async with _slot():
+        return await run_in_threadpool(fn, *args, **kwargs)
@@ -7,6 +7,7 @@ import hashlib
 import secrets
 import os
 import time
+from contextlib import nullcontext
 from typing import Dict, Any, Optional
 from datetime import datetime, timezone, timedelta
 
@@ -224,20 +225,16 @@ class OAuthService:
         
         try:
             with self.OAUTH_EXCHANGE_LATENCY.labels(provider='google').time():
-                span_ctx = _oauth_tracer.start_as_current_span("oauth.exchange_code") if _oauth_tracer else None
-                try:
+                span_ctx = _oauth_tracer.start_as_current_span("oauth.exchange_code") if _oauth_tracer else nullcontext()
+                with span_ctx as span:
                     if code_verifier:
                         flow.fetch_token(code=code, code_verifier=code_verifier)
                     else:
                         flow.fetch_token(code=code)
                     credentials = flow.credentials
-                    if _oauth_tracer:
-                        span = trace.get_current_span()
+                    if span is not None:
                         span.set_attribute("oauth.provider", "google")
                         span.set_attribute("oauth.has_refresh", bool(credentials.refresh_token))
-                finally:
-                    if span_ctx:
-                        span_ctx.__exit__(None, None, None)
             self.OAUTH_EXCHANGE_COUNT.labels(provider='google', outcome='success').inc()
         except Exception as e:
             self.OAUTH_EXCHANGE_COUNT.labels(provider='google', outcome='error').inc()
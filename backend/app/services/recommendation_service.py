@@ -1,7 +1,14 @@
-from datetime import datetime, timedelta, timezone
-from typing import List, Dict, Optional
+from datetime import date, datetime, timedelta, timezone
+from bisect import bisect_left, insort
+from heapq import heapify, heappop, heappush
+from contextlib import nullcontext
+from typing import List, Dict, Optional, Tuple
+import os
+import random
+from math import ceil, floor
 import time
 from prometheus_client import Counter, Histogram
+from ..domain.spans import epoch_seconds, from_epoch
 try:  # optional tracing
     from opentelemetry import trace
     _rec_tracer = trace.get_tracer(__name__)
@@ -10,6 +17,14 @@ except Exception:  # pragma: no cover
 
 SLOT_GRANULARITY_MIN = 15
 
+# Instrumentation is aggregated per compute_slots call: one histogram
+# observation and a few span attributes instead of a timer and span writes per
+# candidate. SLOT_SPAN_EVENT_SAMPLE_RATE (0..1) adds a "slot.scored" span event
+# for that fraction of candidates; SLOT_SCORE_TIMING=per_slot restores the
+# per-candidate score histogram for debugging.
+SLOT_SPAN_EVENT_SAMPLE_RATE = float(os.getenv("SLOT_SPAN_EVENT_SAMPLE_RATE", "0"))
+SLOT_SCORE_PER_SLOT_TIMING = os.getenv("SLOT_SCORE_TIMING", "aggregate").lower() == "per_slot"
+
 # Metrics (module-level so they register once)
 SLOT_COMPUTE_COUNT = Counter(
     "schedule_concierge_slot_compute_requests_total",
@@ -21,7 +36,31 @@ SLOT_COMPUTE_DURATION = Histogram(
 )
 SLOT_SCORE_DURATION = Histogram(
     "schedule_concierge_slot_score_duration_seconds",
-    "Time spent scoring individual candidate slots"
+    "Time spent scoring individual candidate slots (only with SLOT_SCORE_TIMING=per_slot)"
+)
+SLOT_SCORE_TOTAL_DURATION = Histogram(
+    "schedule_concierge_slot_score_total_seconds",
+    "Time spent scoring all candidate slots of one compute request",
+    buckets=(0.0001, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25)
+)
+SLOT_CANDIDATES_SCANNED = Histogram(
+    "schedule_concierge_slot_candidates_scanned",
+    "Candidate slots examined per compute request",
+    buckets=(0, 10, 25, 50, 100, 250, 500, 1000, 2500)
+)
+SLOT_CONFLICTS_REJECTED = Counter(
+    "schedule_concierge_slot_conflicts_rejected_total",
+    "Candidate slots rejected because they overlap existing events"
+)
+SLOT_SEARCH_DAYS = Counter(
+    "schedule_concierge_slot_search_days_total",
+    "Days considered by search_slots, by outcome",
+    ["outcome"]  # scanned | no_capacity | bound
+)
+SLOT_SEARCH_BUCKETS = Counter(
+    "schedule_concierge_slot_search_buckets_total",
+    "Hour buckets of expanded days in search_slots, by outcome",
+    ["outcome"]  # scanned | bound
 )
 SLOT_COMPUTE_EMPTY = Counter(
     "schedule_concierge_slot_compute_empty_total",
@@ -39,7 +78,242 @@ class SlotSuggestion(dict):
 class NoAvailability(Exception):
     pass
 
-def compute_slots(task, availability_windows: List[Dict], limit: int = 5, existing_events: Optional[List] = None):
+
+def _as_utc(dt):
+    return dt.replace(tzinfo=timezone.utc) if dt.tzinfo is None else dt
+
+
+class OccupancyTimeline:
+    """Busy time as merged, sorted intervals with O(log n) overlap checks.
+
+    Lets several compute_slots calls share one view of occupied time (existing
+    events plus slots already handed out) without rescanning every event per
+    candidate.
+    """
+
+    def __init__(self, events: Optional[List] = None):
+        self._starts: List[datetime] = []
+        self._ends: List[datetime] = []
+        for e in events or []:
+            self.add(e.start_at, e.end_at)
+
+    def add(self, start, end):
+        start, end = _as_utc(start), _as_utc(end)
+        i = bisect_left(self._starts, start)
+        # merge with the previous interval when touching/overlapping
+        if i > 0 and self._ends[i - 1] >= start:
+            i -= 1
+            start = self._starts[i]
+            end = max(end, self._ends[i])
+        j = i
+        while j < len(self._starts) and self._starts[j] <= end:
+            end = max(end, self._ends[j])
+            j += 1
+        self._starts[i:j] = [start]
+        self._ends[i:j] = [end]
+
+    def overlaps(self, start, end) -> bool:
+        start, end = _as_utc(start), _as_utc(end)
+        i = bisect_left(self._starts, end) - 1
+        return i >= 0 and self._ends[i] > start
+
+    def __len__(self):
+        return len(self._starts)
+
+
+_CELL_SECONDS = SLOT_GRANULARITY_MIN * 60
+CELLS_PER_DAY = 24 * 60 // SLOT_GRANULARITY_MIN
+DAY_MASK = (1 << CELLS_PER_DAY) - 1
+
+
+_seconds = epoch_seconds
+
+
+def _event_seconds(event) -> Tuple[float, float]:
+    """Epoch bounds of an event: the start_ts / end_ts ints of Events and EventSpans, else from start_at / end_at."""
+    start_ts = getattr(event, "start_ts", None)
+    if start_ts is not None:
+        return start_ts, event.end_ts
+    return _seconds(event.start_at), _seconds(event.end_at)
+
+
+def _cells(start, end):
+    """Absolute 15-minute cells touched by [start, end), half-open (cell 0 starts at the epoch)."""
+    return floor(_seconds(start) / _CELL_SECONDS), ceil(_seconds(end) / _CELL_SECONDS)
+
+
+class _CellTrack:
+    """One kind of time (busy, FOCUS, ...) as bits relative to the owner's origin cell.
+
+    `touched` has a bit for every cell an interval touches, `full` only for cells
+    it covers completely. They differ only at edges of intervals not aligned to
+    the grid; those intervals are also kept in `ragged` for exact checks.
+    """
+    __slots__ = ("touched", "full", "ragged")
+
+    def __init__(self):
+        self.touched = 0
+        self.full = 0
+        self.ragged: Optional[OccupancyTimeline] = None
+
+    def add_ragged(self, start, end):
+        if self.ragged is None:
+            self.ragged = OccupancyTimeline()
+        self.ragged.add(start, end)
+
+    def overlaps(self, start, end, mask) -> bool:
+        if not self.touched & mask:
+            return False
+        # a completely covered cell the slot enters is a certain overlap
+        if self.full & mask:
+            return True
+        return self.ragged is not None and self.ragged.overlaps(start, end)
+
+    def shift(self, cells):
+        self.touched <<= cells
+        self.full <<= cells
+
+
+class OccupancyBitmap:
+    """One user's busy, FOCUS and BUFFER time as 15-minute cell bitsets.
+
+    Drop-in for OccupancyTimeline (add / overlaps). Bits are Python ints over
+    consecutive cells starting at the first day seen, so a day is a
+    CELLS_PER_DAY-bit slice, a slot check is one mask AND and free runs come
+    from shifts. Results are exact: slots touching only the ragged edge of an
+    off-grid event fall back to an interval check.
+    """
+    __slots__ = ("_origin", "_busy", "_focus", "_buffer")
+
+    def __init__(self, events: Optional[List] = None):
+        self._origin: Optional[int] = None  # absolute cell index of bit 0 (a day start)
+        self._busy = _CellTrack()
+        self._focus = _CellTrack()
+        self._buffer = _CellTrack()
+        if events:
+            self._add_all([(*_event_seconds(e), getattr(e, "type", None)) for e in events])
+
+    def _rebase(self, lo: int) -> int:
+        day_start = lo - lo % CELLS_PER_DAY
+        if self._origin is None:
+            self._origin = day_start
+        elif day_start < self._origin:
+            for track in (self._busy, self._focus, self._buffer):
+                track.shift(self._origin - day_start)
+            self._origin = day_start
+        return self._origin
+
+    def add(self, start, end, type: Optional[str] = None):
+        self._add_all([(_seconds(start), _seconds(end), type)])
+
+    def _add_all(self, intervals):
+        """intervals: (start, end, type) with bounds in epoch seconds."""
+        spans = []
+        for start, end, kind in intervals:
+            s, e = start / _CELL_SECONDS, end / _CELL_SECONDS
+            lo, hi = floor(s), ceil(e)
+            if hi > lo:
+                spans.append((start, end, kind, lo, hi, ceil(s), floor(e)))
+        if not spans:
+            return
+        origin = self._rebase(min(span[3] for span in spans))
+        # accumulate in locals and OR into the tracks once
+        bits = {None: [0, 0], "FOCUS": [0, 0], "BUFFER": [0, 0]}
+        for start, end, kind, lo, hi, full_lo, full_hi in spans:
+            touched = ((1 << (hi - lo)) - 1) << (lo - origin)
+            full = ((1 << (full_hi - full_lo)) - 1) << (full_lo - origin) if full_hi > full_lo else 0
+            bits[None][0] |= touched
+            bits[None][1] |= full
+            if kind in ("FOCUS", "BUFFER"):
+                bits[kind][0] |= touched
+                bits[kind][1] |= full
+            if touched != full:
+                start, end = from_epoch(start), from_epoch(end)
+                self._busy.add_ragged(start, end)
+                if kind in ("FOCUS", "BUFFER"):
+                    self._track(kind).add_ragged(start, end)
+        for kind, (touched, full) in bits.items():
+            track = self._track(kind)
+            track.touched |= touched
+            track.full |= full
+
+    def _track(self, kind: Optional[str]) -> _CellTrack:
+        return self._focus if kind == "FOCUS" else self._buffer if kind == "BUFFER" else self._busy
+
+    def _mask(self, start, end) -> int:
+        if self._origin is None:
+            return 0
+        lo, hi = _cells(start, end)
+        lo, hi = max(lo - self._origin, 0), hi - self._origin
+        return ((1 << (hi - lo)) - 1) << lo if hi > lo else 0
+
+    def overlaps(self, start, end) -> bool:
+        return bool(self._busy.touched) and self._busy.overlaps(start, end, self._mask(start, end))
+
+    def focus_overlaps(self, start, end) -> bool:
+        return bool(self._focus.touched) and self._focus.overlaps(start, end, self._mask(start, end))
+
+    def buffer_overlaps(self, start, end) -> bool:
+        return bool(self._buffer.touched) and self._buffer.overlaps(start, end, self._mask(start, end))
+
+    def span_bits(self, first_cell: int, cells: int) -> Tuple[int, int, int]:
+        """(busy, focus, buffer) cells touched in [first_cell, first_cell + cells), bit 0 = first_cell.
+
+        first_cell is an absolute cell index (see cell_of), so bitmaps of
+        different users line up for AND / OR.
+        """
+        if self._origin is None:
+            return 0, 0, 0
+        mask = (1 << cells) - 1
+        offset = first_cell - self._origin
+        tracks = (self._busy, self._focus, self._buffer)
+        if offset >= 0:
+            return tuple((t.touched >> offset) & mask for t in tracks)
+        return tuple((t.touched << -offset) & mask for t in tracks)
+
+    def blocked_bits(self, first_cell: int, cells: int) -> int:
+        """Cells in [first_cell, first_cell + cells) that are completely busy; a slot touching one conflicts."""
+        if self._origin is None:
+            return 0
+        offset = first_cell - self._origin
+        full = self._busy.full >> offset if offset >= 0 else self._busy.full << -offset
+        return full & ((1 << cells) - 1)
+
+    def day_bits(self, day: date) -> Tuple[int, int, int]:
+        """(busy, focus, buffer) cells touched on a UTC day; bit i is the i-th cell after midnight."""
+        return self.span_bits((day - date(1970, 1, 1)).days * CELLS_PER_DAY, CELLS_PER_DAY)
+
+    def free_starts(self, day: date, cells: int) -> int:
+        """Bit i set when cells i..i+cells-1 of the day are free (ragged edges count as busy)."""
+        return free_runs(~self.day_bits(day)[0] & DAY_MASK, cells)
+
+
+def cell_of(dt) -> int:
+    """Absolute index of the 15-minute cell containing dt."""
+    return floor(_seconds(dt) / _CELL_SECONDS)
+
+
+def first_whole_cell(dt) -> int:
+    """Index of the first cell starting at or after dt."""
+    return ceil(_seconds(dt) / _CELL_SECONDS)
+
+
+def cell_start(cell: int) -> datetime:
+    return datetime.fromtimestamp(cell * _CELL_SECONDS, tz=timezone.utc)
+
+
+def free_runs(free: int, cells: int) -> int:
+    """Bit i set when bits i..i+cells-1 of `free` are all set."""
+    run, width = free, 1
+    while width < cells:  # doubling: run has bit i when `width` bits from i are set
+        step = min(width, cells - width)
+        run &= run >> step
+        width += step
+    return run
+
+
+def compute_slots(task, availability_windows: List[Dict], limit: int = 5, existing_events: Optional[List] = None,
+                  occupancy: Optional[OccupancyTimeline] = None):
     """
     Compute optimal slots for a task given availability windows and existing events.
     
@@ -47,7 +321,12 @@ def compute_slots(task, availability_windows: List[Dict], limit: int = 5, existi
         task: Task object with priority, due_at, estimated_minutes, etc.
         availability_windows: List of dicts with 'start' and 'end' datetime
         limit: Maximum number of slots to return
-        existing_events: List of existing Event objects to avoid conflicts
+        existing_events: Existing events (ORM Events or EventSpans) to avoid conflicts
+        occupancy: Optional shared OccupancyTimeline / OccupancyBitmap; when given
+            it replaces existing_events for conflict checks (existing_events
+            then only feeds the FOCUS penalty). A bitmap passed without
+            existing_events also supplies the FOCUS penalty, so callers
+            scoring many tasks build it once.
     """
     start_time = time.monotonic()
     SLOT_COMPUTE_COUNT.inc()
@@ -57,34 +336,72 @@ def compute_slots(task, availability_windows: List[Dict], limit: int = 5, existi
 
     required = task.estimated_minutes or 30
     slots: List[Dict] = []
+    # one pass over the events; conflict and FOCUS checks are then mask ANDs
+    if existing_events or not isinstance(occupancy, OccupancyBitmap):
+        events = OccupancyBitmap(existing_events)
+    else:
+        events = occupancy
+    if occupancy is None:
+        occupancy = events
+    scanned = rejected = 0
+    score_seconds = 0.0
+    perf = time.perf_counter
+    event_rate = SLOT_SPAN_EVENT_SAMPLE_RATE if _rec_tracer else 0.0
 
-    span_ctx = _rec_tracer.start_as_current_span("recommendation.compute_slots") if _rec_tracer else None
-    try:
+    span_ctx = _rec_tracer.start_as_current_span("recommendation.compute_slots") if _rec_tracer else nullcontext()
+    with span_ctx as span:
+        if span is not None and not span.is_recording():
+            event_rate = 0.0
         for w in availability_windows:
             cur = w['start']
             while cur + timedelta(minutes=required) <= w['end']:
                 end = cur + timedelta(minutes=required)
-                conflicts = _check_slot_conflicts(cur, end, existing_events)
-                if not conflicts:
-                    score = score_slot(task, cur, end, existing_events)
-                    slots.append({
+                scanned += 1
+                if occupancy.overlaps(cur, end):
+                    rejected += 1
+                else:
+                    t0 = perf()
+                    score = score_slot(task, cur, end, focus_penalty=0.1 if events.focus_overlaps(cur, end) else 1.0)
+                    elapsed = perf() - t0
+                    score_seconds += elapsed
+                    if SLOT_SCORE_PER_SLOT_TIMING:
+                        SLOT_SCORE_DURATION.observe(elapsed)
+                    slot = {
                         "startAt": cur.isoformat(),
                         "endAt": end.isoformat(),
                         "score": round(score, 4)
-                    })
+                    }
+                    slots.append(slot)
+                    if event_rate and random.random() < event_rate:
+                        span.add_event("slot.scored", dict(slot))
                 if len(slots) >= limit * 3:
                     break
                 cur += timedelta(minutes=SLOT_GRANULARITY_MIN)
-    finally:
-        if span_ctx:
-            span_ctx.__exit__(None, None, None)
 
-    if not slots:
-        SLOT_COMPUTE_EMPTY.inc()
+        SLOT_CANDIDATES_SCANNED.observe(scanned)
+        SLOT_SCORE_TOTAL_DURATION.observe(score_seconds)
+        if rejected:
+            SLOT_CONFLICTS_REJECTED.inc(rejected)
+
+        dedup = _top_slots(slots, limit)
+        SLOT_COMPUTE_RETURNED.observe(len(dedup))
+        if not dedup:
+            SLOT_COMPUTE_EMPTY.inc()
         SLOT_COMPUTE_DURATION.observe(time.monotonic() - start_time)
-        SLOT_COMPUTE_RETURNED.observe(0)
-        return []
+        if span is not None:
+            span.set_attributes({
+                "slots.candidates": scanned,
+                "slots.conflicts": rejected,
+                "slots.score_ms": round(score_seconds * 1000, 3),
+                "slots.returned": len(dedup),
+                "availability.count": len(availability_windows),
+                "task.id": getattr(task, 'id', None) or 'unknown',
+            })
+    return dedup
 
+
+def _top_slots(slots: List[Dict], limit: int) -> List[Dict]:
+    """Highest-scoring slots, skipping ones starting within one granule of a kept slot."""
     # Sort by score descending
     slots.sort(key=lambda x: x['score'], reverse=True)
 
@@ -95,46 +412,150 @@ def compute_slots(task, availability_windows: List[Dict], limit: int = 5, existi
             dedup.append(s)
         if len(dedup) >= limit:
             break
-
-    SLOT_COMPUTE_RETURNED.observe(len(dedup))
-    SLOT_COMPUTE_DURATION.observe(time.monotonic() - start_time)
-    if _rec_tracer:
-        span = trace.get_current_span()
-        span.set_attribute("slots.returned", len(dedup))
-        span.set_attribute("availability.count", len(availability_windows))
-        span.set_attribute("task.id", getattr(task, 'id', 'unknown'))
     return dedup
 
-def score_slot(task, start, end, existing_events: Optional[List] = None):
+def _runs(first: datetime, count: int, step: timedelta, boundary) -> List[Tuple[datetime, int]]:
+    """Split starts first + i * step (i < count) into runs that end before each boundary(cur)."""
+    runs = []
+    while count > 0:
+        n = min(count, (boundary(first) - first - timedelta(microseconds=1)) // step + 1)
+        runs.append((first, n))
+        first, count = first + step * n, count - n
+    return runs
+
+
+def _next_midnight(dt: datetime) -> datetime:
+    return datetime.combine(dt.date() + timedelta(days=1), datetime.min.time(), tzinfo=dt.tzinfo)
+
+
+def _next_hour(dt: datetime) -> datetime:
+    return dt.replace(minute=0, second=0, microsecond=0) + timedelta(hours=1)
+
+
+def _urgency_upper_bound(task, first: datetime, last: datetime) -> float:
+    """Largest urgency bonus of any start in [first, last]; it grows until the due date, then drops to 0."""
+    if not task.due_at:
+        return 0.0
+    due_at = _as_utc(task.due_at)
+    if _as_utc(last) < due_at:
+        return _calculate_urgency_bonus(task, last)
+    return 0.5 if _as_utc(first) < due_at else 0.0
+
+
+def _day_fits(occupancy: "OccupancyBitmap", first: datetime, last_end: datetime, required: timedelta) -> bool:
+    """False when no run of ceil(required / 15min) cells without a completely busy one exists."""
+    lo, hi = _cells(first, last_end)
+    need = ceil(required / timedelta(minutes=SLOT_GRANULARITY_MIN))
+    return free_runs(~occupancy.blocked_bits(lo, hi - lo) & ((1 << (hi - lo)) - 1), need) != 0
+
+
+def search_slots(task, availability_windows: List[Dict], limit: int = 5, existing_events: Optional[List] = None,
+                 occupancy: Optional["OccupancyBitmap"] = None) -> List[Dict]:
+    """Exact top-`limit` slots over the whole horizon, by branch and bound.
+
+    Unlike compute_slots (which scores the first limit * 3 free candidates),
+    every 15-minute start in every window is a candidate. Every score_slot
+    term except the FOCUS penalty depends only on the start hour (energy,
+    working hours) or grows monotonically towards the due date (urgency), so
+    an admissible upper bound per day and per hour bucket is cheap:
+
+    * days whose windows cannot hold the task (occupancy bitmap) are dropped;
+    * days, then their hour buckets, are visited best bound first from one
+      heap, and only buckets are scanned minute by minute;
+    * the search stops once k results beat the best remaining bound.
+
+    Ties rank the earlier start first; results equal an exhaustive scan.
+    """
+    started = time.monotonic()
+    SLOT_COMPUTE_COUNT.inc()
+    required = timedelta(minutes=task.estimated_minutes or 30)
+    step = timedelta(minutes=SLOT_GRANULARITY_MIN)
+    if existing_events or occupancy is None:
+        events = OccupancyBitmap(existing_events)
+    else:
+        events = occupancy
+    occupancy = occupancy or events
+
+    base = 1.0 + (6 - task.priority) * 0.1
+    hour_bonus = [_calculate_energy_bonus(task, datetime(2000, 1, 1, h)) + _calculate_working_hours_bonus(datetime(2000, 1, 1, h))
+                  for h in range(24)]
+
+    def bound(first: datetime, count: int) -> float:
+        last = first + step * (count - 1)
+        raw = base + _urgency_upper_bound(task, first, last) + max(hour_bonus[first.hour:last.hour + 1])
+        # +1e-9 absorbs float summation order; scores are compared after round(., 4)
+        return round(max(raw, 0.01) + 1e-9, 4)
+
+    # heap of (-bound, first start, seq, count, is_day); a node's key never exceeds its children's
+    heap = []
+    no_capacity = 0
+    for w in availability_windows:
+        total = (w['end'] - required - w['start']) // step + 1
+        for first, count in _runs(w['start'], total, step, _next_midnight):
+            if _day_fits(occupancy, first, first + step * (count - 1) + required, required):
+                heap.append((-bound(first, count), first, len(heap), count, True))
+            else:
+                no_capacity += 1
+    heapify(heap)
+
+    top: List[Tuple[float, datetime, datetime]] = []  # (-score, start, end), best first
+    scanned = rejected = days_scanned = buckets_scanned = 0
+    seq = len(heap)
+    while heap:
+        neg_bound, first, _, count, is_day = heap[0]
+        if len(top) >= limit and (neg_bound, first) >= top[-1][:2]:
+            break  # no remaining candidate can beat the k-th result
+        heappop(heap)
+        if is_day:
+            days_scanned += 1
+            for bucket_first, bucket_count in _runs(first, count, step, _next_hour):
+                seq += 1
+                heappush(heap, (-bound(bucket_first, bucket_count), bucket_first, seq, bucket_count, False))
+            continue
+        buckets_scanned += 1
+        for j in range(count):
+            cur = first + step * j
+            end = cur + required
+            scanned += 1
+            if occupancy.overlaps(cur, end):
+                rejected += 1
+                continue
+            score = round(score_slot(task, cur, end, focus_penalty=0.1 if events.focus_overlaps(cur, end) else 1.0), 4)
+            if len(top) < limit or (-score, cur) < top[-1][:2]:
+                insort(top, (-score, cur, end))
+                del top[limit:]
+
+    days_left = sum(1 for item in heap if item[4])
+    SLOT_SEARCH_DAYS.labels(outcome="scanned").inc(days_scanned)
+    SLOT_SEARCH_DAYS.labels(outcome="no_capacity").inc(no_capacity)
+    SLOT_SEARCH_DAYS.labels(outcome="bound").inc(days_left)
+    SLOT_SEARCH_BUCKETS.labels(outcome="scanned").inc(buckets_scanned)
+    SLOT_SEARCH_BUCKETS.labels(outcome="bound").inc(len(heap) - days_left)
+    SLOT_CANDIDATES_SCANNED.observe(scanned)
+    if rejected:
+        SLOT_CONFLICTS_REJECTED.inc(rejected)
+    SLOT_COMPUTE_RETURNED.observe(len(top))
+    if not top:
+        SLOT_COMPUTE_EMPTY.inc()
+    SLOT_COMPUTE_DURATION.observe(time.monotonic() - started)
+    return [{"startAt": s.isoformat(), "endAt": e.isoformat(), "score": -neg} for neg, s, e in top]
+
+
+def score_slot(task, start, end, existing_events: Optional[List] = None, focus_penalty: Optional[float] = None):
     """
     Score a potential slot for a task based on multiple factors:
     - Due date urgency
     - Priority weighting  
     - Energy tag matching
     - Working hours preference
-    - Focus time protection
+    - Focus time protection (focus_penalty, when precomputed, skips the event scan)
     """
-    with SLOT_SCORE_DURATION.time():
-        if existing_events is None:
-            existing_events = []
-        base_score = 1.0
-        if _rec_tracer:
-            span = trace.get_current_span()
-            span.set_attribute("slot.start", start.isoformat())
-            span.set_attribute("slot.end", end.isoformat())
-    
+    if existing_events is None:
+        existing_events = []
+    base_score = 1.0
+
     # 1. Due date urgency factor
-    if task.due_at:
-        due_at = task.due_at
-        if due_at.tzinfo is None:
-            due_at = due_at.replace(tzinfo=timezone.utc)
-        if start.tzinfo is None:
-            start = start.replace(tzinfo=timezone.utc)
-        hours_left = (due_at - start).total_seconds() / 3600
-        if hours_left > 0:
-            # More urgent as due date approaches, capped at 72h
-            urgency_factor = max(0, 1 - min(hours_left / 72, 1))
-            base_score += urgency_factor * 0.5  # Up to 0.5 bonus
+    base_score += _calculate_urgency_bonus(task, start)
     
     # 2. Priority weighting (priority 1 is highest)
     priority_factor = (6 - task.priority) * 0.1  # priority 1 -> 0.5, priority 5 -> 0.1
@@ -149,27 +570,22 @@ def score_slot(task, start, end, existing_events: Optional[List] = None):
     base_score += working_hours_bonus
     
     # 5. Focus time protection penalty
-    focus_penalty = _calculate_focus_penalty(start, end, existing_events)
+    if focus_penalty is None:
+        focus_penalty = _calculate_focus_penalty(start, end, existing_events)
     base_score *= focus_penalty  # Multiplicative penalty
 
     return max(base_score, 0.01)  # Minimum score
 
-def _check_slot_conflicts(start, end, existing_events):
-    """Check if a slot conflicts with any existing events"""
-    for event in existing_events:
-        # Ensure all datetimes are timezone-aware for comparison
-        event_start = event.start_at
-        event_end = event.end_at
-        
-        # If event datetimes are naive, make them UTC
-        if event_start.tzinfo is None:
-            event_start = event_start.replace(tzinfo=timezone.utc)
-        if event_end.tzinfo is None:
-            event_end = event_end.replace(tzinfo=timezone.utc)
-            
-        if start < event_end and end > event_start:
-            return True
-    return False
+def _calculate_urgency_bonus(task, start):
+    """Up to 0.5 as the due date approaches (linear over the last 72h); 0 without or past it"""
+    if not task.due_at:
+        return 0.0
+    hours_left = (_as_utc(task.due_at) - _as_utc(start)).total_seconds() / 3600
+    if hours_left <= 0:
+        return 0.0
+    # More urgent as due date approaches, capped at 72h
+    urgency_factor = max(0, 1 - min(hours_left / 72, 1))
+    return urgency_factor * 0.5
 
 def _calculate_energy_bonus(task, start):
     """Calculate bonus based on energy tag matching with time of day"""
@@ -216,21 +632,19 @@ def _calculate_working_hours_bonus(start):
 
 def _calculate_focus_penalty(start, end, existing_events):
     """Apply heavy penalty if slot overlaps with FOCUS events"""
+    start_s = end_s = None
     for event in existing_events:
-        if hasattr(event, 'type') and event.type == 'FOCUS':
-            # Ensure timezone consistency
-            event_start = event.start_at
-            event_end = event.end_at
-            
-            if event_start.tzinfo is None:
-                event_start = event_start.replace(tzinfo=timezone.utc)
-            if event_end.tzinfo is None:
-                event_end = event_end.replace(tzinfo=timezone.utc)
-            
-            # Check overlap
-            if start < event_end and end > event_start:
-                return 0.1  # Heavy penalty (90% reduction)
-    
+        if getattr(event, 'type', None) != 'FOCUS':
+            continue
+        event_start = getattr(event, 'start_ts', None)
+        if event_start is not None:  # Event / EventSpan: compare epoch ints
+            if start_s is None:
+                start_s, end_s = _seconds(start), _seconds(end)
+            overlap = start_s < event.end_ts and end_s > event_start
+        else:
+            overlap = start < _as_utc(event.end_at) and end > _as_utc(event.start_at)
+        if overlap:
+            return 0.1  # Heavy penalty (90% reduction)
     return 1.0  # No penalty
 
 def parse_iso(s: str):
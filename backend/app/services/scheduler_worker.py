@@ -0,0 +1,253 @@
+"""Scheduler worker: turns calendar changes into rescheduling proposals.
+
+Consumes event_bus messages in batches (technical-spec 2.4 / 6.3). Messages
+are grouped per user; each user's events over the resolution horizon are
+loaded once as EventSpan tuples, conflicts of the changed events are found
+in memory against that load, and alternatives come from one
+ConflictService.suggest_resolutions pass over the same spans, covering the
+changed events and every event they overlap (the most protected event of
+each overlap keeps its place, the others move). Proposals are stored in
+conflict_resolutions (one PROPOSED row per moving event), replaced on later
+changes and removed once the event no longer conflicts or keeps its place.
+Events that already have an open proposal are re-checked with every batch
+for their user, so deleting or moving the other side clears it.
+
+The memory bus is drained by a thread started with the app
+(SCHEDULER_WORKER=1, the default). With EVENT_BUS_BACKEND=redis run the
+worker as its own process instead:
+
+  python -m app.services.scheduler_worker
+
+schedule_concierge_scheduler_lag_seconds measures publish -> proposal stored
+against the 5s background recommendation SLA (architecture.md).
+"""
+from bisect import bisect_left
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Sequence, Set
+import logging
+import os
+import threading
+import time
+
+from prometheus_client import Counter, Histogram
+from sqlalchemy import delete, select
+from sqlalchemy.orm import Session
+
+from ..db import models
+from ..db.session import SessionLocal
+from ..domain.spans import EventSpan, epoch_second
+from ..repositories.event_repository import SqlAlchemyEventRepository
+from .conflict_service import RESOLUTION_HORIZON_DAYS, ConflictService
+from .event_bus import EVENT_DELETED, DomainEvent, EventBus, get_event_bus
+
+logger = logging.getLogger(__name__)
+
+SCHEDULER_WORKER_ENABLED = os.getenv("SCHEDULER_WORKER", "1") == "1"
+BATCH_SIZE = int(os.getenv("SCHEDULER_BATCH_SIZE", "200"))
+PROPOSAL_LIMIT = 5
+LAG_SLA_SECONDS = 5.0
+_MARGIN = timedelta(days=1)  # neighbours that start just outside the horizon can still overlap
+
+SCHEDULER_LAG = Histogram(
+    "schedule_concierge_scheduler_lag_seconds",
+    "Time from an event change being published to its proposal being stored",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 10.0, 30.0),
+)
+SCHEDULER_BATCH_SIZE = Histogram(
+    "schedule_concierge_scheduler_batch_size", "Messages per scheduler batch",
+    buckets=(1, 5, 10, 25, 50, 100, 200, 500),
+)
+SCHEDULER_BATCH_DURATION = Histogram(
+    "schedule_concierge_scheduler_batch_duration_seconds", "Time to process one scheduler batch",
+    buckets=(0.01, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+SCHEDULER_PROPOSALS = Counter(
+    "schedule_concierge_scheduler_proposals_total",
+    "Conflict proposals stored or cleared by the scheduler worker", ["outcome"],  # proposed | cleared
+)
+SCHEDULER_SLA_MISSES = Counter(
+    "schedule_concierge_scheduler_sla_miss_total", "Messages handled later than the 5s async SLA"
+)
+
+
+def find_overlaps(spans: Sequence[EventSpan], starts: Sequence[int], max_length: int, target: EventSpan) -> List[EventSpan]:
+    """Spans (sorted by start, with `starts` their start_ts) overlapping target, excluding itself."""
+    lo = bisect_left(starts, target.start_ts - max_length)
+    hi = bisect_left(starts, target.end_ts)
+    return [s for s in spans[lo:hi] if s.end_ts > target.start_ts and s.id != target.id]
+
+
+class SchedulerWorker:
+    def __init__(self, bus: Optional[EventBus] = None, session_factory=SessionLocal,
+                 conflict_service: Optional[ConflictService] = None, batch_size: int = BATCH_SIZE):
+        self.bus = bus if bus is not None else get_event_bus()
+        self.session_factory = session_factory
+        self.conflicts = conflict_service or ConflictService()
+        self.repo = SqlAlchemyEventRepository()
+        self.batch_size = batch_size
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # --- consuming -----------------------------------------------------------
+
+    def run_once(self, block_seconds: float = 0.0) -> int:
+        """Process one batch from the bus; returns the number of messages handled.
+
+        Messages of users whose processing failed are not acked, so the redis
+        bus delivers them again once they have been pending long enough.
+        """
+        batch = self.bus.read(self.batch_size, block_seconds)
+        if not batch:
+            return 0
+        started = time.perf_counter()
+        failed = self.process([message for _, message in batch])
+        self.bus.ack([msg_id for msg_id, message in batch if message.user_id not in failed])
+        SCHEDULER_BATCH_SIZE.observe(len(batch))
+        SCHEDULER_BATCH_DURATION.observe(time.perf_counter() - started)
+        return len(batch)
+
+    def process(self, messages: Iterable[DomainEvent]) -> Set[str]:
+        """Handle messages per user; returns the users whose processing failed."""
+        by_user: Dict[str, List[DomainEvent]] = defaultdict(list)
+        for message in messages:
+            by_user[message.user_id].append(message)
+        failed: Set[str] = set()
+        for user_id, user_messages in by_user.items():
+            db = self.session_factory()
+            try:
+                self.process_user(db, user_id, user_messages)
+            except Exception:  # one user's failure must not block the others
+                logger.exception("scheduler batch failed for user %s", user_id)
+                db.rollback()
+                failed.add(user_id)
+                continue
+            finally:
+                db.close()
+            done = time.time()
+            for message in user_messages:
+                lag = done - message.occurred_at
+                SCHEDULER_LAG.observe(lag)
+                if lag > LAG_SLA_SECONDS:
+                    SCHEDULER_SLA_MISSES.inc()
+        return failed
+
+    def process_user(self, db: Session, user_id: str, messages: Sequence[DomainEvent],
+                     now: Optional[datetime] = None) -> Dict[str, int]:
+        """Re-evaluate the changed events (and open proposals) of one user; returns event_id -> conflict count."""
+        now = now or datetime.now(timezone.utc)
+        resolutions = models.ConflictResolution
+        deleted = {m.event_id for m in messages if m.type == EVENT_DELETED}
+        open_rows = {r.event_id: r for r in db.scalars(
+            select(resolutions).where(resolutions.user_id == user_id, resolutions.status == "PROPOSED")
+        )}
+        candidates = ({m.event_id for m in messages} | set(open_rows)) - deleted
+
+        spans = sorted(self.repo.find_future_spans(
+            db, user_id, now - _MARGIN, now + timedelta(days=RESOLUTION_HORIZON_DAYS) + _MARGIN
+        ))
+        starts = [s.start_ts for s in spans]
+        max_length = max((s.end_ts - s.start_ts for s in spans), default=0)
+        by_id = {s.id: s for s in spans}
+        first_start, last_start = epoch_second(now), epoch_second(now + timedelta(days=RESOLUTION_HORIZON_DAYS))
+
+        def in_horizon(span: Optional[EventSpan]) -> bool:
+            return span is not None and first_start <= span.start_ts <= last_start
+
+        counts: Dict[str, int] = {}
+        cleared = set(deleted)
+        neighbours = set()
+        for event_id in candidates:
+            target = by_id.get(event_id)
+            overlaps = find_overlaps(spans, starts, max_length, target) if in_horizon(target) else []
+            if overlaps:
+                counts[event_id] = len(overlaps)
+                neighbours.update(s.id for s in overlaps if in_horizon(s))
+            else:
+                cleared.add(event_id)  # resolved, out of the horizon, deleted, or on an unselected calendar
+        # both sides of every overlap are resolved together, so which one moves
+        # depends on priority and not on which change arrived in which batch
+        for event_id in neighbours - set(counts):
+            counts[event_id] = len(find_overlaps(spans, starts, max_length, by_id[event_id]))
+
+        # one shared timeline, so two proposals never claim the same free time
+        targets = [by_id[event_id] for event_id in counts]
+        for result in self.conflicts.suggest_resolutions(
+                db, targets, limit=PROPOSAL_LIMIT, existing_events=spans, user_id=user_id):
+            event_id = result["eventId"]
+            if result["action"] == "keep":  # a lower-priority event moves instead
+                cleared.add(event_id)
+                del counts[event_id]
+                continue
+            row = open_rows.get(event_id)
+            if row is None:
+                row = resolutions(event_id=event_id, user_id=user_id)
+                db.add(row)
+            row.detected_at = now
+            row.conflict_count = counts[event_id]
+            row.proposals = result["slots"]
+        stale = [event_id for event_id in cleared if event_id in open_rows or event_id in deleted]
+        if stale:
+            db.execute(delete(resolutions).where(resolutions.user_id == user_id,
+                                                 resolutions.status == "PROPOSED",
+                                                 resolutions.event_id.in_(stale)))
+        db.commit()
+        SCHEDULER_PROPOSALS.labels(outcome="proposed").inc(len(counts))
+        SCHEDULER_PROPOSALS.labels(outcome="cleared").inc(len([e for e in stale if e in open_rows]))
+        return counts
+
+    # --- background thread ---------------------------------------------------
+
+    def start(self) -> None:
+        if self._thread and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._loop, name="scheduler-worker", daemon=True)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        self._stop.set()
+        if self._thread:
+            self._thread.join(timeout)
+
+    def _loop(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.run_once(block_seconds=1.0)
+            except Exception:  # keep consuming; the batch stays pending on redis and is reclaimed
+                logger.exception("scheduler worker batch failed")
+                self._stop.wait(1.0)
+
+
+_worker: Optional[SchedulerWorker] = None
+
+
+def start_scheduler_worker() -> Optional[SchedulerWorker]:
+    """Start the in-process worker thread (app lifespan) unless SCHEDULER_WORKER=0."""
+    global _worker
+    if not SCHEDULER_WORKER_ENABLED:
+        return None
+    if _worker is None:
+        _worker = SchedulerWorker()
+    _worker.start()
+    return _worker
+
+
+def stop_scheduler_worker() -> None:
+    if _worker is not None:
+        _worker.stop()
+
+
+def main() -> None:  # pragma: no cover - process entry point
+    logging.basicConfig(level=logging.INFO)
+    worker = SchedulerWorker()
+    logger.info("scheduler worker consuming %s", type(worker.bus).__name__)
+    try:
+        while True:
+            worker.run_once(block_seconds=5.0)
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":  # pragma: no cover
+    main()
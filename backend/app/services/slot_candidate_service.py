@@ -0,0 +1,331 @@
+"""Precomputed slot suggestions per task (slot_candidate_sets / slot_candidates).
+
+* Every flush that writes events, tasks or calendars marks the affected
+  candidate sets stale in the same transaction. For an event that is every
+  set of its owner whose availability window overlaps the whole UTC days the
+  event touched (before and after the change); for a task its own set; for a
+  calendar (selection changes) all of the owner's sets.
+* After the commit the owner's stale sets are recomputed on a background
+  thread with search_slots against one load of the owner's events. All
+  refreshes in a process share that one thread; across processes the sets
+  being refreshed are locked (FOR UPDATE on PostgreSQL).
+* /slots/suggest reads a stored set when it is fresh and falls back to
+  computing on demand otherwise, storing the task's set after the response.
+  A task gets its first set on its first read; new tasks cost nothing at write.
+
+A stored set is exactly what an on-demand compute would return while it is
+not stale, the horizon matches, and no loaded event has started yet (the
+endpoint only considers events that start after "now"). It also has to be
+the same UTC day (availability is anchored to today). expires_ts encodes the
+last two conditions.
+
+SLOT_PRECOMPUTE=0 disables the store (writes skip the hooks, reads always compute).
+"""
+from datetime import datetime, timedelta, timezone
+from itertools import chain
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+import logging
+import os
+import threading
+import time
+
+from prometheus_client import Counter, Histogram
+from sqlalchemy import and_, case, delete, event, insert, inspect, or_, select, true, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from ..db import models
+from ..db.session import SessionLocal
+from ..domain.enums import TaskStatus
+from ..domain.spans import epoch_second, from_epoch
+from ..repositories.event_repository import SqlAlchemyEventRepository
+from .recommendation_service import search_slots
+
+logger = logging.getLogger(__name__)
+
+SLOT_PRECOMPUTE = os.getenv("SLOT_PRECOMPUTE", "1") == "1"
+STORE_LIMIT = 20  # /slots/suggest's largest limit; smaller limits read a prefix
+DEFAULT_HORIZON_DAYS = 7
+MAX_HORIZON_DAYS = 90
+_DAY = 86400
+
+SLOT_STORE_READS = Counter(
+    "schedule_concierge_slot_store_reads_total",
+    "/slots/suggest lookups in the precomputed candidate store, by outcome",
+    ["outcome"],  # hit | stale | miss
+)
+SLOT_STORE_RECOMPUTED = Counter(
+    "schedule_concierge_slot_store_recomputed_total",
+    "Candidate sets recomputed after writes"
+)
+SLOT_STORE_REFRESH_DURATION = Histogram(
+    "schedule_concierge_slot_store_refresh_seconds",
+    "Time spent recomputing one user's stale candidate sets",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+
+
+def horizon_days(task, now: datetime) -> int:
+    """7 days, or up to the due date when it is further out (at most 90)."""
+    if not task.due_at:
+        return DEFAULT_HORIZON_DAYS
+    due_at = task.due_at if task.due_at.tzinfo else task.due_at.replace(tzinfo=timezone.utc)
+    return min(max(DEFAULT_HORIZON_DAYS, (due_at - now).days + 1), MAX_HORIZON_DAYS)
+
+
+def suggest_availability(now: datetime, horizon: int) -> List[Dict[str, datetime]]:
+    """Working hours (9-17) on weekdays for `horizon` days from today."""
+    availability = []
+    for day in range(horizon):
+        day_start = now.replace(hour=9, minute=0, second=0, microsecond=0) + timedelta(days=day)
+        if day_start.weekday() < 5:  # Monday = 0, Friday = 4
+            availability.append({"start": day_start, "end": day_start.replace(hour=17)})
+    return availability
+
+
+def _suggest(task, spans, now: datetime, horizon: int, limit: int) -> Tuple[List[Dict], List[Dict[str, datetime]]]:
+    """search_slots as /slots/suggest runs it; spans may cover a longer horizon than the task's."""
+    last_start = epoch_second(now + timedelta(days=horizon))
+    availability = suggest_availability(now, horizon)
+    events = [s for s in spans if s.start_ts <= last_start]
+    return search_slots(task, availability, limit=limit, existing_events=events), availability
+
+
+def _expires_ts(spans, now: datetime) -> int:
+    """First second at which a stored result may differ: the next midnight or the next loaded event start + 1."""
+    midnight = epoch_second(now.replace(hour=0, minute=0, second=0, microsecond=0)) + _DAY
+    return min([midnight] + [s.start_ts + 1 for s in spans])
+
+
+# --- writes: recompute -------------------------------------------------------
+
+def refresh_slot_candidates(db: Session, user_id: str, task_ids: Iterable[str] = (), now: Optional[datetime] = None) -> int:
+    """Recompute the user's stale sets and the sets of task_ids; returns how many were stored.
+
+    Only open tasks keep a set; sets of tasks that are Done are dropped.
+    """
+    started = time.perf_counter()
+    now = now or datetime.now(timezone.utc)
+    # invalidation counts as of now; marks that land while this runs keep their set stale.
+    # FOR UPDATE (PostgreSQL) makes a concurrent refresh of the same sets wait and re-read.
+    observed = dict(db.execute(select(models.SlotCandidateSet.task_id, models.SlotCandidateSet.stale).where(
+        models.SlotCandidateSet.user_id == user_id, models.SlotCandidateSet.stale > 0,
+    ).with_for_update()).all())
+    wanted = set(task_ids) | set(observed)
+    if not wanted:
+        return 0
+    tasks = list(db.scalars(select(models.Task).where(models.Task.id.in_(wanted), models.Task.user_id == user_id)))
+    closed = [t.id for t in tasks if t.status == TaskStatus.DONE.value]
+    if closed:
+        db.execute(delete(models.SlotCandidate).where(models.SlotCandidate.task_id.in_(closed)))
+        db.execute(delete(models.SlotCandidateSet).where(models.SlotCandidateSet.task_id.in_(closed)))
+        tasks = [t for t in tasks if t.id not in closed]
+    if not tasks:
+        db.commit()
+        return 0
+    horizons = {t.id: horizon_days(t, now) for t in tasks}
+    spans = SqlAlchemyEventRepository().find_future_spans(db, user_id, now, now + timedelta(days=max(horizons.values())))
+    sets = {s.task_id: s for s in db.scalars(
+        select(models.SlotCandidateSet).where(models.SlotCandidateSet.task_id.in_(list(horizons)))
+    )}
+    db.execute(delete(models.SlotCandidate).where(models.SlotCandidate.task_id.in_(list(horizons))))
+    rows = []
+    for task in tasks:
+        horizon = horizons[task.id]
+        slots, availability = _suggest(task, spans, now, horizon, STORE_LIMIT)
+        cset = sets.get(task.id)
+        if cset is None:
+            cset = models.SlotCandidateSet(task_id=task.id, user_id=user_id, version=0)
+            db.add(cset)
+        cset.version = (cset.version or 0) + 1
+        if task.id in sets and observed.get(task.id):
+            seen = observed[task.id]  # never below 0, even if another refresh already cleared these marks
+            cset.stale = case((models.SlotCandidateSet.stale > seen, models.SlotCandidateSet.stale - seen), else_=0)
+        elif task.id not in sets:
+            cset.stale = 0
+        cset.horizon_days = horizon
+        cset.window_start_ts = epoch_second(availability[0]["start"]) if availability else epoch_second(now)
+        cset.window_end_ts = epoch_second(availability[-1]["end"]) if availability else epoch_second(now)
+        cset.expires_ts = _expires_ts(spans, now)
+        cset.computed_at = now
+        rows.extend(
+            {"task_id": task.id, "rank": rank, "score": slot["score"],
+             "start_ts": epoch_second(datetime.fromisoformat(slot["startAt"])),
+             "end_ts": epoch_second(datetime.fromisoformat(slot["endAt"]))}
+            for rank, slot in enumerate(slots)
+        )
+    db.flush()
+    if rows:
+        db.execute(insert(models.SlotCandidate), rows)
+    db.commit()
+    SLOT_STORE_RECOMPUTED.inc(len(tasks))
+    SLOT_STORE_REFRESH_DURATION.observe(time.perf_counter() - started)
+    return len(tasks)
+
+
+# --- writes: invalidation hooks ------------------------------------------------
+
+def _day_range(start_ts: int, end_ts: int) -> Tuple[int, int]:
+    return start_ts - start_ts % _DAY, end_ts - end_ts % _DAY + _DAY
+
+
+def _event_ranges(obj: models.Event) -> List[Tuple[int, int]]:
+    """Whole-day ranges an event covers now and covered before this flush."""
+    state = inspect(obj)
+    starts = [obj.start_ts, *state.attrs.start_ts.history.deleted]
+    ends = [obj.end_ts, *state.attrs.end_ts.history.deleted]
+    starts, ends = [s for s in starts if s is not None], [e for e in ends if e is not None]
+    if not starts or not ends:
+        return []
+    return [_day_range(min(starts), max(ends))]
+
+
+_SCHEDULE_ATTRS = ("start_ts", "end_ts", "type", "calendar_id", "user_id")
+
+
+def _schedule_changed(obj: models.Event) -> bool:
+    attrs = inspect(obj).attrs
+    return any(attrs[name].history.has_changes() for name in _SCHEDULE_ATTRS)
+
+
+def _collect_changes(session: Session) -> Dict[str, Dict[str, Any]]:
+    """{user_id: {"ranges": [...], "tasks": {...}, "all": bool}} for this flush's writes."""
+    changes: Dict[str, Dict[str, Any]] = {}
+    for obj in chain(session.new, session.dirty, session.deleted):
+        if not isinstance(obj, (models.Event, models.Task, models.Calendar)) or not obj.user_id:
+            continue
+        change = changes.setdefault(obj.user_id, {"ranges": [], "tasks": set(), "deleted": set(), "all": False})
+        if isinstance(obj, models.Event):
+            if obj in session.dirty and not _schedule_changed(obj):
+                continue  # title / description edits do not move any slot
+            change["ranges"].extend(_event_ranges(obj))
+        elif isinstance(obj, models.Task):
+            if obj in session.new:
+                continue  # no set yet; the first /slots/suggest read stores one
+            change["deleted" if obj in session.deleted else "tasks"].add(obj.id)
+        else:
+            change["all"] = True
+    return changes
+
+
+@event.listens_for(Session, "after_flush")
+def _mark_stale(session, flush_context):
+    if not SLOT_PRECOMPUTE:
+        return
+    changes = _collect_changes(session)
+    if not changes:
+        return
+    sets = models.SlotCandidateSet
+    conn = session.connection()
+    pending = session.info.setdefault("slot_refresh", {})
+    for user_id, change in changes.items():
+        if change["deleted"]:  # no FK cascade on SQLite
+            gone = list(change["deleted"])
+            conn.execute(delete(models.SlotCandidate).where(models.SlotCandidate.task_id.in_(gone)))
+            conn.execute(delete(sets).where(sets.task_id.in_(gone)))
+        if change["all"]:
+            match = [true()]
+        else:
+            match = [and_(sets.window_start_ts < hi, sets.window_end_ts > lo) for lo, hi in change["ranges"]]
+            if change["tasks"]:
+                match.append(sets.task_id.in_(list(change["tasks"])))
+            if not match:
+                continue
+        conn.execute(update(sets).where(sets.user_id == user_id, or_(*match)).values(stale=sets.stale + 1))
+        pending.setdefault(user_id, set()).update(change["tasks"])
+
+
+def _refresh(user_id: str, task_ids: Iterable[str]) -> None:
+    db = SessionLocal()
+    try:
+        refresh_slot_candidates(db, user_id, task_ids)
+    except Exception:  # never fail the caller; reads fall back to on-demand compute
+        logger.exception("slot candidate refresh failed for user %s", user_id)
+    finally:
+        db.close()
+
+
+# Recomputes run on one background thread so writes do not wait for them;
+# until one lands, reads see stale > 0 and compute on demand. Requests for a
+# user whose refresh is still queued are folded into it (one recompute per
+# task id however many writes or stale reads asked for it).
+_refresh_pool: Optional[ThreadPoolExecutor] = None
+_refresh_futures: List[Future] = []
+_refresh_queued: Dict[str, set] = {}  # user_id -> task ids of the refresh not yet started
+_refresh_lock = threading.Lock()
+
+
+def _run_queued_refresh(user_id: str) -> None:
+    with _refresh_lock:
+        task_ids = _refresh_queued.pop(user_id, set())
+    _refresh(user_id, task_ids)
+
+
+def _submit_refresh(user_id: str, task_ids: Iterable[str]) -> None:
+    global _refresh_pool
+    with _refresh_lock:
+        queued = _refresh_queued.get(user_id)
+        if queued is not None:
+            queued.update(task_ids)
+            return
+        _refresh_queued[user_id] = set(task_ids)
+        if _refresh_pool is None:
+            _refresh_pool = ThreadPoolExecutor(max_workers=1, thread_name_prefix="slot-refresh")
+        _refresh_futures[:] = [f for f in _refresh_futures if not f.done()]
+        _refresh_futures.append(_refresh_pool.submit(_run_queued_refresh, user_id))
+
+
+def wait_for_refreshes(timeout: float = 10.0) -> None:
+    """Block until queued recomputes have finished (tests, shutdown)."""
+    with _refresh_lock:
+        pending = list(_refresh_futures)
+    wait(pending, timeout=timeout)
+
+
+@event.listens_for(Session, "after_commit")
+def _refresh_after_commit(session):
+    pending = session.info.pop("slot_refresh", None)
+    for user_id, task_ids in (pending or {}).items():
+        _submit_refresh(user_id, task_ids)
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_refresh(session):
+    session.info.pop("slot_refresh", None)
+
+
+def refresh_in_background(user_id: str, task_id: str) -> None:
+    """BackgroundTasks target: (re)store one task's set after a miss or stale read.
+
+    Queued on the same single refresh thread as the after-commit recomputes, so
+    two refreshes never subtract the same invalidation marks. It does not wait:
+    Starlette runs it on the shared threadpool.
+    """
+    _submit_refresh(user_id, [task_id])
+
+
+# --- reads --------------------------------------------------------------------
+
+async def read_stored_slots(db: AsyncSession, task_id: str, horizon: int, limit: int,
+                            now: datetime) -> Tuple[str, Optional[int], Optional[List[Dict]]]:
+    """(outcome, version, slots) from the store; slots is None unless outcome == "hit"."""
+    if not SLOT_PRECOMPUTE:  # nothing keeps stored sets current
+        return "off", None, None
+    cset = await db.get(models.SlotCandidateSet, task_id)
+    if cset is None:
+        SLOT_STORE_READS.labels(outcome="miss").inc()
+        return "miss", None, None
+    if cset.stale or cset.horizon_days != horizon or epoch_second(now) >= cset.expires_ts:
+        SLOT_STORE_READS.labels(outcome="stale").inc()
+        return "stale", cset.version, None
+    rows = await db.execute(
+        select(models.SlotCandidate.start_ts, models.SlotCandidate.end_ts, models.SlotCandidate.score)
+        .where(models.SlotCandidate.task_id == task_id)
+        .order_by(models.SlotCandidate.rank)
+        .limit(limit)
+    )
+    SLOT_STORE_READS.labels(outcome="hit").inc()
+    slots = [{"startAt": from_epoch(s).isoformat(), "endAt": from_epoch(e).isoformat(), "score": score}
+             for s, e, score in rows]
+    return "hit", cset.version, slots
@@ -1,3 +1,4 @@
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from ..db import models
 from datetime import datetime
@@ -12,8 +13,29 @@ def create_task(db: Session, user_id: str, title: str, due_at=None, priority: in
     db.refresh(task)
     return task
 
+def create_tasks_bulk(db: Session, user_id: str, specs: list):
+    """Insert one task per spec (create_task kwargs) in one transaction.
+
+    Rows are reloaded with a single IN query after commit instead of a refresh per task.
+    """
+    tasks = [models.Task(user_id=user_id, **spec) for spec in specs]
+    db.add_all(tasks)
+    db.flush()
+    ids = [t.id for t in tasks]
+    db.commit()
+    if ids:
+        db.query(models.Task).filter(models.Task.id.in_(ids)).all()
+    return tasks
+
 def get_task(db: Session, task_id: str):
     task = db.query(models.Task).filter(models.Task.id == task_id).first()
     if not task:
         raise TaskNotFound()
     return task
+
+
+async def get_task_async(db: AsyncSession, task_id: str):
+    task = await db.get(models.Task, task_id)
+    if not task:
+        raise TaskNotFound()
+    return task
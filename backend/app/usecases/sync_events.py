@@ -1,12 +1,13 @@
 from __future__ import annotations
 from dataclasses import dataclass
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from sqlalchemy.orm import Session
 from datetime import datetime, timezone
 
 from ..ports.calendar_provider import CalendarProvider
 from ..repositories.calendar_repository import CalendarRepository, SqlAlchemyCalendarRepository
 from ..db import models
+from ..services.event_bus import EVENT_CREATED, EVENT_DELETED, EVENT_UPDATED, publish_event_changes
 
 
 @dataclass
@@ -41,29 +42,35 @@ class SyncEventsUseCase:
         cals = [c for c in cals if c]
         total = 0
         next_token: Optional[str] = None
+        changes: List[Tuple[str, str, str]] = []
 
         for cal in cals:
             since_iso = None if sync_token else datetime.now(timezone.utc).isoformat()
             res = self.provider.list_events(user_context, cal.external_id, sync_token=sync_token, since_iso=since_iso)
             for ge in res.get("items", []):
-                self._upsert_event(db, cal, ge)
+                change = self._upsert_event(db, cal, ge)
+                if change:
+                    changes.append(change)
                 total += 1
             nt = res.get("nextSyncToken")
             if nt:
                 next_token = nt
         db.commit()
+        publish_event_changes(changes)
         return SyncEventsResult(synced_events=total, next_sync_token=next_token)
 
-    def _upsert_event(self, db: Session, calendar: models.Calendar, google_event: Dict[str, Any]):
+    def _upsert_event(self, db: Session, calendar: models.Calendar, google_event: Dict[str, Any]) -> Optional[Tuple[str, str, str]]:
+        """Apply one provider event; returns the (type, user_id, event_id) change to publish, if any."""
         if google_event.get("status") == "cancelled":
             existing = db.query(models.Event).filter(models.Event.external_event_id == google_event["id"]).first()
             if existing:
                 db.delete(existing)
-            return
+                return EVENT_DELETED, existing.user_id, existing.id
+            return None
         start = google_event.get("start", {})
         end = google_event.get("end", {})
         if "dateTime" not in start or "dateTime" not in end:
-            return
+            return None
         start_dt = datetime.fromisoformat(start["dateTime"].replace("Z", "+00:00"))
         end_dt = datetime.fromisoformat(end["dateTime"].replace("Z", "+00:00"))
         existing = db.query(models.Event).filter(models.Event.external_event_id == google_event["id"]).first()
@@ -73,6 +80,7 @@ class SyncEventsUseCase:
             existing.start_at = start_dt
             existing.end_at = end_dt
             existing.updated_at = datetime.now(timezone.utc)
+            return EVENT_UPDATED, existing.user_id, existing.id
         else:
             import uuid
             ev = models.Event(
@@ -87,3 +95,4 @@ class SyncEventsUseCase:
                 external_event_id=google_event["id"],
             )
             db.add(ev)
+            return EVENT_CREATED, ev.user_id, ev.id
@@ -0,0 +1,93 @@
+"""Per-request overhead of the metrics middleware on /healthz.
+
+Compares the previous @app.middleware("http") implementation with the pure
+ASGI MetricsMiddleware by driving small FastAPI apps directly over ASGI (no
+HTTP client or socket in the loop), minus a bare app as the baseline.
+
+Run from backend/:  python -m benchmarks.bench_metrics_middleware [--requests N]
+"""
+import argparse
+import asyncio
+import time
+
+from fastapi import FastAPI, Request
+from prometheus_client import CollectorRegistry, Counter, Histogram
+
+from app.observability import MetricsMiddleware
+
+
+def _app():
+    app = FastAPI()
+
+    @app.get("/healthz")
+    async def health():
+        return {"status": "ok"}
+
+    return app
+
+
+def bare_app():
+    return _app()
+
+
+def function_middleware_app():
+    """The middleware as it was before (route templating from the previous change included)."""
+    registry = CollectorRegistry()
+    count = Counter("bench_requests_total", "", ["method", "path", "status"], registry=registry)
+    latency = Histogram("bench_latency_seconds", "", ["method", "path"], registry=registry)
+    app = _app()
+
+    @app.middleware("http")
+    async def metrics_middleware(request: Request, call_next):
+        method = request.method
+        started = time.perf_counter()
+        response = await call_next(request)
+        path = getattr(request.scope.get("route"), "path", None) or "<unmatched>"
+        latency.labels(method=method, path=path).observe(time.perf_counter() - started)
+        count.labels(method=method, path=path, status=str(response.status_code)).inc()
+        return response
+
+    return app
+
+
+def asgi_middleware_app():
+    app = _app()
+    app.add_middleware(MetricsMiddleware)
+    return app
+
+
+async def _drive(app, n):
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "GET",
+        "scheme": "http", "path": "/healthz", "raw_path": b"/healthz", "root_path": "",
+        "query_string": b"", "headers": [(b"host", b"bench")], "client": ("127.0.0.1", 1), "server": ("bench", 80),
+    }
+
+    async def receive():
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        pass
+
+    for _ in range(200):  # warm-up (middleware stack build, label children)
+        await app(dict(scope), receive, send)
+    started = time.perf_counter()
+    for _ in range(n):
+        await app(dict(scope), receive, send)
+    return (time.perf_counter() - started) / n * 1e6
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--requests", type=int, default=20000)
+    args = ap.parse_args()
+    results = {}
+    for name, factory in (("bare", bare_app), ("function", function_middleware_app), ("asgi", asgi_middleware_app)):
+        results[name] = min(asyncio.run(_drive(factory(), args.requests)) for _ in range(3))
+        print(f"{name:<9} {results[name]:7.2f} us/request")
+    old, new = results["function"] - results["bare"], results["asgi"] - results["bare"]
+    print(f"overhead  function {old:.2f} us -> asgi {new:.2f} us ({old / max(new, 1e-9):.1f}x less)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,65 @@
+"""Microbenchmarks for NLP parsing.
+
+* single-pass lexer Japanese parser
+* engine cost as the rule table grows (Japanese with a large English table
+  registered, English with 30 vs. 5000 rules)
+
+Run from backend/:  python -m benchmarks.bench_nlp_parser [--iterations N]
+"""
+import argparse
+import timeit
+from datetime import date
+
+from app.services.nlp_service import ENGLISH_RULES, EngineRegistry, NLPScheduleParser, Rule
+
+BASE = date(2026, 10, 19)
+SAMPLES = [
+    "明日午前10時に資料レビューをしたい 90分",
+    "午後3時15分 UI改善 45分",
+    "2時間 集中して設計を書きたい",
+    "今日は午後2時 1on1",
+    "朝 ランニング 30分",
+    "明後日午前8時 調査",
+    "来週の企画書ドラフトを書きたい",
+]
+EN_SAMPLES = [
+    "tomorrow at 3pm review the deck for 30 minutes",
+    "I want to draft the spec 2h focus",
+    "standup 9:30am",
+]
+
+
+def _lexer():
+    for s in SAMPLES:
+        NLPScheduleParser.parse(s, base_date=BASE)
+
+
+def _per_parse_us(fn, samples, iterations):
+    return min(timeit.repeat(fn, number=iterations, repeat=5)) / (iterations * len(samples)) * 1e6
+
+
+def _engine_runs(iterations):
+    filler = [Rule(f"filler phrase {i}", "noise") for i in range(5000)]
+    small, large = EngineRegistry(), EngineRegistry({"en": filler})
+    for registry in (small, large):
+        registry.warm()
+    for label, registry in (("ja engine, 30 en rules", small), ("ja engine, 5000 en rules", large)):
+        ja = registry.get("ja")
+        us = _per_parse_us(lambda: [ja.parse(s, BASE) for s in SAMPLES], SAMPLES, iterations)
+        print(f"{label:<26} {us:7.2f} us/parse")
+    for label, registry in (("en engine, %d rules" % len(ENGLISH_RULES), small), ("en engine, 5000+ rules", large)):
+        en = registry.get("en")
+        us = _per_parse_us(lambda: [en.parse(s, BASE) for s in EN_SAMPLES], EN_SAMPLES, iterations)
+        print(f"{label:<26} {us:7.2f} us/parse")
+
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--iterations", type=int, default=20000)
+    args = ap.parse_args()
+    print(f"{'lexer':<26} {_per_parse_us(_lexer, SAMPLES, args.iterations):7.2f} us/parse")
+    _engine_runs(args.iterations)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+"""Slot recommendation benchmark suite over synthetic calendars.
+
+Covers compute_slots, search_slots, score_slot and common_slots (pure functions), ConflictService
+detect_conflicts / suggest_resolution, 10k-event loads (ORM vs EventSpan)
+and scheduler worker batches against a scratch SQLite database, and
+GET /slots/suggest end to end through the TestClient, for each scenario in
+benchmarks.workload.SCENARIOS.
+
+Results are written as JSON and compared against a stored baseline; any
+benchmark whose median got slower than baseline * (1 + tolerance) is reported
+and the run exits with status 1. Baselines are machine specific: regenerate
+with --update-baseline on the machine that runs the comparison.
+
+Run from backend/:
+  python -m benchmarks.bench_recommendation [--quick] [--only compute_slots]
+      [--output results.json] [--baseline benchmarks/baselines/recommendation.json]
+      [--tolerance 0.3] [--update-baseline]
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import SimpleNamespace
+
+from benchmarks.workload import SCENARIOS, generate, upcoming_start
+
+DEFAULT_BASELINE = Path(__file__).parent / "baselines" / "recommendation.json"
+DB_SCENARIOS = ("light", "busy", "long_horizon")
+
+
+def _measure(fn, ops, repeat):
+    """Median / min seconds per op over `repeat` runs of fn (which performs `ops` ops)."""
+    fn()  # warm-up
+    runs = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        runs.append((time.perf_counter() - started) / ops)
+    return {"median_us": statistics.median(runs) * 1e6, "min_us": min(runs) * 1e6, "ops": ops, "repeat": repeat}
+
+
+def bench_compute_slots(repeat):
+    from app.services.recommendation_service import compute_slots
+    for name, spec in SCENARIOS.items():
+        w = generate(spec)
+        availability = w.availability()
+        yield f"compute_slots/{name}", _measure(
+            lambda: [compute_slots(t, availability, limit=5, existing_events=w.events) for t in w.tasks],
+            len(w.tasks), repeat,
+        )
+
+
+def bench_search_slots(repeat):
+    from benchmarks.workload import WorkloadSpec
+    from app.services.recommendation_service import search_slots
+    scenarios = dict(SCENARIOS, horizon_90d=WorkloadSpec(days=90, events_per_day=6, focus_ratio=0.2, due_ratio=0.8))
+    for name, spec in scenarios.items():
+        w = generate(spec)
+        availability = w.availability()
+        yield f"search_slots/{name}", _measure(
+            lambda: [search_slots(t, availability, limit=5, existing_events=w.events) for t in w.tasks],
+            len(w.tasks), repeat,
+        )
+
+
+def bench_score_slot(repeat):
+    from app.services.recommendation_service import SLOT_GRANULARITY_MIN, score_slot
+    for name, spec in SCENARIOS.items():
+        w = generate(spec)
+        starts = []
+        for window in w.availability():
+            cur = window["start"]
+            while cur < window["end"]:
+                starts.append(cur)
+                cur += timedelta(minutes=SLOT_GRANULARITY_MIN)
+        starts = starts[:64]
+        pairs = [(t, s, s + timedelta(minutes=t.estimated_minutes)) for t in w.tasks for s in starts]
+        yield f"score_slot/{name}", _measure(
+            lambda: [score_slot(t, s, e, w.events) for t, s, e in pairs], len(pairs), repeat,
+        )
+
+
+def _seed_database(workload):
+    """Fresh schema with the demo user, one selected calendar, the events and tasks."""
+    from app.db import models
+    from app.db.session import Base, SessionLocal, engine
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        db.add(models.User(id="demo-user", email="demo@example.com"))
+        db.add(models.Calendar(id="bench-calendar", user_id="demo-user", name="bench", selected=1))
+        db.add_all(models.Event(
+            id=e.id, calendar_id="bench-calendar", user_id="demo-user", title=e.title,
+            start_at=e.start_at, end_at=e.end_at, type=e.type,
+        ) for e in workload.events)
+        db.add_all(models.Task(
+            id=t.id, user_id="demo-user", title=t.title, priority=t.priority,
+            estimated_minutes=t.estimated_minutes, energy_tag=t.energy_tag, due_at=t.due_at,
+        ) for t in workload.tasks)
+        db.commit()
+    finally:
+        db.close()
+
+
+def bench_conflicts(repeat):
+    from app.db import models
+    from app.db.session import SessionLocal
+    from app.services.conflict_service import ConflictService
+    service = ConflictService()
+    for name in DB_SCENARIOS:
+        w = generate(SCENARIOS[name], start=upcoming_start())
+        _seed_database(w)
+        probes = [
+            models.Event(id=f"probe-{i}", user_id="demo-user", title="probe",
+                         start_at=e.start_at, end_at=e.end_at, type=e.type)
+            for i, e in enumerate(w.events[:20])
+        ]
+        db = SessionLocal()
+        try:
+            yield f"detect_conflicts/{name}", _measure(
+                lambda: [service.detect_conflicts(db, p) for p in probes], len(probes), repeat,
+            )
+            yield f"suggest_resolution/{name}", _measure(
+                lambda: [service.suggest_resolution(db, p) for p in probes[:5]], 5, repeat,
+            )
+            # an import's worth of events: one call per event vs one batch (per-event cost)
+            imported = db.query(models.Event).limit(200).all()
+            yield f"resolve_200_each/{name}", _measure(
+                lambda: [service.suggest_resolution(db, e) for e in imported], len(imported), repeat,
+            )
+            yield f"resolve_200_batch/{name}", _measure(
+                lambda: service.suggest_resolutions(db, imported), len(imported), repeat,
+            )
+        finally:
+            db.close()
+
+
+def bench_load_events(repeat):
+    """10k events loaded as ORM instances vs EventSpan tuples (plus peak memory of one load)."""
+    import tracemalloc
+    from benchmarks.workload import WorkloadSpec
+    from app.db import models
+    from app.db.session import SessionLocal
+    from app.repositories.event_repository import SqlAlchemyEventRepository
+    w = generate(WorkloadSpec(days=100, events_per_day=100, tasks=0), start=upcoming_start())
+    _seed_database(w)
+    repo = SqlAlchemyEventRepository()
+    end_window = w.start + timedelta(days=w.spec.days)
+    db = SessionLocal()
+    try:
+        loaders = {
+            "orm": lambda: (repo.find_future_events(db, "demo-user", w.start, end_window), db.expunge_all()),
+            "spans": lambda: repo.find_future_spans(db, "demo-user", w.start, end_window),
+        }
+        for name, load in loaders.items():
+            result = _measure(load, 1, repeat)
+            tracemalloc.start()
+            load()
+            result["peak_kib"] = tracemalloc.get_traced_memory()[1] / 1024
+            tracemalloc.stop()
+            yield f"load_events_10k/{name}", result
+    finally:
+        db.close()
+
+
+def bench_scheduler(repeat):
+    """One scheduler batch of event.created messages (every event of the user) against the 5s async SLA."""
+    from app.services.event_bus import EVENT_CREATED, DomainEvent
+    from app.services.scheduler_worker import SchedulerWorker
+    worker = SchedulerWorker(bus=object())  # process() only; the bus is not read
+    for name in DB_SCENARIOS:
+        w = generate(SCENARIOS[name], start=upcoming_start())
+        _seed_database(w)
+        messages = [DomainEvent(EVENT_CREATED, "demo-user", e.id, time.time()) for e in w.events[:200]]
+        yield f"scheduler_batch/{name}", _measure(lambda: worker.process(messages), 1, repeat)
+
+
+def bench_slots_endpoint(repeat):
+    from fastapi.testclient import TestClient
+    from app.main import app
+    with TestClient(app) as client:
+        for name in DB_SCENARIOS:
+            w = generate(SCENARIOS[name], start=upcoming_start())
+            _seed_database(w)
+            task_ids = [t.id for t in w.tasks[:10]]
+
+            def run():
+                for task_id in task_ids:
+                    r = client.get("/slots/suggest", params={"taskId": task_id})
+                    assert r.status_code == 200, r.text
+
+            yield f"slots_suggest_endpoint/{name}", _measure(run, len(task_ids), repeat)
+
+
+def bench_common_slots(repeat):
+    from benchmarks.workload import WorkloadSpec
+    from app.services.common_slot_service import common_slots, workday_windows
+    for participants in (5, 50):
+        rows = []
+        for i in range(participants):
+            w = generate(WorkloadSpec(days=14, events_per_day=6, focus_ratio=0.2, tasks=0, seed=i))
+            rows.extend(SimpleNamespace(user_id=f"user-{i}", start_at=e.start_at, end_at=e.end_at, type=e.type)
+                        for e in w.events)
+        users = [f"user-{i}" for i in range(participants)]
+        windows = workday_windows(w.start, w.start + timedelta(days=14))
+        for focus in ("soft", "hard"):
+            yield f"common_slots/{participants}_users_{focus}", _measure(
+                lambda: common_slots(rows, users, windows, 60, focus=focus), 1, repeat,
+            )
+
+
+SUITES = {
+    "compute_slots": bench_compute_slots,
+    "search_slots": bench_search_slots,
+    "score_slot": bench_score_slot,
+    "conflicts": bench_conflicts,
+    "load_events": bench_load_events,
+    "scheduler": bench_scheduler,
+    "endpoint": bench_slots_endpoint,
+    "common_slots": bench_common_slots,
+}
+
+
+def compare(results, baseline, tolerance):
+    """Names of benchmarks slower than their baseline median by more than `tolerance`."""
+    regressions = []
+    for name, result in results.items():
+        base = baseline.get(name)
+        if base and result["median_us"] > base["median_us"] * (1 + tolerance):
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    ap = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    ap.add_argument("--quick", action="store_true", help="fewer repeats (smoke run)")
+    ap.add_argument("--only", choices=sorted(SUITES), action="append", help="run only these suites")
+    ap.add_argument("--output", type=Path, help="write results JSON here")
+    ap.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    ap.add_argument("--tolerance", type=float, default=0.3, help="allowed slowdown vs baseline (0.3 = 30%%)")
+    ap.add_argument("--update-baseline", action="store_true", help="store this run as the baseline")
+    args = ap.parse_args(argv)
+    # The endpoint / conflict suites need their own database; app modules are
+    # imported lazily by the suites, after this is set.
+    os.environ["DATABASE_URL"] = f"sqlite+pysqlite:///{tempfile.mkdtemp(prefix='bench-recommendation-')}/bench.db"
+
+    repeat = 3 if args.quick else 7
+    results = {}
+    for suite in args.only or SUITES:
+        for name, result in SUITES[suite](repeat):
+            results[name] = result
+
+    baseline = {}
+    if args.baseline.exists() and not args.update_baseline:
+        baseline = json.loads(args.baseline.read_text())["results"]
+    print(f"{'benchmark':<36} {'median us':>11} {'min us':>11} {'baseline':>11} {'ratio':>7}")
+    for name, r in results.items():
+        base = baseline.get(name, {}).get("median_us")
+        ratio = f"{r['median_us'] / base:6.2f}x" if base else "      -"
+        base_s = f"{base:11.1f}" if base else f"{'-':>11}"
+        print(f"{name:<36} {r['median_us']:11.1f} {r['min_us']:11.1f} {base_s} {ratio}")
+
+    document = {
+        "meta": {
+            "createdAt": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "repeat": repeat,
+        },
+        "results": results,
+    }
+    if args.output:
+        args.output.parent.mkdir(parents=True, exist_ok=True)
+        args.output.write_text(json.dumps(document, indent=2, sort_keys=True))
+    if args.update_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(document, indent=2, sort_keys=True) + "\n")
+        print(f"baseline written to {args.baseline}")
+        return 0
+
+    regressions = compare(results, baseline, args.tolerance)
+    if regressions:
+        print(f"\nREGRESSION (> {args.tolerance:.0%} slower than baseline):", file=sys.stderr)
+        for name in regressions:
+            print(f"  {name}: {results[name]['median_us']:.1f} us vs {baseline[name]['median_us']:.1f} us", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
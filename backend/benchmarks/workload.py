@@ -0,0 +1,96 @@
+"""Synthetic calendars and tasks for recommendation benchmarks.
+
+A Workload is fully determined by its parameters and seed, so the same
+scenario produces the same events and tasks on every run and every machine.
+"""
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Dict, List, Optional, Tuple
+
+EVENT_DURATIONS = (15, 30, 45, 60, 90, 120)
+ENERGY_TAGS = (None, "morning", "afternoon", "deep")
+DAY_FIRST_HOUR, DAY_LAST_HOUR = 7, 20  # events start between 07:00 and 20:00
+
+
+@dataclass(frozen=True)
+class WorkloadSpec:
+    days: int = 7                    # horizon length
+    events_per_day: float = 6        # event density
+    focus_ratio: float = 0.2         # share of FOCUS events
+    task_durations: Tuple[int, ...] = (30, 60, 90)
+    tasks: int = 20
+    due_ratio: float = 0.5           # share of tasks with a due date inside the horizon
+    seed: int = 42
+
+
+# Named scenarios used by bench_recommendation and its baseline.
+SCENARIOS: Dict[str, WorkloadSpec] = {
+    "light": WorkloadSpec(days=7, events_per_day=2, focus_ratio=0.1, tasks=20),
+    "busy": WorkloadSpec(days=7, events_per_day=10, focus_ratio=0.3, tasks=20),
+    "focus_heavy": WorkloadSpec(days=7, events_per_day=6, focus_ratio=0.7, tasks=20),
+    "long_horizon": WorkloadSpec(days=30, events_per_day=6, focus_ratio=0.2, tasks=20),
+    "long_tasks": WorkloadSpec(days=7, events_per_day=6, focus_ratio=0.2, task_durations=(120, 180, 240), tasks=20),
+}
+
+
+@dataclass
+class Workload:
+    spec: WorkloadSpec
+    start: datetime
+    events: List[SimpleNamespace] = field(default_factory=list)
+    tasks: List[SimpleNamespace] = field(default_factory=list)
+
+    def availability(self, first_hour: int = 9, last_hour: int = 17) -> List[Dict[str, datetime]]:
+        """Weekday working-hour windows over the horizon, as the API builds them."""
+        windows = []
+        for day in range(self.spec.days):
+            day_start = self.start + timedelta(days=day, hours=first_hour)
+            if day_start.weekday() < 5:
+                windows.append({"start": day_start, "end": day_start.replace(hour=last_hour)})
+        return windows
+
+
+def default_start() -> datetime:
+    """A fixed Monday so pure-function scenarios do not depend on today's date."""
+    return datetime(2030, 1, 7, tzinfo=timezone.utc)
+
+
+def upcoming_start(now: Optional[datetime] = None) -> datetime:
+    """Tomorrow 00:00 UTC, for code paths that only look at future events."""
+    now = now or datetime.now(timezone.utc)
+    return now.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+
+
+def generate(spec: WorkloadSpec, start: Optional[datetime] = None) -> Workload:
+    rng = random.Random(spec.seed)
+    start = start or default_start()
+    workload = Workload(spec=spec, start=start)
+    slots_per_day = (DAY_LAST_HOUR - DAY_FIRST_HOUR) * 4
+    total_events = int(round(spec.events_per_day * spec.days))
+    for i in range(total_events):
+        day = rng.randrange(spec.days)
+        begin = start + timedelta(days=day, hours=DAY_FIRST_HOUR, minutes=15 * rng.randrange(slots_per_day))
+        kind = "FOCUS" if rng.random() < spec.focus_ratio else rng.choice(("MEETING", "GENERAL"))
+        workload.events.append(SimpleNamespace(
+            id=f"bench-event-{i}",
+            title=f"Event {i}",
+            start_at=begin,
+            end_at=begin + timedelta(minutes=rng.choice(EVENT_DURATIONS)),
+            type=kind,
+        ))
+    workload.events.sort(key=lambda e: e.start_at)
+    for i in range(spec.tasks):
+        due_at = None
+        if rng.random() < spec.due_ratio:
+            due_at = start + timedelta(hours=rng.randrange(12, spec.days * 24))
+        workload.tasks.append(SimpleNamespace(
+            id=f"bench-task-{i}",
+            title=f"Task {i}",
+            priority=rng.randint(1, 5),
+            estimated_minutes=rng.choice(spec.task_durations),
+            energy_tag=rng.choice(ENERGY_TAGS),
+            due_at=due_at,
+        ))
+    return workload
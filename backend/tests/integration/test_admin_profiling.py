@@ -0,0 +1,59 @@
+import pytest
+
+from app import profiling
+
+TOKEN = "test-admin-token"
+ADMIN = {"X-Admin-Token": TOKEN}
+
+
+@pytest.fixture
+def admin_env(monkeypatch):
+    monkeypatch.setenv("ADMIN_TOKEN", TOKEN)
+    yield
+    profiling.profiled_routes.clear()
+
+
+def test_admin_endpoints_require_token(client, monkeypatch):
+    monkeypatch.delenv("ADMIN_TOKEN", raising=False)
+    r = client.post('/admin/profile?seconds=0.1')
+    assert r.status_code == 403
+    assert r.json()['detail']['code'] == 'ADMIN_DISABLED'
+    monkeypatch.setenv("ADMIN_TOKEN", TOKEN)
+    r = client.post('/admin/profile?seconds=0.1', headers={"X-Admin-Token": "wrong"})
+    assert r.json()['detail']['code'] == 'ADMIN_TOKEN_INVALID'
+
+
+def test_sampling_profile_returns_stacks(client, admin_env):
+    r = client.post('/admin/profile?seconds=0.2&intervalMs=2&format=json', headers=ADMIN)
+    assert r.status_code == 200, r.text
+    data = r.json()
+    assert data['samples'] > 0
+    assert isinstance(data['stacks'], list)
+    r = client.post('/admin/profile?seconds=0.1', headers=ADMIN)
+    assert r.headers['content-type'].startswith('text/plain')
+
+
+def test_per_request_profile_for_enabled_route(client, admin_env):
+    r = client.put('/admin/profile/routes', json={"routes": ["/events"]}, headers=ADMIN)
+    assert r.json()['routes'] == ["/events"]
+
+    plain = client.get('/events')
+    assert 'x-profile-id' not in plain.headers
+    profiled = client.get('/events', headers={"X-Profile": "1", **ADMIN})
+    assert profiled.status_code == 200
+    assert 'db;dur=' in profiled.headers['server-timing']
+    profile_id = profiled.headers['x-profile-id']
+
+    detail = client.get(f'/admin/profile/requests/{profile_id}', headers=ADMIN).json()
+    assert detail['route'] == '/events'
+    assert detail['queries']['count'] >= 1
+    assert detail['queries']['slowest'][0]['sql']
+    assert 'samples' in detail['profile']
+    # header without the admin token does not profile
+    assert 'x-profile-id' not in client.get('/events', headers={"X-Profile": "1"}).headers
+
+
+def test_db_query_metrics_per_route(client):
+    client.get('/events')
+    body = client.get('/metrics').text
+    assert 'schedule_concierge_db_queries_per_request_count{path="/events"}' in body
@@ -0,0 +1,90 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from app.db import models
+from app.db.session import SessionLocal
+from app.services.auth_service import create_access_token
+
+AUTH = {"Authorization": f"Bearer {create_access_token('owner')}"}
+
+
+def _seed(users, busy, domain="example.com"):
+    db = SessionLocal()
+    try:
+        for user_id in users:
+            db.add(models.User(id=user_id, email=f"{user_id}@{domain}"))
+            db.add(models.Calendar(id=f"cal-{user_id}", user_id=user_id, name="main", selected=1))
+        for user_id, start, end, kind in busy:
+            db.add(models.Event(calendar_id=f"cal-{user_id}", user_id=user_id, title="busy",
+                                start_at=start, end_at=end, type=kind))
+        db.commit()
+    finally:
+        db.close()
+
+
+def _next_monday():
+    now = datetime.now(timezone.utc)
+    return (now + timedelta(days=7 - now.weekday())).replace(hour=0, minute=0, second=0, microsecond=0)
+
+
+def test_common_slots_intersect_participants_with_one_event_query(client):
+    monday = _next_monday()
+    _seed(["owner", "alice", "bob"], [
+        ("owner", monday.replace(hour=9), monday.replace(hour=11), "MEETING"),
+        ("alice", monday.replace(hour=11), monday.replace(hour=14), "MEETING"),
+        ("bob", monday.replace(hour=14), monday.replace(hour=16), "FOCUS"),
+    ])
+    statements = []
+
+    def capture(conn, cursor, statement, *args):
+        if "FROM events" in statement:
+            statements.append(statement)
+
+    event.listen(Engine, "before_cursor_execute", capture)
+    try:
+        r = client.post('/slots/common', json={
+            "userIds": ["alice", "bob"], "durationMinutes": 60, "focus": "hard",
+            "start": monday.isoformat(), "end": monday.replace(hour=23).isoformat(), "limit": 20,
+        }, headers=AUTH)
+    finally:
+        event.remove(Engine, "before_cursor_execute", capture)
+    assert r.status_code == 200, r.text
+    data = r.json()
+    assert data['participants'] == ["owner", "alice", "bob"]
+    assert [s['startAt'][:16] for s in data['slots']] == [monday.replace(hour=16).isoformat()[:16]]
+    assert len(statements) == 1 and " IN " in statements[0]
+
+    soft = client.post('/slots/common', json={
+        "userIds": ["alice", "bob"], "durationMinutes": 60,
+        "start": monday.isoformat(), "end": monday.replace(hour=23).isoformat(), "limit": 20,
+    }, headers=AUTH).json()
+    assert any(s['focusConflicts'] == ["bob"] for s in soft['slots'])
+    assert soft['slots'][0]['focusConflicts'] == []
+
+
+def test_common_slots_validation(client):
+    _seed(["owner", "x"], [])
+    r = client.post('/slots/common', json={"userIds": [f"u{i}" for i in range(120)], "durationMinutes": 30},
+                    headers=AUTH)
+    assert r.status_code == 400
+    assert r.json()['detail']['code'] == 'TOO_MANY_PARTICIPANTS'
+    now = datetime.now(timezone.utc)
+    r = client.post('/slots/common', json={"userIds": ["x"], "durationMinutes": 30,
+                                          "end": (now + timedelta(days=60)).isoformat()}, headers=AUTH)
+    assert r.json()['detail']['code'] == 'INVALID_HORIZON'
+
+
+def test_common_slots_only_for_visible_participants(client):
+    _seed(["owner", "alice"], [])
+    _seed(["mallory"], [], domain="other.example")
+    r = client.post('/slots/common', json={"userIds": ["alice"], "durationMinutes": 30})
+    assert r.status_code == 401
+    assert r.json()['detail']['code'] == 'AUTH_REQUIRED'
+    for user_ids in (["alice", "nobody"], ["mallory"]):
+        r = client.post('/slots/common', json={"userIds": user_ids, "durationMinutes": 30}, headers=AUTH)
+        assert r.status_code == 404
+        assert r.json()['detail']['code'] == 'USER_NOT_FOUND'
+    r = client.post('/slots/common', json={"userIds": ["alice"], "durationMinutes": 30}, headers=AUTH)
+    assert r.status_code == 200, r.text
@@ -0,0 +1,40 @@
+from datetime import datetime, timedelta, timezone
+
+
+def test_events_etag_304_until_write(client):
+    r1 = client.get("/events")
+    etag = r1.headers["ETag"]
+    assert r1.headers["Cache-Control"] == "private, no-cache"
+
+    r2 = client.get("/events", headers={"If-None-Match": etag})
+    assert r2.status_code == 304
+    assert r2.content == b""
+
+    start = datetime.now(timezone.utc) + timedelta(days=1)
+    client.post("/events", json={
+        "title": "New",
+        "startAt": start.isoformat(),
+        "endAt": (start + timedelta(hours=1)).isoformat(),
+    })
+    r3 = client.get("/events", headers={"If-None-Match": etag})
+    assert r3.status_code == 200
+    assert r3.headers["ETag"] != etag
+    assert len(r3.json()) == 1
+
+
+def test_calendar_and_slot_etags(client):
+    task_id = client.post("/tasks", json={"title": "T"}).json()["id"]
+    slots = client.get("/slots/suggest", params={"taskId": task_id})
+    assert client.get("/slots/suggest", params={"taskId": task_id},
+                      headers={"If-None-Match": slots.headers["ETag"]}).status_code == 304
+    # a different query is a different representation
+    assert client.get("/slots/suggest", params={"taskId": task_id, "limit": 2},
+                      headers={"If-None-Match": slots.headers["ETag"]}).status_code == 200
+
+    cals = client.get("/calendars")
+    assert client.get("/calendars", headers={"If-None-Match": cals.headers["ETag"]}).status_code == 304
+    # creating the first event also creates the default calendar
+    start = datetime.now(timezone.utc) + timedelta(days=2)
+    client.post("/events", json={"title": "E", "startAt": start.isoformat(),
+                                 "endAt": (start + timedelta(hours=1)).isoformat()})
+    assert client.get("/calendars", headers={"If-None-Match": cals.headers["ETag"]}).status_code == 200
@@ -145,4 +145,64 @@ def test_improved_slot_recommendations(client):
     assert scores == sorted(scores, reverse=True), "Slots should be ordered by score descending"
     
     # High priority tasks should get decent scores
-    assert max(scores) > 1.0, "High priority tasks should get good scores"
\ No newline at end of file
+    assert max(scores) > 1.0, "High priority tasks should get good scores"
+
+def test_overlapping_event_gets_a_proposal_from_the_scheduler_worker(client):
+    from app.db import models
+    from app.db.session import SessionLocal
+    from app.services.scheduler_worker import SchedulerWorker
+
+    worker = SchedulerWorker()
+    while worker.run_once():  # drain messages left by earlier tests
+        pass
+    start = datetime.now(timezone.utc) + timedelta(days=1)
+    first = client.post("/events", json={"title": "Planning", "startAt": start.isoformat(),
+                                         "endAt": (start + timedelta(hours=1)).isoformat(), "type": "MEETING"})
+    second = client.post("/events", json={"title": "1:1", "startAt": (start + timedelta(minutes=30)).isoformat(),
+                                          "endAt": (start + timedelta(minutes=90)).isoformat(), "type": "MEETING"})
+    assert first.status_code == second.status_code == 201
+    assert worker.run_once() == 2
+
+    db = SessionLocal()
+    try:
+        row = db.query(models.ConflictResolution).filter_by(event_id=second.json()["id"]).one()
+        assert (row.status, row.conflict_count) == ("PROPOSED", 1)
+        assert row.proposals
+    finally:
+        db.close()
+
+
+def test_batch_resolutions_endpoint(client):
+    start = (datetime.now(timezone.utc) + timedelta(days=2)).replace(hour=11, minute=0, second=0, microsecond=0)
+    ids = []
+    for title, kind in (("Sync", "MEETING"), ("Errand", "GENERAL"), ("Notes", "GENERAL")):
+        r = client.post("/events", json={"title": title, "startAt": start.isoformat(),
+                                         "endAt": (start + timedelta(minutes=45)).isoformat(), "type": kind})
+        assert r.status_code == 201, r.text
+        ids.append(r.json()["id"])
+
+    r = client.post("/events/resolutions", json={"eventIds": ids, "limit": 2})
+    assert r.status_code == 200, r.text
+    results = r.json()["resolutions"]
+    assert [x["eventId"] for x in results] == ids
+    assert [x["action"] for x in results] == ["keep", "move", "move"]
+    assert results[1]["slots"][0]["startAt"] != results[2]["slots"][0]["startAt"]
+
+    r = client.post("/events/resolutions", json={"eventIds": [ids[0], "nope"]})
+    assert r.status_code == 404
+    assert r.json()["detail"]["code"] == "EVENT_NOT_FOUND"
+
+
+def test_batch_resolutions_outside_the_horizon_see_their_conflicts(client):
+    for days in (-2, 30):  # before now / beyond RESOLUTION_HORIZON_DAYS
+        start = (datetime.now(timezone.utc) + timedelta(days=days)).replace(hour=11, minute=0, second=0, microsecond=0)
+        ids = []
+        for title, kind in (("Sync", "MEETING"), ("Errand", "GENERAL")):
+            r = client.post("/events", json={"title": title, "startAt": start.isoformat(),
+                                             "endAt": (start + timedelta(minutes=45)).isoformat(), "type": kind})
+            assert r.status_code == 201, r.text
+            ids.append(r.json()["id"])
+
+        results = client.post("/events/resolutions", json={"eventIds": [ids[1]]}).json()["resolutions"]
+        assert results[0]["action"] == "move", days
+        assert results[0]["slots"]
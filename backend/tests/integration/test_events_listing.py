@@ -0,0 +1,54 @@
+from datetime import datetime, timedelta, timezone
+
+
+def _create(client, title, start):
+    r = client.post("/events", json={
+        "title": title,
+        "startAt": start.isoformat(),
+        "endAt": (start + timedelta(minutes=30)).isoformat(),
+        "type": "GENERAL",
+    })
+    assert r.status_code == 201, r.text
+    return r.json()
+
+
+def test_list_events_range_cursor_and_fields(client):
+    base = datetime.now(timezone.utc).replace(microsecond=0) + timedelta(days=1)
+    created = [_create(client, f"E{i}", base + timedelta(hours=i)) for i in range(5)]
+
+    r = client.get("/events", params={
+        "from": (base + timedelta(hours=1)).isoformat(),
+        "to": (base + timedelta(hours=4)).isoformat(),
+    })
+    assert r.status_code == 200
+    assert [e["title"] for e in r.json()] == ["E1", "E2", "E3"]
+
+    seen = []
+    params = {"limit": 2}
+    while True:
+        r = client.get("/events", params=params)
+        assert r.status_code == 200
+        seen += [e["id"] for e in r.json()]
+        cursor = r.headers.get("X-Next-Cursor")
+        if not cursor:
+            break
+        params = {"limit": 2, "cursor": cursor}
+    assert seen == [e["id"] for e in created]
+
+    r = client.get("/events", params={"fields": "id,title", "limit": 1})
+    assert r.json() == [{"id": created[0]["id"], "title": "E0"}]
+
+
+def test_list_events_rejects_bad_fields_and_cursor(client):
+    assert client.get("/events", params={"fields": "password"}).json()["detail"]["code"] == "INVALID_FIELDS"
+    assert client.get("/events", params={"cursor": "???"}).json()["detail"]["code"] == "INVALID_CURSOR"
+
+
+def test_projection_formats_times_like_event_out():
+    from app.api.events import EVENT_FIELDS, EventOut, _project
+
+    for when in (datetime(2030, 1, 7, 9, 30), datetime(2030, 1, 7, 9, 30, 0, 120, tzinfo=timezone.utc)):
+        row = ("e1", "T", when, when + timedelta(hours=1), "GENERAL", None, when)
+        expected = EventOut(**dict(zip(EVENT_FIELDS, row))).model_dump(mode="json", by_alias=True)
+        assert _project([row], list(EVENT_FIELDS)) == [expected]
+        assert _project([row[2:4]], ["startAt", "endAt"]) == [{k: expected[k] for k in ("startAt", "endAt")}]
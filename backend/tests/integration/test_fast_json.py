@@ -0,0 +1,34 @@
+from datetime import datetime, timedelta, timezone
+
+from app.api import fast_json
+
+
+def _snapshot(client, task_id):
+    return (
+        client.get("/events").json(),
+        client.get("/calendars").json(),
+        [s["startAt"] for s in client.get("/slots/suggest", params={"taskId": task_id}).json()["slots"]],
+    )
+
+
+def test_fast_json_matches_pydantic_shape(client, monkeypatch):
+    start = datetime.now(timezone.utc) + timedelta(days=1)
+    for i in range(3):
+        r = client.post("/events", json={
+            "title": f"E{i}",
+            "startAt": (start + timedelta(hours=i)).isoformat(),
+            "endAt": (start + timedelta(hours=i, minutes=30)).isoformat(),
+            "description": "d" if i else None,
+        })
+        assert r.status_code == 201
+    task_id = client.post("/tasks", json={"title": "T", "estimatedMinutes": 30}).json()["id"]
+
+    monkeypatch.setattr(fast_json, "FAST_JSON_ENABLED", False)
+    slow = _snapshot(client, task_id)
+    monkeypatch.setattr(fast_json, "FAST_JSON_ENABLED", True)
+    fast = _snapshot(client, task_id)
+
+    assert len(slow[0]) == 3
+    assert fast[0] == slow[0]
+    assert fast[1] == slow[1]
+    assert fast[2] == slow[2]
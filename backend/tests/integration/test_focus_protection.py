@@ -147,4 +147,49 @@ def test_focus_protection_exact_boundaries(client):
     }
     
     before_response = client.post("/events", json=meeting_before)
-    assert before_response.status_code == 201  # Should be allowed
\ No newline at end of file
+    assert before_response.status_code == 201  # Should be allowed
+
+def test_focus_exclusion_constraint_violation_maps_to_409(client, monkeypatch):
+    """A write rejected by the PostgreSQL FOCUS exclusion constraint surfaces like the Python check."""
+    from sqlalchemy.exc import IntegrityError
+    from app.db.models import FOCUS_EXCLUSION_CONSTRAINT
+    from app.services.event_service import EventService
+
+    class PgError(Exception):
+        pgcode = "23P01"
+
+    def racing_insert(self, db, **kwargs):
+        raise IntegrityError("INSERT INTO events", {}, PgError(f'violates exclusion constraint "{FOCUS_EXCLUSION_CONSTRAINT}"'))
+
+    monkeypatch.setattr(EventService, "create_event", racing_insert)
+    start = datetime.now(timezone.utc) + timedelta(hours=3)
+    response = client.post("/events", json={
+        "title": "Sneaky meeting", "startAt": start.isoformat(),
+        "endAt": (start + timedelta(hours=1)).isoformat(), "type": "MEETING",
+    })
+    assert response.status_code == 409
+    assert response.json()["detail"]["code"] == "FOCUS_PROTECTED"
+
+
+def test_offset_datetimes_are_stored_as_utc(client):
+    """18:00+09:00 is 09:00Z: conflicts, listing and the stored columns all use that instant."""
+    focus = client.post("/events", json={
+        "title": "Deep", "type": "FOCUS",
+        "startAt": "2030-01-07T18:00:00+09:00", "endAt": "2030-01-07T19:00:00+09:00",
+    })
+    assert focus.status_code == 201, focus.text
+    assert focus.json()["startAt"].startswith("2030-01-07T09:00:00")
+
+    blocked = client.post("/events", json={
+        "title": "Sync", "type": "MEETING",
+        "startAt": "2030-01-07T09:00:00Z", "endAt": "2030-01-07T09:30:00Z",
+    })
+    assert blocked.status_code == 409
+    later = client.post("/events", json={
+        "title": "Evening", "type": "MEETING",
+        "startAt": "2030-01-07T18:00:00Z", "endAt": "2030-01-07T18:30:00Z",
+    })
+    assert later.status_code == 201, later.text
+
+    listed = client.get("/events", params={"from": "2030-01-07T08:30:00Z", "to": "2030-01-07T10:00:00Z"}).json()
+    assert [e["title"] for e in listed] == ["Deep"]
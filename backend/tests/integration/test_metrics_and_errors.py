@@ -1,4 +1,6 @@
+import pytest
 from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
 from app.main import app
 
 client = TestClient(app)
@@ -22,3 +24,61 @@ def test_commit_missing_draft_returns_400():
     assert r.status_code == 400
     data = r.json()
     assert data['detail']['code'] == 'NO_DRAFT'
+
+
+def test_latency_labels_use_route_templates_and_bucket_unknown_paths():
+    client.get('/events/some-event-id')
+    client.get('/definitely/not/a/route/xyz-123')
+    body = client.get('/metrics').text
+    assert 'path="/events/{event_id}"' in body
+    assert 'path="<unmatched>"' in body
+    assert 'xyz-123' not in body
+    assert 'some-event-id' not in body
+    # SLO bucket edges
+    assert 'le="0.3"' in body and 'le="0.5"' in body
+
+
+def test_latency_exemplar_carries_trace_id():
+    from opentelemetry.sdk.trace import TracerProvider
+    from app import observability
+
+    with TracerProvider().get_tracer("test").start_as_current_span("req") as span:
+        exemplar = observability.trace_exemplar()
+    assert exemplar == {"trace_id": format(span.get_span_context().trace_id, "032x")}
+    observability.REQUEST_LATENCY.labels(method="GET", path="/exemplar-test").observe(0.12, exemplar)
+    om = client.get('/metrics', headers={"Accept": "application/openmetrics-text"}).text
+    assert f'trace_id="{exemplar["trace_id"]}"' in om
+
+
+def test_request_and_response_bytes_and_in_flight_are_exported():
+    client.post('/nlp/parse-schedule', json={'input': '今日はコードレビュー'})
+    body = client.get('/metrics').text
+    assert 'schedule_concierge_request_bytes_total{method="POST",path="/nlp/parse-schedule"}' in body
+    assert 'schedule_concierge_response_bytes_total{method="POST",path="/nlp/parse-schedule"}' in body
+    assert 'schedule_concierge_requests_in_flight' in body
+
+
+def test_unknown_methods_share_one_label():
+    client.request('FOOBAR', '/healthz')
+    client.request('BAZQUX', '/healthz')
+    body = client.get('/metrics').text
+    assert 'FOOBAR' not in body and 'BAZQUX' not in body
+    assert 'method="OTHER",path="/healthz"' in body
+
+
+def test_failed_statements_do_not_skew_query_timing():
+    from app import observability
+
+    engine = create_engine("sqlite://")
+    stats = observability.QueryStats(keep_statements=True)
+    token = observability.current_query_stats.set(stats)
+    try:
+        with engine.connect() as conn:
+            with pytest.raises(Exception):
+                conn.execute(text("SELECT * FROM missing_table"))
+            conn.execute(text("SELECT 1"))
+            assert "query_started" not in conn.info
+    finally:
+        observability.current_query_stats.reset(token)
+    assert stats.count == 1
+    assert stats.statements[0][1] == "SELECT 1"
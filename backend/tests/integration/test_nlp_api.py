@@ -22,3 +22,45 @@ def test_nlp_parse_with_time_and_duration(client):
     assert d['title'] == '資料レビュー'
     assert d['estimatedMinutes'] == 90
     assert d['startAt'].startswith(tomorrow.isoformat()+"T10:00")
+
+
+def test_nlp_parse_batch_keeps_order_and_base_date(client):
+    inputs = ["明日午前10時に資料レビュー 90分", "今日は絵のラフを書きたい", "明日午前10時に資料レビュー 90分"]
+    r = client.post('/nlp/parse-schedule:batch', json={"inputs": inputs, "baseDate": "2026-03-02"})
+    assert r.status_code == 200, r.text
+    results = r.json()['results']
+    assert [x['draft']['title'] for x in results] == ['資料レビュー', '絵のラフ', '資料レビュー']
+    assert results[0]['draft']['startAt'].startswith("2026-03-03T10:00")
+    assert results[1]['draft']['date'] == "2026-03-02"
+    m = client.get('/metrics').text
+    assert 'schedule_concierge_nlp_parse_cache_total{result="hit"}' in m
+    assert 'schedule_concierge_nlp_parse_batch_size_bucket' in m
+
+
+def test_nlp_parse_batch_validation(client):
+    r = client.post('/nlp/parse-schedule:batch', json={"inputs": "not-a-list"})
+    assert r.status_code == 400
+    assert r.json()['detail']['code'] == 'INVALID_INPUTS'
+    r = client.post('/nlp/parse-schedule:batch', json={"inputs": ["x"], "baseDate": "03/02"})
+    assert r.json()['detail']['code'] == 'INVALID_BASE_DATE'
+
+
+def test_nlp_parse_batch_reports_bad_inputs_per_item(client):
+    r = client.post('/nlp/parse-schedule:batch', json={"inputs": ["明日10時に会議", "明日25時に会議"]})
+    assert r.status_code == 200, r.text
+    ok, bad = r.json()['results']
+    assert ok['draft']['title'] == '会議' and 'error' not in ok
+    assert bad['intents'] == [] and bad['draft'] is None
+    assert bad['error']['code'] == 'PARSE_FAILED'
+    r = client.post('/nlp/parse-schedule', json={"input": "明日25時に会議"})
+    assert r.status_code == 400
+    assert r.json()['detail']['code'] == 'PARSE_FAILED'
+
+
+def test_nlp_parse_english_locale(client):
+    r = client.post('/nlp/parse-schedule', json={"input": "tomorrow at 3pm review the deck for 30 min", "locale": "en-US"})
+    assert r.status_code == 200, r.text
+    d = r.json()['draft']
+    assert d['title'] == 'review the deck'
+    assert d['estimatedMinutes'] == 30
+    assert d['startAt'].startswith((date.today() + timedelta(days=1)).isoformat() + "T15:00")
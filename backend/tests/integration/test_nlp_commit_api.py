@@ -22,3 +22,26 @@ def test_nlp_commit_creates_task_and_slots(client, tmp_path):
     first = slots[0]
     for key in ['startAt', 'endAt', 'score']:
         assert key in first
+
+
+def test_nlp_commit_batch_creates_tasks_with_non_overlapping_top_slots(client):
+    drafts = [
+        {'title': f'タスク{i}', 'estimatedMinutes': 60, 'date': None, 'energyTag': None}
+        for i in range(6)
+    ]
+    r = client.post('/nlp/commit:batch', json={'drafts': drafts})
+    assert r.status_code == 201, r.text
+    results = r.json()['results']
+    assert [x['task']['title'] for x in results] == [d['title'] for d in drafts]
+    assert len({x['task']['id'] for x in results}) == 6
+    tops = [(x['slots'][0]['startAt'], x['slots'][0]['endAt']) for x in results if x['slots']]
+    assert len(tops) == 6
+    for i, (s1, e1) in enumerate(tops):
+        for s2, e2 in tops[i + 1:]:
+            assert not (s1 < e2 and s2 < e1), (s1, e1, s2, e2)
+
+
+def test_nlp_commit_batch_requires_drafts(client):
+    r = client.post('/nlp/commit:batch', json={'drafts': []})
+    assert r.status_code == 400
+    assert r.json()['detail']['code'] == 'NO_DRAFT'
@@ -17,3 +17,44 @@ def test_slots_task_not_found(client):
     assert r.status_code == 404
     body = r.json()
     assert body['detail']['code'] == 'TASK_NOT_FOUND'
+
+
+def test_suggest_slots_searches_up_to_a_far_out_due_date(client):
+    from datetime import datetime, timedelta, timezone
+    due = datetime.now(timezone.utc) + timedelta(days=60)
+    r = client.post('/tasks', json={"title": "Quarterly report", "priority": 3, "estimatedMinutes": 60,
+                                    "dueAt": due.isoformat()})
+    assert r.status_code == 201, r.text
+    task_id = r.json()['id']
+    slots = client.get('/slots/suggest', params={'taskId': task_id}).json()['slots']
+    # urgency peaks just before the due date, two months out
+    first = datetime.fromisoformat(slots[0]['startAt'])
+    assert due - timedelta(days=4) < first < due
+    short = client.get('/slots/suggest', params={'taskId': task_id, 'horizonDays': 7}).json()['slots']
+    assert datetime.fromisoformat(short[0]['startAt']) < datetime.now(timezone.utc) + timedelta(days=8)
+
+
+def test_suggest_serves_precomputed_candidates_until_a_write(client):
+    from datetime import datetime, timedelta, timezone
+    from app.services.slot_candidate_service import wait_for_refreshes
+    task_id = client.post('/tasks', json={"title": "Plan", "priority": 2, "estimatedMinutes": 60}).json()['id']
+    computed = client.get('/slots/suggest', params={'taskId': task_id}).json()
+    assert computed['version'] is None  # first read computes, then stores the set
+    wait_for_refreshes()
+    stored = client.get('/slots/suggest', params={'taskId': task_id}).json()
+    assert stored['version'] == 1
+    assert stored['slots'] == computed['slots']
+    top = client.get('/slots/suggest', params={'taskId': task_id, 'limit': 2}).json()
+    assert top['slots'] == computed['slots'][:2]
+
+    # an event over a suggested (future) slot invalidates the set; the next read recomputes it
+    now = datetime.now(timezone.utc)
+    taken = next(s['startAt'] for s in computed['slots'] if datetime.fromisoformat(s['startAt']) > now)
+    busy = datetime.fromisoformat(taken)
+    r = client.post('/events', json={"title": "Busy", "startAt": busy.isoformat(),
+                                     "endAt": (busy + timedelta(hours=1)).isoformat(), "type": "MEETING"})
+    assert r.status_code == 201, r.text
+    wait_for_refreshes()
+    after = client.get('/slots/suggest', params={'taskId': task_id}).json()
+    assert after['version'] > stored['version']
+    assert taken not in [s['startAt'] for s in after['slots']]
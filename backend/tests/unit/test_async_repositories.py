@@ -0,0 +1,72 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.db import models
+from app.db.session import SessionLocal, AsyncSessionLocal, _to_async_url
+from app.domain.spans import EventSpan
+from app.repositories.event_repository import AsyncSqlAlchemyEventRepository, SqlAlchemyEventRepository
+from app.services.nlp_commit_service import load_selected_events
+from app.services.conflict_service import AsyncConflictService, ConflictDetected
+
+
+def test_to_async_url_maps_drivers():
+    assert _to_async_url("sqlite+pysqlite:///./local.db") == "sqlite+aiosqlite:///./local.db"
+    assert _to_async_url("postgresql+psycopg2://u:p@h/db") == "postgresql+asyncpg://u:p@h/db"
+    assert _to_async_url("postgresql://u:p@h/db") == "postgresql+asyncpg://u:p@h/db"
+
+
+def _seed(start):
+    db = SessionLocal()
+    db.add(models.User(id="u-async", email="async@example.com"))
+    db.add(models.Calendar(id="c-on", user_id="u-async", name="on", selected=1))
+    db.add(models.Calendar(id="c-off", user_id="u-async", name="off", selected=0))
+    db.add(models.Event(id="focus", calendar_id="c-on", user_id="u-async", title="Deep",
+                        start_at=start, end_at=start + timedelta(hours=2), type="FOCUS"))
+    db.add(models.Event(id="hidden", calendar_id="c-off", user_id="u-async", title="Hidden",
+                        start_at=start, end_at=start + timedelta(hours=2), type="GENERAL"))
+    db.commit()
+    db.close()
+
+
+async def test_async_repository_and_conflict_check(client):
+    start = datetime.now(timezone.utc) + timedelta(hours=1)
+    _seed(start)
+    repo = AsyncSqlAlchemyEventRepository()
+    async with AsyncSessionLocal() as db:
+        overlapping = await repo.find_overlapping(db, "u-async", start, start + timedelta(minutes=30))
+        assert [e.id for e in overlapping] == ["focus"]
+
+        meeting = models.Event(user_id="u-async", title="Meeting", type="MEETING",
+                               start_at=start + timedelta(minutes=30), end_at=start + timedelta(hours=1))
+        with pytest.raises(ConflictDetected):
+            await AsyncConflictService().validate_event_creation(db, meeting)
+        await AsyncConflictService().validate_event_creation(db, meeting, allow_focus_override=True)
+
+
+async def test_future_spans_are_epoch_tuples_from_selected_calendars(client):
+    start = datetime.now(timezone.utc).replace(microsecond=0) + timedelta(hours=1)
+    _seed(start)
+    end_window = start + timedelta(days=1)
+
+    db = SessionLocal()
+    try:
+        spans = SqlAlchemyEventRepository().find_future_spans(db, "u-async", start - timedelta(minutes=1), end_window)
+        assert spans == [EventSpan(int(start.timestamp()), int(start.timestamp()) + 7200, "FOCUS", "focus")]
+        assert spans[0].start_at == start and spans[0].end_at.tzinfo is timezone.utc
+        assert SqlAlchemyEventRepository().find_future_spans(
+            db, "u-async", start - timedelta(minutes=1), end_window, exclude_event_id="focus") == []
+        assert load_selected_events(db, "u-async") == spans
+    finally:
+        db.close()
+
+    async with AsyncSessionLocal() as adb:
+        assert await AsyncSqlAlchemyEventRepository().find_future_spans(
+            adb, "u-async", start - timedelta(minutes=1), end_window) == spans
+
+
+def test_epoch_shadow_columns_follow_start_and_end():
+    event = models.Event(start_at=datetime(2030, 1, 7, 9, 0, 0, 500000), end_at=datetime(2030, 1, 7, 10, tzinfo=timezone.utc))
+    assert (event.start_ts, event.end_ts) == (1894006800, 1894010400)  # naive = UTC, sub-second truncated
+    event.end_at = datetime(2030, 1, 7, 19, tzinfo=timezone(timedelta(hours=9)))
+    assert event.end_ts == 1894010400
@@ -0,0 +1,20 @@
+from benchmarks.bench_recommendation import compare
+from benchmarks.workload import WorkloadSpec, generate
+
+
+def test_generate_is_deterministic_and_honours_spec():
+    spec = WorkloadSpec(days=10, events_per_day=5, focus_ratio=0.5, task_durations=(45,), tasks=8, seed=7)
+    a, b = generate(spec), generate(spec)
+    assert [(e.start_at, e.end_at, e.type) for e in a.events] == [(e.start_at, e.end_at, e.type) for e in b.events]
+    assert len(a.events) == 50
+    assert 15 <= sum(e.type == "FOCUS" for e in a.events) <= 35
+    assert all(a.start <= e.start_at < a.start.replace(day=a.start.day + 10) for e in a.events)
+    assert len(a.tasks) == 8 and {t.estimated_minutes for t in a.tasks} == {45}
+    # 10 days from a Monday: two full weeks of weekdays minus the second weekend's tail
+    assert len(a.availability()) == 8
+
+
+def test_compare_flags_only_slowdowns_beyond_tolerance():
+    baseline = {"a": {"median_us": 100.0}, "b": {"median_us": 100.0}}
+    results = {"a": {"median_us": 125.0}, "b": {"median_us": 135.0}, "new": {"median_us": 1.0}}
+    assert compare(results, baseline, tolerance=0.3) == ["b"]
@@ -0,0 +1,62 @@
+import pytest
+
+from app.services import collection_versions
+from app.services.collection_versions import (
+    DisabledVersionStore,
+    MemoryVersionStore,
+    RedisVersionStore,
+    bump_for_writes,
+    collection_etag,
+)
+
+
+class FlakyRedis:
+    def __init__(self):
+        self.data = {}
+        self.down = False
+
+    def incr(self, key):
+        if self.down:
+            raise ConnectionError("redis down")
+        self.data[key] = self.data.get(key, 0) + 1
+
+    def mget(self, keys):
+        if self.down:
+            raise ConnectionError("redis down")
+        return [self.data.get(k) for k in keys]
+
+
+@pytest.fixture
+def store(monkeypatch):
+    def use(s):
+        monkeypatch.setattr(collection_versions, "_store", s)
+        return s
+    return use
+
+
+def test_failed_redis_bump_fails_open_until_retried(store):
+    redis = FlakyRedis()
+    store(RedisVersionStore(redis))
+    before = collection_etag("u1", ["events"])
+
+    redis.down = True
+    bump_for_writes([("u1", "events")])  # swallowed; the commit must not fail
+    with pytest.raises(ConnectionError):
+        collection_etag("u1", ["events"])  # -> etag_for returns None, no 304
+
+    redis.down = False
+    after = collection_etag("u1", ["events"])  # pending bump is applied first
+    assert after != before
+    assert redis.data == {"sc:ver:u1:events": 1}
+
+
+def test_memory_store_only_for_a_single_worker(store, monkeypatch):
+    store(None)
+    monkeypatch.setenv("WEB_CONCURRENCY", "4")
+    assert isinstance(collection_versions.get_version_store(), DisabledVersionStore)
+    with pytest.raises(RuntimeError):
+        collection_etag("u1", ["events"])
+
+    store(None)
+    monkeypatch.delenv("WEB_CONCURRENCY")
+    assert isinstance(collection_versions.get_version_store(), MemoryVersionStore)
@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from app.services.common_slot_service import common_slots, workday_windows
+
+
+def at(h, m=0, day=0):
+    return datetime(2030, 1, 7 + day, h, m, tzinfo=timezone.utc)  # Monday
+
+
+def busy(user, start, end, type="MEETING"):
+    return SimpleNamespace(user_id=user, start_at=start, end_at=end, type=type)
+
+
+def test_workday_windows_skip_weekends_and_clip():
+    windows = workday_windows(at(10, 30), at(12, day=7))
+    assert windows[0] == {"start": at(10, 30), "end": at(17)}
+    assert len(windows) == 6  # Mon-Fri plus the next Monday morning
+    assert windows[-1] == {"start": at(9, day=7), "end": at(12, day=7)}
+
+
+def test_common_slots_avoid_every_participants_busy_time():
+    rows = [
+        busy("a", at(9), at(12)),
+        busy("b", at(12, 30), at(15)),
+        busy("c", at(15, 30), at(16, 10)),  # off-grid end blocks the 16:00 cell
+    ]
+    slots = common_slots(rows, ["a", "b", "c"], [{"start": at(9), "end": at(17)}], 30, limit=20)
+    starts = sorted(s["startAt"] for s in slots)
+    assert starts == [at(12).isoformat(), at(15).isoformat(), at(16, 15).isoformat(), at(16, 30).isoformat()]
+
+
+def test_common_slots_focus_soft_vs_hard():
+    rows = [busy("a", at(9), at(16)), busy("b", at(16), at(17), "FOCUS")]
+    window = [{"start": at(9), "end": at(17)}]
+    assert common_slots(rows, ["a", "b"], window, 60, focus="hard") == []
+    soft = common_slots(rows, ["a", "b"], window, 60, focus="soft")
+    assert [s["startAt"] for s in soft] == [at(16).isoformat()]
+    assert soft[0]["focusConflicts"] == ["b"]
+    free = common_slots([busy("a", at(9), at(16))], ["a", "b"], window, 60)
+    assert soft[0]["score"] < free[0]["score"]
+
+
+def test_common_slots_scale_to_fifty_participants_over_two_weeks():
+    import random
+    rng = random.Random(1)
+    users = [f"u{i}" for i in range(50)]
+    rows = []
+    for u in users:
+        for _ in range(40):
+            start = at(rng.randrange(8, 18), rng.choice([0, 15, 30, 45]), day=rng.randrange(14))
+            rows.append(busy(u, start, start + timedelta(minutes=rng.choice([30, 60])), rng.choice(["MEETING", "FOCUS"])))
+    windows = workday_windows(at(0), at(0, day=14))
+    slots = common_slots(rows, users, windows, 30, focus="soft")
+    for s in slots:
+        s_start, s_end = datetime.fromisoformat(s["startAt"]), datetime.fromisoformat(s["endAt"])
+        assert not any(r.type != "FOCUS" and r.start_at < s_end and s_start < r.end_at for r in rows)
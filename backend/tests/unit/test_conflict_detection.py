@@ -38,6 +38,9 @@ class FakeEventRepository:
                 result.append(e)
         return result
 
+    def find_future_spans(self, db, user_id: str, now: datetime, end_window: datetime, exclude_event_id: str | None = None):
+        return self.find_future_events(db, user_id, now, end_window, exclude_event_id)
+
 def test_detect_conflict_with_overlapping_events():
     """Test that overlapping events are detected as conflicts"""
     repo = FakeEventRepository()
@@ -195,4 +198,33 @@ def test_conflict_severity_scoring():
     assert "meeting_conflicts" in analysis
     
     # FOCUS conflicts should be flagged as high severity
-    assert analysis["focus_conflicts"] > 0
\ No newline at end of file
+    assert analysis["focus_conflicts"] > 0
+
+def test_suggest_resolutions_share_one_timeline():
+    """Batch resolution keeps the most protected event and never hands out the same slot twice"""
+    repo = FakeEventRepository()
+    service = ConflictService(repository=repo)
+    start = (datetime.now(timezone.utc) + timedelta(days=1)).replace(hour=10, minute=0, second=0, microsecond=0)
+
+    def at(event_id, event_type):
+        return Event(id=event_id, title=event_id, start_at=start, end_at=start + timedelta(hours=1),
+                     type=event_type, user_id="demo-user")
+
+    imported = [at("general", "GENERAL"), at("meeting", "MEETING"), at("focus", "FOCUS"), at("other", "GENERAL")]
+    for event in imported:
+        repo.add("demo-user", event)
+
+    results = service.suggest_resolutions(None, imported, limit=3)
+    assert [r["eventId"] for r in results] == ["general", "meeting", "focus", "other"]
+    actions = {r["eventId"]: r["action"] for r in results}
+    assert actions == {"focus": "keep", "meeting": "move", "general": "move", "other": "move"}
+
+    picks = [(r["slots"][0]["startAt"], r["slots"][0]["endAt"]) for r in results if r["action"] == "move"]
+    intervals = sorted((datetime.fromisoformat(s), datetime.fromisoformat(e)) for s, e in picks)
+    assert all(a_end <= b_start for (_, a_end), (b_start, _) in zip(intervals, intervals[1:]))
+    for s, e in intervals:  # and clear of the FOCUS block that stayed
+        assert e <= start or s >= start + timedelta(hours=1)
+
+    # one-at-a-time suggestions all point at the same free slot
+    singles = {service.suggest_resolution(None, e, limit=1)[0]["startAt"] for e in imported[:2]}
+    assert len(singles) == 1
@@ -0,0 +1,28 @@
+from datetime import datetime, timezone
+
+from sqlalchemy import create_engine
+
+from app.db import session
+
+
+def test_dev_database_gets_backfilled_epoch_columns(tmp_path, monkeypatch):
+    # events table as created by create_all before start_ts / end_ts existed
+    old = create_engine(f"sqlite+pysqlite:///{tmp_path / 'old.db'}")
+    with old.begin() as conn:
+        conn.exec_driver_sql(
+            "CREATE TABLE events (id VARCHAR PRIMARY KEY, user_id VARCHAR, "
+            "start_at DATETIME NOT NULL, end_at DATETIME NOT NULL)"
+        )
+        conn.exec_driver_sql(
+            "INSERT INTO events VALUES ('e1', 'u1', '2026-11-01 10:00:00.000000', '2026-11-01 11:00:00.000000')"
+        )
+    monkeypatch.setattr(session, "engine", old)
+
+    session.ensure_event_epoch_columns()
+    session.ensure_event_epoch_columns()  # no-op once the columns exist
+
+    start = int(datetime(2026, 11, 1, 10, tzinfo=timezone.utc).timestamp())
+    with old.connect() as conn:
+        assert tuple(conn.exec_driver_sql("SELECT start_ts, end_ts FROM events").one()) == (start, start + 3600)
+        indexes = {r[1] for r in conn.exec_driver_sql("PRAGMA index_list(events)")}
+    assert {"ix_events_user_start_id", "ix_events_user_start_ts"} <= indexes
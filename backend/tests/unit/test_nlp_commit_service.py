@@ -0,0 +1,72 @@
+from sqlalchemy import event
+
+from app.db.session import SessionLocal, engine, Base
+from app.db import models
+from app.services import nlp_commit_service
+
+
+def test_commit_drafts_uses_constant_number_of_queries():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        db.add(models.User(id="bulk-user", email="bulk@example.com"))
+        db.commit()
+        statements = []
+
+        def _count(conn, cursor, statement, parameters, context, executemany):
+            statements.append(statement)
+
+        event.listen(engine, "before_cursor_execute", _count)
+        try:
+            results = nlp_commit_service.commit_drafts(
+                db, "bulk-user", [{"title": f"t{i}", "estimatedMinutes": 30} for i in range(40)]
+            )
+        finally:
+            event.remove(engine, "before_cursor_execute", _count)
+        assert len(results) == 40
+        assert db.query(models.Task).filter(models.Task.user_id == "bulk-user").count() == 40
+        # insert (batched) + reload + selected events, independent of the draft count
+        assert len(statements) <= 6, statements
+    finally:
+        db.close()
+
+
+def test_occupancy_timeline_merges_and_detects_overlap():
+    from datetime import datetime, timezone
+    from app.services.recommendation_service import OccupancyTimeline
+
+    def at(h, m=0):
+        return datetime(2026, 3, 2, h, m, tzinfo=timezone.utc)
+
+    tl = OccupancyTimeline()
+    tl.add(at(9), at(10))
+    tl.add(at(11), at(12))
+    tl.add(at(9, 30), at(11, 15))  # bridges both
+    assert len(tl) == 1
+    assert tl.overlaps(at(11, 0), at(11, 30))
+    assert not tl.overlaps(at(12), at(13))
+    assert not tl.overlaps(at(8), at(9))
+    tl.add(datetime(2026, 3, 2, 14), datetime(2026, 3, 2, 15))  # naive treated as UTC
+    assert tl.overlaps(at(14, 30), at(16))
+
+
+def test_plan_slots_never_offers_another_tasks_pick():
+    from datetime import datetime, timedelta, timezone
+    from app.services.nlp_commit_service import TaskSnapshot, plan_slots
+
+    day = (datetime.now(timezone.utc) + timedelta(days=1)).replace(hour=9, minute=0, second=0, microsecond=0)
+    availability = [{"start": day, "end": day + timedelta(hours=4)}]
+    tasks = [TaskSnapshot(f"t{i}", 3, None, 60, None) for i in range(3)]
+    planned = plan_slots(tasks, [], availability)
+
+    def span(slot):
+        return datetime.fromisoformat(slot["startAt"]), datetime.fromisoformat(slot["endAt"])
+
+    picks = [span(slots[0]) for slots in planned]
+    for i, slots in enumerate(planned):
+        assert len(slots) >= 1
+        for slot in slots:
+            start, end = span(slot)
+            others = picks[:i] + picks[i + 1:]
+            assert all(end <= s or start >= e for s, e in others), (i, slot)
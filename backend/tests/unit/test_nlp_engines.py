@@ -0,0 +1,81 @@
+import random
+from datetime import date
+
+import pytest
+
+from app.services.nlp_service import (
+    ENGLISH_RULES, EngineRegistry, JapaneseEngine, KeywordMatcher, NLPScheduleParser, Rule, RuleTable,
+    RuleTableEngine, load_rules,
+)
+
+BASE = date(2026, 10, 19)
+
+
+def _naive_leftmost_longest(text, phrases):
+    out, pos = [], 0
+    while pos < len(text):
+        hit = max((p for p in phrases if text.startswith(p, pos)), key=len, default=None)
+        if hit:
+            out.append((pos, pos + len(hit), hit))
+            pos += len(hit)
+        else:
+            pos += 1
+    return out
+
+
+def test_keyword_matcher_matches_naive_scan_with_many_phrases():
+    rng = random.Random(42)
+    phrases = sorted({"".join(rng.choice("abcde") for _ in range(rng.randint(1, 6))) for _ in range(3000)})
+    matcher = KeywordMatcher((p, p) for p in phrases)
+    for _ in range(200):
+        text = "".join(rng.choice("abcdef") for _ in range(rng.randint(0, 40)))
+        assert matcher.finditer(text) == _naive_leftmost_longest(text, phrases), text
+
+
+def test_keyword_matcher_case_and_word_boundaries():
+    matcher = KeywordMatcher([("am", "am"), ("deep work", "deep")], ignore_case=True, word_boundaries=True)
+    assert [m[2] for m in matcher.finditer("Team DEEP WORK at 9AM")] == ["deep", "am"]
+
+
+@pytest.mark.parametrize("text,expected", [
+    ("Tomorrow at 3pm review the deck for 30 minutes",
+     {"title": "review the deck", "date": "2026-10-20", "startAt": "2026-10-20T15:00:00+00:00", "estimatedMinutes": 30, "energyTag": "afternoon"}),
+    ("standup 9:30am", {"title": "standup", "date": "2026-10-19", "startAt": "2026-10-19T09:30:00+00:00", "estimatedMinutes": 60, "energyTag": "morning"}),
+    ("I want to draft the spec 2h focus", {"title": "draft the spec focus", "date": "2026-10-19", "startAt": "2026-10-19T09:00:00+00:00", "estimatedMinutes": 120, "energyTag": "deep"}),
+    ("pay rent", {"title": "pay rent", "date": "2026-10-19", "startAt": "2026-10-19T09:00:00+00:00", "estimatedMinutes": 60, "energyTag": None}),
+])
+def test_english_engine(text, expected):
+    engine = RuleTableEngine(RuleTable("en", ENGLISH_RULES))
+    assert engine.parse(text, base_date=BASE)["draft"] == expected
+
+
+def test_registry_routes_by_locale_and_script():
+    registry = EngineRegistry()
+    assert registry.resolve_language("明日 資料", "en-US") == "ja"
+    assert registry.resolve_language("review deck", "en-US") == "en"
+    assert registry.resolve_language("review deck", "fr-FR") == "ja"  # default language
+    assert registry.resolve_language("review deck", None) == "ja"
+
+
+def test_japanese_output_unchanged_by_english_rules():
+    registry = EngineRegistry({"en": [Rule(f"phrase{i}", "noise") for i in range(5000)]})
+    text = "明日午前10時に資料レビューをしたい 90分"
+    assert registry.get("ja").parse(text, BASE) == NLPScheduleParser.parse(text, base_date=BASE)
+
+
+def test_user_rules_per_locale():
+    registry = EngineRegistry(load_rules({
+        "en-US": [{"phrase": "standup", "kind": "energy", "value": "morning"}],
+        "ja": [{"phrase": "来週", "kind": "day", "value": 7}, {"phrase": "ジムで", "kind": "noise"}],
+    }))
+    assert registry.get("en").parse("standup 8am", BASE)["draft"]["energyTag"] == "morning"
+    draft = registry.get("ja").parse("来週ジムで筋トレ 30分", BASE)["draft"]
+    assert draft["date"] == "2026-10-26"
+    assert draft["startAt"].startswith("2026-10-26T09:00")
+    assert draft["title"] == "筋トレ"
+    assert isinstance(registry.get("ja"), JapaneseEngine)
+
+
+def test_load_rules_rejects_unknown_kind():
+    with pytest.raises(ValueError):
+        load_rules({"en": [{"phrase": "x", "kind": "weather"}]})
@@ -0,0 +1,111 @@
+import random
+import re
+from datetime import date, datetime, time, timedelta, timezone
+
+import pytest
+
+from app.services.nlp_service import NLPScheduleParser
+
+BASE = date(2026, 10, 19)
+
+# Fragments that exercise every rule plus the characters that can join across removed noise.
+ALPHABET = [
+    "明日", "明後日", "今日は", "午前", "午後", "時", "分", "間", "朝", "昼", "集中", "深く", "ディープ",
+    "書きたい", "したい", "書き", "た", "い", "し", "明", "後", "日", "午", "前", "今", "は",
+    "0", "1", "2", "3", "5", "9", "に", "を", "へ", "で", "の", " ", "　", "。", "、", "資料", "レビュー",
+]
+
+# --- reference oracle: the original multi-pass parser (one regex per rule) ---
+
+_TIME_HM_RE = re.compile(r"(午前|午後)?(\d{1,2})時(\d{1,2})分?")
+_TIME_H_RE = re.compile(r"(午前|午後)?(\d{1,2})時")
+_MINUTES_RE = re.compile(r"(\d{1,3})分")
+_HOURS_RE = re.compile(r"(\d{1,2})時間")
+_ENERGY_RULES = [
+    (re.compile(r"集中|深く|ディープ|集中して"), "deep"),
+    (re.compile(r"朝|午前"), "morning"),
+    (re.compile(r"午後|昼"), "afternoon"),
+]
+
+
+def _parse_sequential(text, today):
+    target_date = today
+    if "明日" in text:
+        target_date = today + timedelta(days=1)
+    elif "明後日" in text:
+        target_date = today + timedelta(days=2)
+
+    hour, minute = 9, 0
+    tm = _TIME_HM_RE.search(text)
+    if tm:
+        hour = NLPScheduleParser._to_24h(tm.group(1), int(tm.group(2)))
+        minute = int(tm.group(3))
+    else:
+        m = _TIME_H_RE.search(text)
+        if m:
+            hour = NLPScheduleParser._to_24h(m.group(1), int(m.group(2)))
+
+    duration = 60
+    consumed = tm.end() if tm else 0
+    dm = next((c for c in _MINUTES_RE.finditer(text) if c.start() >= consumed), None)
+    hm = _HOURS_RE.search(text)
+    if hm:
+        duration = int(hm.group(1)) * 60
+    elif dm:
+        duration = min(480, int(dm.group(1)))
+
+    start_dt = datetime.combine(target_date, time(hour=hour, minute=minute, tzinfo=timezone.utc))
+    title = NLPScheduleParser._clean_title(NLPScheduleParser._strip_noise_sequential(text))
+    energy_tag = None
+    for pattern, tag in _ENERGY_RULES:
+        if pattern.search(text):
+            if tag == "deep" or (tag == "morning" and hour < 11) or (tag == "afternoon" and 11 <= hour <= 18):
+                energy_tag = tag
+                break
+    return NLPScheduleParser._result(title, target_date, start_dt, duration, energy_tag)
+
+
+def _outcome(fn, text):
+    try:
+        return fn(text)
+    except Exception as e:  # invalid hours/minutes must fail the same way
+        return type(e)
+
+
+@pytest.mark.parametrize("text,title,start,minutes", [
+    ("明日午前10時に資料レビューをしたい 90分", "資料レビュー", "2026-10-20T10:00:00+00:00", 90),
+    ("午後3時15分 UI改善 45分", "UI改善", "2026-10-19T15:15:00+00:00", 45),
+    ("明後日9時5 ミーティング", "5 ミーティング", "2026-10-21T09:05:00+00:00", 60),
+    ("3時150分 調査", "調査", "2026-10-19T03:15:00+00:00", 60),
+    ("3時12時間 作業", "間 作業", "2026-10-19T03:12:00+00:00", 720),
+])
+def test_lexer_expected_drafts(text, title, start, minutes):
+    draft = NLPScheduleParser.parse(text, base_date=BASE)["draft"]
+    assert (draft["title"], draft["startAt"], draft["estimatedMinutes"]) == (title, start, minutes)
+
+
+@pytest.mark.parametrize("text", [
+    "明日午前10時に資料レビューをしたい 90分",
+    "午後3時15分 UI改善 45分",
+    "2時間 集中して設計を書きたい",
+    "今日は午後12時 レビュー",
+    "朝 ランニング 30分",
+    "1午前2時 調査",
+    "明後日9時5 ミーティング",
+    "3時150分 調査",
+    "25時 夜更かし",
+])
+def test_lexer_matches_sequential_reference(text):
+    assert _outcome(lambda t: NLPScheduleParser.parse(t, base_date=BASE), text) == \
+        _outcome(lambda t: _parse_sequential(t.strip(), BASE), text)
+
+
+def test_lexer_matches_sequential_reference_fuzz():
+    rng = random.Random(1234)
+    for _ in range(5000):
+        text = "".join(rng.choice(ALPHABET) for _ in range(rng.randint(1, 12)))
+        if not text.strip():
+            continue
+        lexed = _outcome(lambda t: NLPScheduleParser.parse(t, base_date=BASE), text)
+        reference = _outcome(lambda t: _parse_sequential(t.strip(), BASE), text)
+        assert lexed == reference, text
@@ -0,0 +1,29 @@
+from datetime import date
+
+from app.services.nlp_service import ParseCache, NLPScheduleParser
+
+
+def test_parse_cache_hits_on_normalized_text_and_matches_parser():
+    cache = ParseCache(maxsize=8)
+    base = date(2026, 3, 2)
+    first, hit1 = cache.get_or_parse("明日午前10時に資料レビュー 90分", base)
+    second, hit2 = cache.get_or_parse("  明日午前10時に資料レビュー 90分 ", base)
+    assert (hit1, hit2) == (False, True)
+    assert first == second == NLPScheduleParser.parse("明日午前10時に資料レビュー 90分", base_date=base)
+    # returned results are copies
+    second['draft']['title'] = 'changed'
+    assert cache.get_or_parse("明日午前10時に資料レビュー 90分", base)[0]['draft']['title'] == '資料レビュー'
+    # base_date is part of the key
+    assert cache.get_or_parse("明日午前10時に資料レビュー 90分", date(2026, 3, 3))[1] is False
+
+
+def test_parse_cache_evicts_least_recently_used():
+    cache = ParseCache(maxsize=2)
+    base = date(2026, 3, 2)
+    cache.get_or_parse("a", base)
+    cache.get_or_parse("b", base)
+    cache.get_or_parse("a", base)
+    cache.get_or_parse("c", base)  # evicts "b"
+    assert len(cache) == 2
+    assert cache.get_or_parse("a", base)[1] is True
+    assert cache.get_or_parse("b", base)[1] is False
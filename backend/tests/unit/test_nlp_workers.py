@@ -0,0 +1,47 @@
+import asyncio
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from app.errors import ServiceUnavailableError
+from app.services import nlp_workers
+from app.services.nlp_commit_service import TaskSnapshot, EventSnapshot, plan_slots
+from app.services.nlp_service import NLPScheduleParser
+
+
+async def test_saturated_pool_rejects_with_busy(monkeypatch):
+    monkeypatch.setattr(nlp_workers, "NLP_MAX_CONCURRENCY", 1)
+    monkeypatch.setattr(nlp_workers, "NLP_QUEUE_TIMEOUT_SECONDS", 0.05)
+    monkeypatch.setattr(nlp_workers, "_sem", None)
+    release = asyncio.Event()
+
+    async def hold():
+        async with nlp_workers._slot():
+            await release.wait()
+
+    holder = asyncio.create_task(hold())
+    await asyncio.sleep(0)
+    with pytest.raises(ServiceUnavailableError) as exc:
+        await nlp_workers.run(lambda: None)
+    assert exc.value.code == "NLP_BUSY"
+    release.set()
+    await holder
+    assert await nlp_workers.run(lambda: 42) == 42
+
+
+async def test_process_mode_matches_thread_mode(monkeypatch):
+    monkeypatch.setattr(nlp_workers, "NLP_WORKER_MODE", "process")
+    monkeypatch.setattr(nlp_workers, "NLP_PROCESS_WORKERS", 1)
+    try:
+        base = date(2026, 3, 2)
+        text = "午後3時15分 UI改善 45分 (process)"
+        parsed = await nlp_workers.parse_many([text], base)
+        assert parsed[0][0] == NLPScheduleParser.parse(text, base_date=base)
+
+        start = datetime(2026, 3, 2, 9, tzinfo=timezone.utc)
+        tasks = [TaskSnapshot(f"t{i}", 3, None, 60, None) for i in range(3)]
+        events = [EventSnapshot(start, start + timedelta(hours=1), "FOCUS")]
+        availability = [{"start": start, "end": start.replace(hour=17)}]
+        assert nlp_workers.slot_planner()(tasks, events, availability) == plan_slots(tasks, events, availability)
+    finally:
+        nlp_workers.shutdown()
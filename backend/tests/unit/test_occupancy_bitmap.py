@@ -0,0 +1,64 @@
+import random
+import sys
+from datetime import date, datetime, timedelta, timezone
+from types import SimpleNamespace
+
+from app.services.recommendation_service import OccupancyBitmap, OccupancyTimeline
+
+
+def at(day, h, m=0):
+    return datetime(2026, 3, 2 + day, h, m, tzinfo=timezone.utc)
+
+
+def test_bitmap_matches_interval_timeline_including_off_grid_events():
+    rng = random.Random(3)
+    events = []
+    for _ in range(60):
+        start = at(rng.randrange(7), rng.randrange(24), rng.randrange(60))
+        events.append(SimpleNamespace(start_at=start, end_at=start + timedelta(minutes=rng.randrange(5, 180)),
+                                      type=rng.choice(["FOCUS", "MEETING", "BUFFER"])))
+    bitmap = OccupancyBitmap(events)
+    busy = OccupancyTimeline(events)
+    focus = OccupancyTimeline([e for e in events if e.type == "FOCUS"])
+    for _ in range(3000):
+        start = at(rng.randrange(-1, 8), rng.randrange(24), rng.choice([0, 15, 30, 45, rng.randrange(60)]))
+        end = start + timedelta(minutes=rng.choice([15, 30, 60, 90, rng.randrange(1, 240)]))
+        assert bitmap.overlaps(start, end) == busy.overlaps(start, end), (start, end)
+        assert bitmap.focus_overlaps(start, end) == focus.overlaps(start, end), (start, end)
+
+
+def test_bitmap_adjacent_slots_and_earlier_events():
+    bitmap = OccupancyBitmap()
+    bitmap.add(at(1, 10), at(1, 11), "MEETING")
+    bitmap.add(at(0, 23, 50), at(1, 0, 10), "BUFFER")  # before the first day seen, crosses midnight
+    assert not bitmap.overlaps(at(1, 9), at(1, 10))
+    assert not bitmap.overlaps(at(1, 11), at(1, 12))
+    assert bitmap.overlaps(at(1, 10, 45), at(1, 11, 15))
+    assert bitmap.buffer_overlaps(at(0, 23, 55), at(0, 23, 58))
+    assert not bitmap.overlaps(at(1, 0, 10), at(1, 0, 30))
+    assert bitmap.overlaps(datetime(2026, 3, 3, 10, 30), datetime(2026, 3, 3, 10, 45))  # naive treated as UTC
+
+
+def test_bitmap_day_bits_and_free_starts():
+    bitmap = OccupancyBitmap([
+        SimpleNamespace(start_at=at(0, 9), end_at=at(0, 12), type="FOCUS"),
+        SimpleNamespace(start_at=at(0, 13), end_at=at(0, 14), type="MEETING"),
+    ])
+    busy, focus, buffer = bitmap.day_bits(date(2026, 3, 2))
+    assert busy == ((1 << 12) - 1) << 36 | ((1 << 4) - 1) << 52
+    assert focus == ((1 << 12) - 1) << 36 and buffer == 0
+    assert bitmap.day_bits(date(2026, 3, 1)) == (0, 0, 0)
+    # a 2h slot fits 12:00? no (13:00 meeting); 14:00-16:00 yes; 23:00 runs past midnight
+    starts = bitmap.free_starts(date(2026, 3, 2), 8)
+    assert not starts >> 48 & 1
+    assert starts >> 56 & 1
+    assert not starts >> 92 & 1 and starts >> 88 & 1
+    assert bitmap.free_starts(date(2026, 3, 9), 8) == (1 << 89) - 1
+
+
+def test_bitmap_is_compact_for_a_user_week():
+    events = [SimpleNamespace(start_at=at(d, h), end_at=at(d, h, 45), type="MEETING")
+              for d in range(7) for h in (9, 11, 14, 16)]
+    bitmap = OccupancyBitmap(events)
+    size = sum(sys.getsizeof(t.touched) + sys.getsizeof(t.full) for t in (bitmap._busy, bitmap._focus, bitmap._buffer))
+    assert size < 400
@@ -0,0 +1,53 @@
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import create_mock_engine, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+
+from app.db import models
+from app.db.session import Base
+from app.repositories.event_repository import _overlapping
+from app.services.conflict_service import is_focus_exclusion_violation
+
+START = datetime(2030, 1, 7, 9, tzinfo=timezone.utc)
+
+
+def _sql(dialect_name, dialect):
+    stmt = select(models.Event.id).where(*_overlapping(dialect_name, START, START + timedelta(hours=1)))
+    return str(stmt.compile(dialect=dialect))
+
+
+def test_overlap_predicate_uses_range_on_postgres_and_epoch_ints_elsewhere():
+    assert "events.during && %(events_during_1)s::TSTZRANGE" in _sql("postgresql", postgresql.dialect())
+    lite = _sql("sqlite", sqlite.dialect())
+    assert "events.start_ts < ?" in lite and "events.end_ts > ?" in lite and "during" not in lite
+
+
+def _postgres_ddl():
+    statements = []
+    engine = create_mock_engine("postgresql+psycopg2://", lambda sql, *a, **kw: statements.append(str(sql.compile(dialect=engine.dialect))))
+    Base.metadata.create_all(engine, checkfirst=False)
+    return [s for s in statements if "during" in s]
+
+
+def test_range_column_and_gist_index_are_created_on_postgres_only(monkeypatch):
+    monkeypatch.delenv("EVENTS_FOCUS_EXCLUSION", raising=False)
+    ddl = _postgres_ddl()
+    assert any("GENERATED ALWAYS AS (tstzrange(to_timestamp(start_ts), to_timestamp(end_ts), '[)'))" in s for s in ddl)
+    assert any("USING gist (user_id, during)" in s for s in ddl)
+    assert not any(models.FOCUS_EXCLUSION_CONSTRAINT in s for s in ddl)
+
+    monkeypatch.setenv("EVENTS_FOCUS_EXCLUSION", "1")
+    exclusion = [s for s in _postgres_ddl() if "EXCLUDE USING gist" in s]
+    # provider-imported rows are exempt, so a sync cannot be aborted by the constraint
+    assert len(exclusion) == 1 and exclusion[0].endswith("WHERE (external_event_id IS NULL)")
+
+
+class _PgError(Exception):
+    pgcode = "23P01"
+
+
+def test_focus_exclusion_violation_is_recognised():
+    hit = _PgError(f'conflicting key value violates exclusion constraint "{models.FOCUS_EXCLUSION_CONSTRAINT}"')
+    assert is_focus_exclusion_violation(IntegrityError("INSERT", {}, hit))
+    assert not is_focus_exclusion_violation(IntegrityError("INSERT", {}, Exception("UNIQUE constraint failed")))
@@ -0,0 +1,74 @@
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+from sqlalchemy.orm import sessionmaker
+
+from app.db import models, session as db_session
+from app.db.session import Base, SessionLocal
+
+
+def _replica(tmp_path):
+    eng = create_engine(f"sqlite+pysqlite:///{tmp_path / 'replica.db'}", future=True)
+    Base.metadata.create_all(bind=eng)
+    return sessionmaker(bind=eng, autoflush=False, autocommit=False)
+
+
+def test_reads_go_to_replica_until_user_writes(client, tmp_path, monkeypatch):
+    Replica = _replica(tmp_path)
+    monkeypatch.setattr(db_session, "ReplicaSessionLocal", Replica)
+
+    rdb = Replica()
+    rdb.add(models.Calendar(id="replica-cal", user_id="demo-user", name="From replica", selected=1))
+    rdb.commit()
+    rdb.close()
+    # seeding the replica counts as a write; start with a clean stickiness map
+    monkeypatch.setattr(db_session, "_recent_writes", {})
+
+    r = client.get("/calendars")
+    assert [c["id"] for c in r.json()] == ["replica-cal"]
+
+    # A write by the same user pins their reads to the primary
+    db = SessionLocal()
+    db.add(models.User(id="demo-user", email="demo@example.com"))
+    db.add(models.Calendar(id="primary-cal", user_id="demo-user", name="From primary", selected=1))
+    db.commit()
+    db.close()
+    assert db_session.is_sticky("demo-user")
+    r = client.get("/calendars")
+    assert [c["id"] for c in r.json()] == ["primary-cal"]
+
+    # Once the window has passed, reads return to the replica
+    monkeypatch.setattr(db_session, "READ_YOUR_WRITES_SECONDS", 0)
+    assert db_session.read_sessionmaker("demo-user") is Replica
+
+
+def test_rolled_back_writes_are_not_sticky(client, monkeypatch):
+    monkeypatch.setattr(db_session, "_recent_writes", {})
+    db = SessionLocal()
+    db.add(models.User(id="u-rb", email="rb@example.com"))
+    db.flush()
+    db.rollback()
+    db.close()
+    assert not db_session.is_sticky("u-rb")
+
+
+def test_replica_reads_carry_no_etag(client, tmp_path, monkeypatch):
+    monkeypatch.setattr(db_session, "ReplicaSessionLocal", _replica(tmp_path))
+    monkeypatch.setattr(db_session, "AsyncReplicaSessionLocal", async_sessionmaker(
+        bind=create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'replica.db'}", poolclass=NullPool)))
+    monkeypatch.setattr(db_session, "_recent_writes", {})
+    for path in ("/calendars", "/events"):
+        # versions come from primary commits; a replica body may be older
+        assert "ETag" not in client.get(path).headers
+
+    db = SessionLocal()
+    db.add(models.User(id="demo-user", email="demo@example.com"))
+    db.commit()
+    db.close()
+    sticky = client.get("/calendars")
+    assert sticky.headers["ETag"]
+    assert client.get("/calendars", headers={"If-None-Match": sticky.headers["ETag"]}).status_code == 304
+
+    monkeypatch.setattr(db_session, "READ_YOUR_WRITES_SECONDS", 0)
+    r = client.get("/calendars", headers={"If-None-Match": sticky.headers["ETag"]})
+    assert r.status_code == 200 and "ETag" not in r.headers
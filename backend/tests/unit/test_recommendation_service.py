@@ -31,3 +31,50 @@ def test_slot_score_duration_metric_exposed():
     compute_slots(task, windows, limit=2)
     metrics = generate_latest().decode('utf-8')
     assert 'schedule_concierge_slot_score_duration_seconds' in metrics
+
+
+def _sample(name, **labels):
+    from prometheus_client import REGISTRY
+    return REGISTRY.get_sample_value(name, labels) or 0.0
+
+
+def test_compute_slots_records_aggregates_once_per_call():
+    from app.services.recommendation_service import OccupancyTimeline
+    task = make_task(estimated_minutes=60)
+    now = datetime(2030, 1, 7, 9, 0)
+    windows = [{"start": now, "end": now + timedelta(hours=4)}]
+    busy = SimpleNamespace(start_at=now, end_at=now + timedelta(hours=1), type="MEETING")
+    calls = _sample('schedule_concierge_slot_candidates_scanned_count')
+    scanned = _sample('schedule_concierge_slot_candidates_scanned_sum')
+    rejected = _sample('schedule_concierge_slot_conflicts_rejected_total')
+    compute_slots(task, windows, limit=5, occupancy=OccupancyTimeline([busy]))
+    assert _sample('schedule_concierge_slot_candidates_scanned_count') == calls + 1
+    # 9:00-12:00 starts every 15 min = 13 candidates, 9:00-9:45 overlap the meeting
+    assert _sample('schedule_concierge_slot_candidates_scanned_sum') == scanned + 13
+    assert _sample('schedule_concierge_slot_conflicts_rejected_total') == rejected + 4
+
+
+def test_compute_slots_span_events_are_sampled(monkeypatch):
+    from opentelemetry.sdk.trace import TracerProvider
+    from opentelemetry.sdk.trace.export import SimpleSpanProcessor
+    from opentelemetry.sdk.trace.export.in_memory_span_exporter import InMemorySpanExporter
+    from app.services import recommendation_service as rs
+    exporter = InMemorySpanExporter()
+    provider = TracerProvider()
+    provider.add_span_processor(SimpleSpanProcessor(exporter))
+    monkeypatch.setattr(rs, '_rec_tracer', provider.get_tracer('test'))
+    task = make_task()
+    now = datetime(2030, 1, 7, 9, 0)
+    windows = [{"start": now, "end": now + timedelta(hours=2)}]
+
+    monkeypatch.setattr(rs, 'SLOT_SPAN_EVENT_SAMPLE_RATE', 0.0)
+    compute_slots(task, windows, limit=2)
+    monkeypatch.setattr(rs, 'SLOT_SPAN_EVENT_SAMPLE_RATE', 1.0)
+    compute_slots(task, windows, limit=2)
+
+    unsampled, sampled = exporter.get_finished_spans()
+    assert unsampled.events == ()
+    assert unsampled.attributes['slots.candidates'] == 6
+    assert unsampled.attributes['slots.returned'] == 2
+    assert len(sampled.events) == 6
+    assert {e.name for e in sampled.events} == {'slot.scored'}
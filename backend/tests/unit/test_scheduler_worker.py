@@ -0,0 +1,174 @@
+from datetime import datetime, timedelta, timezone
+
+from app.db import models
+from app.db.session import SessionLocal
+from app.domain.spans import EventSpan
+from app.services.event_bus import EVENT_CREATED, EVENT_DELETED, DomainEvent, MemoryEventBus, RedisStreamEventBus
+from app.services.scheduler_worker import SchedulerWorker, find_overlaps
+
+
+def test_find_overlaps_uses_the_longest_span_as_lookback():
+    spans = sorted([EventSpan(0, 10_000, "GENERAL", "long"), EventSpan(100, 200, "MEETING", "a"),
+                    EventSpan(300, 400, "MEETING", "b"), EventSpan(400, 500, "MEETING", "c")])
+    starts = [s.start_ts for s in spans]
+    max_length = max(s.end_ts - s.start_ts for s in spans)
+    target = EventSpan(350, 420, "FOCUS", "t")
+    assert {s.id for s in find_overlaps(spans, starts, max_length, target)} == {"long", "b", "c"}
+    assert {s.id for s in find_overlaps(spans, starts, max_length, spans[1])} == {"long"}  # itself excluded
+
+
+def test_memory_bus_is_bounded_fifo():
+    bus = MemoryEventBus(max_messages=2)
+    bus.publish(DomainEvent(EVENT_CREATED, "u", f"e{i}", 0.0) for i in range(3))
+    assert [m.event_id for _, m in bus.read(10, 0)] == ["e1", "e2"]
+    assert bus.read(10, 0) == []
+
+
+class FakeRedis:
+    """Just enough of a Redis Streams consumer group (one stream, one group)."""
+
+    def __init__(self):
+        self.entries = []  # (id, fields)
+        self.last_delivered = 0
+        self.pending = {}  # id -> consumer
+
+    def xgroup_create(self, stream, group, id="0", mkstream=False):
+        pass
+
+    def pipeline(self, transaction=False):
+        return self
+
+    def xadd(self, stream, fields, maxlen=None, approximate=True):
+        self.entries.append((f"{len(self.entries) + 1}-0", dict(fields)))
+
+    def execute(self):
+        pass
+
+    def xreadgroup(self, group, consumer, streams, count=None, block=None):
+        new = self.entries[self.last_delivered:self.last_delivered + count]
+        self.last_delivered += len(new)
+        for msg_id, _ in new:
+            self.pending[msg_id] = consumer
+        return [("sc:events", new)] if new else []
+
+    def xautoclaim(self, stream, group, consumer, min_idle_time, start_id="0-0", count=None):
+        claimed = [(msg_id, fields) for msg_id, fields in self.entries if msg_id in self.pending][:count]
+        for msg_id, _ in claimed:
+            self.pending[msg_id] = consumer
+        return ["0-0", claimed, []]
+
+    def xack(self, stream, group, *ids):
+        for msg_id in ids:
+            self.pending.pop(msg_id, None)
+
+
+def _message(user_id, event_id):
+    return DomainEvent(EVENT_CREATED, user_id, event_id, 0.0)
+
+
+def test_redis_bus_reclaims_a_dead_consumers_pending_batch():
+    redis = FakeRedis()
+    crashed = RedisStreamEventBus(redis, consumer="old-pid")
+    crashed.publish([_message("u1", "e1"), _message("u2", "e2")])
+    assert [m.event_id for _, m in crashed.read(10, 0)] == ["e1", "e2"]  # then dies without acking
+
+    restarted = RedisStreamEventBus(redis, consumer="new-pid", claim_idle_seconds=0)
+    batch = restarted.read(10, 0)
+    assert [m for _, m in batch] == [_message("u1", "e1"), _message("u2", "e2")]
+    assert set(redis.pending.values()) == {"new-pid"}
+    restarted.ack(msg_id for msg_id, _ in batch)
+    assert redis.pending == {}
+
+
+def test_worker_acks_only_users_that_were_processed():
+    redis = FakeRedis()
+    bus = RedisStreamEventBus(redis, consumer="w", claim_idle_seconds=3600)
+    bus.publish([_message("ok", "e1"), _message("broken", "e2")])
+
+    class Session:
+        def rollback(self):
+            pass
+
+        def close(self):
+            pass
+
+    worker = SchedulerWorker(bus=bus, session_factory=Session)
+
+    def process_user(db, user_id, messages):
+        if user_id == "broken":
+            raise RuntimeError("database unavailable")
+
+    worker.process_user = process_user
+    assert worker.run_once() == 2
+    assert list(redis.pending) == ["2-0"]  # left for XAUTOCLAIM to deliver again
+
+
+def _seed(start):
+    db = SessionLocal()
+    db.add(models.User(id="u-sched", email="sched@example.com"))
+    db.add(models.Calendar(id="c-sched", user_id="u-sched", name="main", selected=1))
+    db.add(models.Event(id="standup", calendar_id="c-sched", user_id="u-sched", title="Standup",
+                        start_at=start, end_at=start + timedelta(hours=1), type="MEETING"))
+    db.add(models.Event(id="review", calendar_id="c-sched", user_id="u-sched", title="Review",
+                        start_at=start + timedelta(minutes=30), end_at=start + timedelta(hours=2), type="MEETING"))
+    db.add(models.Event(id="lunch", calendar_id="c-sched", user_id="u-sched", title="Lunch",
+                        start_at=start + timedelta(hours=3), end_at=start + timedelta(hours=4), type="GENERAL"))
+    db.commit()
+    db.close()
+
+
+def _open(db):
+    db.expire_all()
+    return {r.event_id: r for r in db.query(models.ConflictResolution).filter_by(status="PROPOSED")}
+
+
+def test_worker_stores_and_clears_proposals_per_user_batch(client):
+    start = (datetime.now(timezone.utc) + timedelta(days=1)).replace(hour=10, minute=0, second=0, microsecond=0)
+    _seed(start)
+    bus = MemoryEventBus()
+    worker = SchedulerWorker(bus=bus)
+    bus.publish(DomainEvent(EVENT_CREATED, "u-sched", e, 0.0) for e in ("standup", "review", "lunch"))
+    assert worker.run_once() == 3
+
+    db = SessionLocal()
+    try:
+        rows = _open(db)
+        assert set(rows) == {"review"}  # the earlier meeting keeps its place
+        assert rows["review"].conflict_count == 1
+        proposal = rows["review"].proposals[0]
+        new_start = datetime.fromisoformat(proposal["startAt"])
+        new_end = datetime.fromisoformat(proposal["endAt"])
+        assert new_end - new_start == timedelta(minutes=90)
+        assert not (new_start < start + timedelta(hours=1) and new_end > start)  # clear of the standup
+
+        db.delete(db.get(models.Event, "review"))
+        db.commit()
+        bus.publish([DomainEvent(EVENT_DELETED, "u-sched", "review", 0.0)])
+        worker.run_once()
+        assert _open(db) == {}
+    finally:
+        db.close()
+
+
+def test_priority_not_batching_decides_which_event_moves(client):
+    start = (datetime.now(timezone.utc) + timedelta(days=1)).replace(hour=10, minute=0, second=0, microsecond=0)
+    db = SessionLocal()
+    db.add(models.User(id="u-prio", email="prio@example.com"))
+    db.add(models.Calendar(id="c-prio", user_id="u-prio", name="main", selected=1))
+    db.add(models.Event(id="mtg", calendar_id="c-prio", user_id="u-prio", title="Sync",
+                        start_at=start, end_at=start + timedelta(hours=1), type="MEETING"))
+    db.add(models.Event(id="focus", calendar_id="c-prio", user_id="u-prio", title="Deep",
+                        start_at=start + timedelta(minutes=30), end_at=start + timedelta(hours=2), type="FOCUS"))
+    db.commit()
+    bus = MemoryEventBus()
+    worker = SchedulerWorker(bus=bus)
+    try:
+        for batches in ([["focus"]], [["mtg", "focus"]], [["mtg"], ["focus"]]):
+            db.query(models.ConflictResolution).delete()
+            db.commit()
+            for batch in batches:
+                bus.publish(DomainEvent(EVENT_CREATED, "u-prio", e, 0.0) for e in batch)
+                worker.run_once()
+            assert list(_open(db)) == ["mtg"], batches  # the FOCUS block keeps its place
+    finally:
+        db.close()
@@ -0,0 +1,164 @@
+import threading
+from datetime import datetime, timedelta, timezone
+
+from app.db import models
+from app.db.session import SessionLocal
+from app.domain.spans import epoch_second
+from app.repositories.event_repository import SqlAlchemyEventRepository
+from app.services import slot_candidate_service as store
+from app.services.recommendation_service import search_slots
+
+
+def _seed(db, now):
+    db.add(models.User(id="u-store", email="store@example.com"))
+    db.add(models.Calendar(id="c-store", user_id="u-store", name="main", selected=1))
+    db.add(models.Task(id="t-store", user_id="u-store", title="Write", estimated_minutes=60, priority=2))
+    db.commit()
+    first = next(w["start"] for w in store.suggest_availability(now, store.DEFAULT_HORIZON_DAYS) if w["start"] > now)
+    db.add(models.Event(id="e-store", calendar_id="c-store", user_id="u-store", title="Sync",
+                        start_at=first + timedelta(hours=1), end_at=first + timedelta(hours=2), type="MEETING"))
+    db.commit()
+    return first
+
+
+def _set(db):
+    db.expire_all()
+    return db.get(models.SlotCandidateSet, "t-store")
+
+
+def test_refresh_stores_what_search_slots_returns(client):
+    now = datetime.now(timezone.utc)
+    db = SessionLocal()
+    try:
+        _seed(db, now)
+        assert store.refresh_slot_candidates(db, "u-store", ["t-store"], now=now) == 1
+        cset = _set(db)
+        assert (cset.version, cset.stale, cset.horizon_days) == (1, 0, store.DEFAULT_HORIZON_DAYS)
+        ranked = db.query(models.SlotCandidate).filter_by(task_id="t-store").order_by(models.SlotCandidate.rank).all()
+        spans = SqlAlchemyEventRepository().find_future_spans(db, "u-store", now, now + timedelta(days=7))
+        task = db.get(models.Task, "t-store")
+        expected = search_slots(task, store.suggest_availability(now, 7), limit=store.STORE_LIMIT, existing_events=spans)
+        assert [(c.start_ts, c.score) for c in ranked] == [
+            (epoch_second(datetime.fromisoformat(s["startAt"])), s["score"]) for s in expected
+        ]
+        # the meeting has not started yet; the set expires the second it does
+        assert cset.expires_ts <= spans[0].start_ts + 1
+        store.refresh_slot_candidates(db, "u-store", ["t-store"], now=now)
+        assert _set(db).version == 2
+    finally:
+        db.close()
+
+
+def test_event_writes_mark_overlapping_sets_stale(client):
+    now = datetime.now(timezone.utc)
+    db = SessionLocal()
+    try:
+        first = _seed(db, now)
+        store.refresh_slot_candidates(db, "u-store", ["t-store"], now=now)
+
+        meeting = db.get(models.Event, "e-store")
+        meeting.title = "Renamed"  # no schedule change
+        db.commit()
+        assert _set(db).stale == 0
+
+        far = first + timedelta(days=30)  # outside the 7-day window
+        db.add(models.Event(id="e-far", calendar_id="c-store", user_id="u-store", title="Later",
+                            start_at=far, end_at=far + timedelta(hours=1), type="MEETING"))
+        db.commit()
+        assert _set(db).stale == 0
+
+        meeting = db.get(models.Event, "e-store")
+        meeting.end_at = meeting.end_at + timedelta(minutes=30)
+        db.commit()
+        store.wait_for_refreshes()
+        cset = _set(db)
+        assert (cset.stale, cset.version) == (0, 2)  # marked stale, then recomputed after the commit
+    finally:
+        db.close()
+
+
+def test_rolled_back_writes_leave_sets_alone(client):
+    now = datetime.now(timezone.utc)
+    db = SessionLocal()
+    try:
+        first = _seed(db, now)
+        store.refresh_slot_candidates(db, "u-store", ["t-store"], now=now)
+        db.add(models.Event(id="e-tmp", calendar_id="c-store", user_id="u-store", title="Tmp",
+                            start_at=first, end_at=first + timedelta(hours=1), type="MEETING"))
+        db.flush()
+        assert _set(db).stale == 1
+        db.rollback()
+        assert _set(db).stale == 0
+    finally:
+        db.close()
+
+
+def test_deleting_a_task_drops_its_set(client):
+    now = datetime.now(timezone.utc)
+    db = SessionLocal()
+    try:
+        _seed(db, now)
+        store.refresh_slot_candidates(db, "u-store", ["t-store"], now=now)
+        db.delete(db.get(models.Task, "t-store"))
+        db.commit()
+        assert _set(db) is None
+        assert db.query(models.SlotCandidate).count() == 0
+    finally:
+        db.close()
+
+
+def test_refresh_never_takes_stale_below_zero(client, monkeypatch):
+    now = datetime.now(timezone.utc)
+    db = SessionLocal()
+    try:
+        _seed(db, now)
+        store.refresh_slot_candidates(db, "u-store", ["t-store"], now=now)
+        sets = models.SlotCandidateSet
+        db.execute(sets.__table__.update().values(stale=1))
+        db.commit()
+        suggest = store._suggest
+
+        def racing_suggest(*args, **kwargs):
+            # another refresh already cleared the mark this one observed
+            db.execute(sets.__table__.update().values(stale=0))
+            return suggest(*args, **kwargs)
+
+        monkeypatch.setattr(store, "_suggest", racing_suggest)
+        store.refresh_slot_candidates(db, "u-store", now=now)
+        assert _set(db).stale == 0
+    finally:
+        db.close()
+
+
+def test_background_refreshes_share_the_refresh_thread_and_coalesce(client, monkeypatch):
+    calls, gate = [], threading.Event()
+
+    def refresh(user_id, task_ids):
+        gate.wait(5)
+        calls.append((threading.current_thread().name, user_id, sorted(task_ids)))
+
+    monkeypatch.setattr(store, "_refresh", refresh)
+    store.refresh_in_background("u-busy", "t-0")  # holds the refresh thread
+    for task_id in ("t-1", "t-1", "t-2"):
+        store.refresh_in_background("u-store", task_id)
+    assert calls == []  # the callers did not wait for the thread
+    gate.set()
+    store.wait_for_refreshes()
+    assert [c[1:] for c in calls] == [("u-busy", ["t-0"]), ("u-store", ["t-1", "t-2"])]
+    assert all(name.startswith("slot-refresh") for name, _, _ in calls)
+
+
+def test_finished_tasks_lose_their_set(client):
+    now = datetime.now(timezone.utc)
+    db = SessionLocal()
+    try:
+        _seed(db, now)
+        store.refresh_slot_candidates(db, "u-store", ["t-store"], now=now)
+        db.get(models.Task, "t-store").status = "Done"
+        db.commit()
+        store.wait_for_refreshes()
+        assert store.refresh_slot_candidates(db, "u-store", ["t-store"], now=now) == 0
+        assert _set(db) is None
+        assert db.query(models.SlotCandidate).count() == 0
+    finally:
+        db.close()
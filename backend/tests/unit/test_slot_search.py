@@ -0,0 +1,85 @@
+import random
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from app.services.recommendation_service import OccupancyTimeline, score_slot, search_slots
+from benchmarks.workload import WorkloadSpec, generate
+
+
+def exhaustive(task, windows, events, limit):
+    """Reference: score every 15-minute start of every window, keep the best `limit`."""
+    busy = OccupancyTimeline(events)
+    focus = [e for e in events if e.type == "FOCUS"]
+    required = timedelta(minutes=task.estimated_minutes or 30)
+    ranked = []
+    for w in windows:
+        cur = w['start']
+        while cur + required <= w['end']:
+            if not busy.overlaps(cur, cur + required):
+                ranked.append((-round(score_slot(task, cur, cur + required, focus), 4), cur))
+            cur += timedelta(minutes=15)
+    ranked.sort()
+    return [(s.isoformat(), -neg) for neg, s in ranked[:limit]]
+
+
+@pytest.mark.parametrize("seed", range(12))
+def test_search_slots_equals_exhaustive_scan(seed):
+    rng = random.Random(seed)
+    spec = WorkloadSpec(days=rng.choice([5, 30, 90]), events_per_day=rng.choice([1, 6, 14]),
+                        focus_ratio=rng.random(), task_durations=(15, 30, 60, 75, 120, 240), tasks=6, seed=seed)
+    w = generate(spec)
+    events = list(w.events)
+    if seed % 3 == 0:  # ragged, off-grid events
+        for e in events[::4]:
+            e.end_at += timedelta(minutes=7)
+    windows = w.availability(first_hour=rng.choice([6, 9]), last_hour=rng.choice([17, 21]))
+    for task in w.tasks:
+        limit = rng.choice([1, 5, 20])
+        got = [(s["startAt"], s["score"]) for s in search_slots(task, windows, limit=limit, existing_events=events)]
+        assert got == exhaustive(task, windows, events, limit), task
+
+
+def _days_counter(outcome):
+    from prometheus_client import REGISTRY
+    return REGISTRY.get_sample_value('schedule_concierge_slot_search_days_total', {"outcome": outcome}) or 0.0
+
+
+def test_search_slots_prunes_days_on_a_long_horizon():
+    start = datetime(2030, 1, 7, tzinfo=timezone.utc)
+    windows = [{"start": start + timedelta(days=d, hours=9), "end": start + timedelta(days=d, hours=17)}
+               for d in range(90)]
+    # day 0 is fully booked; the due date makes the last days the best
+    events = [SimpleNamespace(start_at=start + timedelta(hours=8), end_at=start + timedelta(hours=18), type="MEETING")]
+    task = SimpleNamespace(priority=2, estimated_minutes=60, energy_tag=None, due_at=start + timedelta(days=89, hours=12))
+    capacity, bound, scanned = _days_counter("no_capacity"), _days_counter("bound"), _days_counter("scanned")
+    slots = search_slots(task, windows, limit=3, existing_events=events)
+    assert [s["startAt"][:10] for s in slots] == ["2030-04-06"] * 3
+    assert _days_counter("no_capacity") - capacity == 1
+    assert _days_counter("scanned") - scanned <= 3
+    assert _days_counter("bound") - bound >= 85
+
+
+def _scanned_sum():
+    from prometheus_client import REGISTRY
+    return REGISTRY.get_sample_value('schedule_concierge_slot_candidates_scanned_sum') or 0.0
+
+
+def test_search_slots_branch_and_bound_scores_few_candidates_on_sparse_calendars():
+    start = datetime(2030, 1, 7, tzinfo=timezone.utc)
+    windows = [{"start": start + timedelta(days=d, hours=6), "end": start + timedelta(days=d, hours=21)}
+               for d in range(30)]
+    events = [SimpleNamespace(start_at=start + timedelta(days=d, hours=9), end_at=start + timedelta(days=d, hours=10),
+                              type="FOCUS") for d in range(0, 30, 3)]
+    total = sum(((w['end'] - w['start']) - timedelta(minutes=60)) // timedelta(minutes=15) + 1 for w in windows)
+    for tag in (None, "morning", "afternoon", "deep"):
+        task = SimpleNamespace(priority=3, estimated_minutes=60, energy_tag=tag, due_at=None)
+        before = _scanned_sum()
+        got = [(s["startAt"], s["score"]) for s in search_slots(task, windows, limit=5, existing_events=events)]
+        assert got == exhaustive(task, windows, events, 5)
+        assert _scanned_sum() - before < total / 20, tag
+    # equal scores everywhere in working hours: the earliest starts win
+    plain = SimpleNamespace(priority=3, estimated_minutes=30, energy_tag=None, due_at=None)
+    got = search_slots(plain, windows[1:2], limit=3)
+    assert [s["startAt"][11:16] for s in got] == ["09:00", "09:15", "09:30"]
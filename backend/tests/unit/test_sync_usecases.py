@@ -86,3 +86,25 @@ def test_sync_events_inserts_and_updates(client):
     assert res.next_sync_token == "tok_next"
     ev = db.query(models.Event).filter(models.Event.external_event_id == event_id).first()
     assert ev is not None
+
+
+def test_sync_events_stores_offset_times_as_utc(client):
+    from app.db.session import SessionLocal
+    from app.domain.spans import epoch_second
+    db: Session = SessionLocal()
+    user = make_user(db)
+    db.add(models.Calendar(id="cid1", user_id=user.id, name="Primary", external_provider="google",
+                           external_id="cal_1", is_primary=1, is_default=1, selected=1))
+    db.commit()
+    provider = FakeProvider(calendars=[], events_by_cal={"cal_1": {"items": [{
+        "id": "gevt_tokyo", "summary": "Tokyo",
+        "start": {"dateTime": "2030-01-07T18:00:00+09:00"},
+        "end": {"dateTime": "2030-01-07T19:00:00+09:00"},
+    }], "nextSyncToken": None}})
+
+    SyncEventsUseCase(provider).execute(db, user, user_context={}, sync_token=None)
+    db.expire_all()
+    ev = db.query(models.Event).filter(models.Event.external_event_id == "gevt_tokyo").one()
+    assert ev.start_at == datetime(2030, 1, 7, 9, 0)
+    assert ev.start_ts == epoch_second(datetime(2030, 1, 7, 9, 0, tzinfo=timezone.utc))
+    db.close()